@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Measures how long it takes to load the code of many build scripts.
+Compiling every build script from source, as PyMake did before the bytecode
+  cache was added, is compared with loading the build scripts from a warm
+  cache.
+
+Usage: PYTHONPATH=source python3 benchmarks/bytecode_cache_benchmark.py
+"""
+import argparse
+from pathlib import Path
+from pymake.util.bytecode_cache import BytecodeCache
+import tempfile
+import time
+
+# Body of each generated build script
+# This resembles a typical subdirectory build script that adds a library with
+#   a few dozen source files.
+SCRIPT_TEMPLATE = """from pymake import EScope
+from make import project
+
+target = project.add_static_library("lib{index}")
+target.add_include_directories(".", scope=EScope.PUBLIC)
+target.add_sources([
+{sources}
+])
+if {index} > 0:
+    target.link_to_target(project_targets[{index} - 1], EScope.PUBLIC)
+target.install()
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-n",
+        "--scripts",
+        type=int,
+        default=1500,
+        help="Number of build scripts to load."
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        script_paths = []
+        for i in range(args.scripts):
+            script_path = root / f"lib{i}" / "make.py"
+            script_path.parent.mkdir()
+            script_path.write_text(SCRIPT_TEMPLATE.format(
+                index=i,
+                sources=",\n".join(f'    "src/file{j}.cpp"' for j in range(40))
+            ))
+            script_paths.append(script_path)
+
+        start = time.perf_counter()
+        for script_path in script_paths:
+            compile(script_path.read_bytes(), str(script_path), "exec")
+        compile_time = time.perf_counter() - start
+
+        cache_dir = root / BytecodeCache.DIR_NAME
+        start = time.perf_counter()
+        cache = BytecodeCache(cache_dir)
+        for script_path in script_paths:
+            cache.load_code(script_path)
+        cold_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cache = BytecodeCache(cache_dir)
+        for script_path in script_paths:
+            cache.load_code(script_path)
+        warm_time = time.perf_counter() - start
+        assert cache.hits == args.scripts
+
+        print(f"{args.scripts:,} build scripts")
+        print(f"Compile from source: {compile_time:.3f} s")
+        print(f"Cache (cold):        {cold_time:.3f} s")
+        print(f"Cache (warm):        {warm_time:.3f} s " +
+            f"(reports {cache.saved_seconds:.3f} s of compilation saved)")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Measures how many caller info captures can be performed per second.
+The original implementation, which resolved each frame's path using
+  `Path.resolve()` on every capture, is included so that the two can be
+  compared directly.
+
+Usage: PYTHONPATH=source python3 benchmarks/caller_info_benchmark.py
+"""
+import argparse
+import inspect
+import os
+from pathlib import Path
+from pymake.tracing.caller_info import CallerInfo
+import time
+from typing import Callable
+
+def legacy_closest_external_frame() -> CallerInfo:
+    """
+    Captures the closest external frame using the original algorithm.
+    """
+    sep = os.path.sep
+    frame = inspect.currentframe()
+    assert frame
+    frame = frame.f_back
+    while True:
+        assert frame
+        file_path = Path(frame.f_code.co_filename).absolute().resolve()
+        if f"{sep}pymake{sep}" not in str(file_path):
+            return CallerInfo(file_path, frame.f_lineno)
+        frame = frame.f_back
+
+
+def measure(capture: Callable[[], CallerInfo], iterations: int) -> float:
+    """
+    Measures the number of captures performed per second.
+    @param capture Method that captures a caller info instance.
+    @param iterations Number of captures to perform.
+    @returns The number of captures performed per second.
+    """
+    start = time.perf_counter()
+    for _ in range(iterations):
+        capture()
+    elapsed = time.perf_counter() - start
+    return iterations / elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-n",
+        "--iterations",
+        type=int,
+        default=100000,
+        help="Number of captures to perform for each implementation."
+    )
+    args = parser.parse_args()
+
+    before = measure(legacy_closest_external_frame, args.iterations)
+    after = measure(CallerInfo.closest_external_frame, args.iterations)
+    print(f"Before: {before:,.0f} captures/s")
+    print(f"After:  {after:,.0f} captures/s")
+    print(f"Speedup: {after / before:.1f}x")
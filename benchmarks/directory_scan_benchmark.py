@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Measures how long it takes to find source files in a directory tree.
+A hand-written `os.walk()` scan is compared with a scan using a directory scan
+  cache loaded from a previous run, which only needs to stat each directory.
+
+Usage: PYTHONPATH=source python3 benchmarks/directory_scan_benchmark.py
+"""
+import argparse
+import os
+from pathlib import Path
+from pymake.util.directory_scan_cache import DirectoryScanCache
+import tempfile
+import time
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--dirs",
+        type=int,
+        default=2000,
+        help="Number of directories in the tree."
+    )
+    parser.add_argument(
+        "--files",
+        type=int,
+        default=50,
+        help="Number of files in each directory."
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = os.path.realpath(tmp)
+        src_dir = os.path.join(root, "src")
+        for d in range(args.dirs):
+            # Nest directories so that the tree has some depth
+            dir_path = os.path.join(src_dir, f"group{d % 20}", f"module{d}")
+            os.makedirs(dir_path)
+            for f in range(args.files):
+                Path(dir_path, f"file{f}.cpp").write_text("")
+
+        start = time.perf_counter()
+        walk_paths = sorted(
+            os.path.join(dir_path, f)
+            for dir_path, _, files in os.walk(src_dir)
+            for f in files
+        )
+        walk_time = time.perf_counter() - start
+
+        cache_path = os.path.join(root, DirectoryScanCache.FILE_NAME)
+        start = time.perf_counter()
+        cache = DirectoryScanCache()
+        cold_paths = cache.walk(src_dir)
+        cache.write_file(cache_path)
+        cold_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        cache = DirectoryScanCache.load(cache_path)
+        warm_paths = cache.walk(src_dir)
+        warm_time = time.perf_counter() - start
+
+        assert walk_paths == cold_paths == warm_paths
+        print(f"{len(walk_paths):,} files in {args.dirs:,} directories")
+        print(f"os.walk():          {walk_time:.3f} s")
+        print(f"Cache (cold+save):  {cold_time:.3f} s")
+        print(f"Cache (warm):       {warm_time:.3f} s")
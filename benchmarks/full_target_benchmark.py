@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Measures how long it takes to generate the full target of every target in a
+  diamond-shaped dependency graph.
+The original recursive, uncached `get_full_target()` implementation is included
+  so that the two can be compared directly. The original implementation
+  recomputes a target's full target once for every path to that target, so
+  its cost grows exponentially with the depth of the graph.
+
+Usage: PYTHONPATH=source python3 benchmarks/full_target_benchmark.py
+"""
+import argparse
+from pathlib import Path
+from pymake.common.scope import EScope
+from pymake.core.build_script_set import BuildScriptSet
+from pymake.targets.static_library_target import StaticLibraryTarget
+from pymake.targets.target import ITarget
+from pymake.tracing.null_caller_info_formatter import \
+    NullCallerInfoFormatter
+import tempfile
+import time
+from typing import Callable, List
+
+def legacy_get_full_target(self: ITarget, include_private: bool = True) \
+    -> ITarget:
+    """
+    Copy of the original recursive `get_full_target()` implementation.
+    """
+    target = self._create_empty_clone()
+    scopes = [EScope.PUBLIC, EScope.INTERFACE]
+    if include_private:
+        scopes.append(EScope.PRIVATE)
+    linked_targets = [
+        t.value
+        for scope in scopes
+        for t in self._link_libraries.select_set(scope)
+        if isinstance(t.value, ITarget)
+    ]
+    for linked_target in linked_targets:
+        full_linked_target = legacy_get_full_target(linked_target, False)
+        target._include_directories.merge(
+            full_linked_target._include_directories)
+        target._link_libraries.merge(full_linked_target._link_libraries)
+        target._sources.merge(full_linked_target._sources)
+    target._sources.merge(self._sources, merge_private=True)
+    target._include_directories.merge(
+        self._include_directories, merge_private=True)
+    target._link_libraries.merge(self._link_libraries, merge_private=True)
+    return target
+
+
+def create_targets(
+    target_count: int,
+    layers: int,
+    source_dir: Path) -> List[ITarget]:
+    """
+    Creates a layered dependency graph.
+    Each target publicly links to two targets in the previous layer, so every
+      target can be reached through many paths from the last layer.
+    @param target_count Number of targets to create.
+    @param layers Number of layers to split the targets into.
+    @param source_dir Directory to write each target's source file to. The
+      source files must exist, or else a warning is printed for each target.
+    @returns The targets, in the order they were created.
+    """
+    width = (target_count + layers - 1) // layers
+    (source_dir / "src").mkdir()
+    build_scripts = BuildScriptSet(
+        source_dir,
+        source_dir / ".pymake",
+        NullCallerInfoFormatter()
+    )
+
+    targets: List[ITarget] = []
+    for i in range(target_count):
+        target = StaticLibraryTarget(build_scripts, f"target_{i}")
+        source_path = source_dir / "src" / f"{i}.cpp"
+        source_path.touch()
+        target.add_sources(str(source_path), EScope.PRIVATE)
+        target.add_include_directories(str(source_dir / "include" / str(i)),
+            EScope.PUBLIC)
+        if i >= width:
+            layer_start = (i // width - 1) * width
+            target.link_to_target(
+                targets[layer_start + i % width], EScope.PUBLIC)
+            target.link_to_target(
+                targets[layer_start + (i + 1) % width], EScope.PUBLIC)
+        targets.append(target)
+    return targets
+
+
+def measure(name: str,
+    get_full_target: Callable[[ITarget], ITarget],
+    target_count: int,
+    layers: int) -> None:
+    """
+    Measures and prints how long it takes to get every full target.
+    @param name Name to print for the measurement.
+    @param get_full_target Method used to get a target's full target.
+    @param target_count Number of targets in the graph.
+    @param layers Number of layers in the graph.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        targets = create_targets(target_count, layers, Path(tmp))
+        start = time.perf_counter()
+        for target in targets:
+            get_full_target(target)
+        elapsed = time.perf_counter() - start
+    print(f"{name}: {target_count:,} targets, " +
+        f"{layers} layers in {elapsed:.3f} s " +
+        f"({elapsed / target_count * 1e6:,.0f} us/target)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-n",
+        "--targets",
+        type=int,
+        default=2000,
+        help="Number of targets to generate full targets for."
+    )
+    parser.add_argument(
+        "--layers",
+        type=int,
+        default=12,
+        help="Number of layers in the dependency graph. Each target links " +
+            "to two targets in the previous layer."
+    )
+    parser.add_argument(
+        "--legacy-targets",
+        type=int,
+        default=240,
+        help="Number of targets to use with the legacy implementation. The " +
+            "legacy implementation is orders of magnitude slower, so using " +
+            "the full number of targets is impractical."
+    )
+    args = parser.parse_args()
+
+    measure(
+        "Legacy recursive",
+        legacy_get_full_target,
+        args.legacy_targets,
+        args.layers
+    )
+    measure(
+        "Cached",
+        lambda t: t.get_full_target(),
+        args.legacy_targets,
+        args.layers
+    )
+    for count in [args.targets // 4, args.targets // 2, args.targets]:
+        measure("Cached", lambda t: t.get_full_target(), count, args.layers)
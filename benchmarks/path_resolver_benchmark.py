@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Measures how long it takes to resolve and validate source file paths.
+The original implementation, which called `Path.resolve()` on every path and
+  didn't validate paths, is included so that the two can be compared
+  directly.
+
+Usage: PYTHONPATH=source python3 benchmarks/path_resolver_benchmark.py
+"""
+import argparse
+import os
+from pathlib import Path
+from pymake.util.path_resolver import PathResolver
+import tempfile
+import time
+from typing import List
+
+def create_tree(root: Path, dir_count: int, file_count: int) -> List[str]:
+    """
+    Creates a directory tree containing source files.
+    @param root Directory to create the tree in.
+    @param dir_count Number of directories to create.
+    @param file_count Number of files to create in each directory.
+    @returns The path of each file relative to `root`.
+    """
+    paths: List[str] = []
+    for d in range(dir_count):
+        dir_path = root / "src" / f"module{d}"
+        dir_path.mkdir(parents=True)
+        for f in range(file_count):
+            (dir_path / f"file{f}.cpp").write_text("")
+            paths.append(f"src/module{d}/file{f}.cpp")
+    return paths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--dirs",
+        type=int,
+        default=100,
+        help="Number of source directories."
+    )
+    parser.add_argument(
+        "--files",
+        type=int,
+        default=200,
+        help="Number of source files in each directory."
+    )
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(os.path.realpath(tmp))
+        paths = create_tree(root, args.dirs, args.files)
+
+        start = time.perf_counter()
+        before_paths = [(root / p).resolve() for p in paths]
+        before = time.perf_counter() - start
+
+        start = time.perf_counter()
+        resolver = PathResolver()
+        after_paths = [resolver.resolve(root, p) for p in paths]
+        missing = resolver.find_missing(after_paths)
+        after = time.perf_counter() - start
+
+        assert before_paths == after_paths
+        assert not missing
+        print(f"{len(paths):,} files in {args.dirs:,} directories")
+        print(f"Before (resolve only):     {before:.3f} s")
+        print(f"After (resolve + validate): {after:.3f} s")
+        print(f"Speedup: {before / after:.1f}x")
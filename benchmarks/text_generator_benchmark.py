@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Measures how long it takes to generate a CMake file with a large number of
+  commands.
+The original `TextGenerator` implementation, which appended to a single string,
+  is included so that the two can be compared directly.
+
+Usage: PYTHONPATH=source python3 benchmarks/text_generator_benchmark.py
+"""
+import argparse
+from pymake.generators.cmake_generator import CMakeGenerator
+from pymake.generators.text_generator import TextGenerator
+from pymake.tracing.null_caller_info_formatter import \
+    NullCallerInfoFormatter
+import time
+from typing import Callable
+
+class LegacyTextGenerator:
+    """
+    Copy of the original string-based `TextGenerator` implementation.
+    Only the methods used by the benchmark are included.
+    """
+    def __init__(self):
+        self._text = ""
+        self._indent_level = 0
+        self._indent = "\t"
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def append(self, text: str) -> None:
+        if len(self._text) > 0 and self._text[-1] == "\n":
+            self.apply_indentation()
+        self._text += text
+
+    def append_line(self, text: str) -> None:
+        if len(self._text) == 0 or self._text[-1] == "\n":
+            self.apply_indentation()
+        self.append(text + "\n")
+
+    def apply_indentation(self) -> None:
+        self._text += self._indent * self._indent_level
+
+
+def generate_text(generator: TextGenerator | LegacyTextGenerator,
+    command_count: int) -> str:
+    """
+    Generates the text for a CMake file using the text generator directly.
+    @param generator Text generator to use.
+    @param command_count Number of commands to generate.
+    @returns The generated text.
+    """
+    for i in range(command_count):
+        generator.append_line(f"# make.py:{i}")
+        generator.append_line("target_sources(")
+        generator.append_line("\tfoo")
+        generator.append_line("\tPRIVATE")
+        generator.append_line(f"\t\t/src/source_{i}.cpp")
+        generator.append_line(")\n")
+    return generator.text
+
+
+def generate_cmake(command_count: int) -> str:
+    """
+    Generates a CMake file using the CMake generator.
+    @param command_count Number of commands to generate.
+    @returns The generated text.
+    """
+    generator = CMakeGenerator(NullCallerInfoFormatter())
+    for i in range(command_count):
+        with generator.open_method_block("target_sources") as b:
+            b.add_arguments("foo")
+            b.add_keyword_arguments("PRIVATE", f"/src/source_{i}.cpp")
+    return generator.generate()
+
+
+def measure(name: str, func: Callable[[int], str], command_count: int) -> None:
+    """
+    Measures and prints how long it takes to generate a number of commands.
+    @param name Name to print for the measurement.
+    @param func Method that generates the commands.
+    @param command_count Number of commands to generate.
+    """
+    start = time.perf_counter()
+    text = func(command_count)
+    elapsed = time.perf_counter() - start
+    print(f"{name}: {command_count:,} commands, " +
+        f"{len(text) / 1024 / 1024:.1f} MiB in {elapsed:.3f} s " +
+        f"({command_count / elapsed:,.0f} commands/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-n",
+        "--commands",
+        type=int,
+        default=100000,
+        help="Number of commands to generate."
+    )
+    parser.add_argument(
+        "--legacy-commands",
+        type=int,
+        default=5000,
+        help="Number of commands to generate using the legacy generator. " +
+            "The legacy generator scales quadratically, so generating the " +
+            "full number of commands with it may take tens of minutes."
+    )
+    args = parser.parse_args()
+
+    measure(
+        "Legacy text generator",
+        lambda n: generate_text(LegacyTextGenerator(), n),
+        args.legacy_commands
+    )
+    measure(
+        "Chunked text generator",
+        lambda n: generate_text(TextGenerator(), n),
+        args.commands
+    )
+    measure("CMake generator", generate_cmake, args.commands)
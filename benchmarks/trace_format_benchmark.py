@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Measures how long it takes to write trace files for a large project in each
+  supported trace file format.
+The pure Python YAML dumper is included so that it can be compared with the
+  libyaml-based dumper used by `YamlFileGenerator`.
+
+Usage: PYTHONPATH=source python3 benchmarks/trace_format_benchmark.py
+"""
+import argparse
+from pathlib import Path
+from pymake.common.project_language import EProjectLanguage
+from pymake.common.scope import EScope
+from pymake.core.build_script_set import BuildScriptSet
+from pymake.core.project import Project
+from pymake.generators.binary_file_generator import BinaryFileGenerator
+from pymake.generators.json_file_generator import JsonFileGenerator
+from pymake.generators.trace_file_generator import ITraceFileGenerator
+from pymake.generators.yaml_file_generator import YamlFileGenerator
+from pymake.tracing.null_caller_info_formatter import \
+    NullCallerInfoFormatter
+import tempfile
+import time
+from typing import Any, Dict, List
+import yaml
+
+class PurePythonYamlFileGenerator(YamlFileGenerator):
+    """
+    YAML generator that always uses the pure Python dumper.
+    """
+    def generate(self, data: Any) -> str:
+        return yaml.dump(data, Dumper=yaml.Dumper)
+
+
+def create_trace_data(target_count: int) -> List[Dict[str, object]]:
+    """
+    Creates the trace data for a project with a chain of static libraries.
+    @param target_count Number of targets to create.
+    @returns The trace data for each target.
+    """
+    source_dir = Path(__file__).parent.absolute()
+    build_scripts = BuildScriptSet(
+        source_dir,
+        source_dir / ".pymake",
+        NullCallerInfoFormatter()
+    )
+    project = Project(build_scripts, "benchmark", EProjectLanguage.Cpp)
+
+    targets = []
+    for i in range(target_count):
+        target = project.add_static_library(f"target_{i}")
+        target.add_sources([f"src/{i}/a.cpp", f"src/{i}/b.cpp"])
+        target.add_include_directories(f"include/{i}", EScope.PUBLIC)
+        if targets:
+            target.link_to_target(targets[-1], EScope.PRIVATE)
+        targets.append(target)
+
+    return [{t.target_name: t.generate_trace_dict()} for t in targets]
+
+
+def measure(name: str,
+    generator: ITraceFileGenerator,
+    trace_data: List[Dict[str, object]],
+    output_dir: Path) -> None:
+    """
+    Measures and prints how long it takes to write a set of trace files.
+    @param name Name to print for the measurement.
+    @param generator Generator to write the trace files with.
+    @param trace_data Data to write to each trace file.
+    @param output_dir Directory to write the trace files to.
+    """
+    total_size = 0
+    start = time.perf_counter()
+    for i, data in enumerate(trace_data):
+        output_path = output_dir / f"{i}.target.{generator.file_extension}"
+        generator.write_file(data, output_path)
+        total_size += output_path.stat().st_size
+    elapsed = time.perf_counter() - start
+    print(f"{name}: {len(trace_data):,} files, " +
+        f"{total_size / 1024 / 1024:.1f} MiB in {elapsed:.3f} s " +
+        f"({len(trace_data) / elapsed:,.0f} files/s)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-n",
+        "--targets",
+        type=int,
+        default=10000,
+        help="Number of targets to write trace files for."
+    )
+    args = parser.parse_args()
+
+    trace_data = create_trace_data(args.targets)
+    with tempfile.TemporaryDirectory() as output_dir:
+        measure(
+            "YAML (pure Python dumper)",
+            PurePythonYamlFileGenerator(),
+            trace_data,
+            Path(output_dir) / "pure"
+        )
+        measure(
+            "YAML",
+            YamlFileGenerator(),
+            trace_data,
+            Path(output_dir) / "yaml"
+        )
+        measure(
+            "JSON",
+            JsonFileGenerator(),
+            trace_data,
+            Path(output_dir) / "json"
+        )
+        measure(
+            "Binary",
+            BinaryFileGenerator(),
+            trace_data,
+            Path(output_dir) / "binary"
+        )
@@ -3,6 +3,8 @@ from .common.cmake_build_type import ECMakeBuildType
 from .common.cmake_generator import ECMakeGenerator
 from .common.project_language import EProjectLanguage
 from .common.scope import EScope
+from .common.target_weight import ETargetWeight
+from .common.trace_file_format import ETraceFileFormat
 from .core.cmake import ICMake
 from .core.cmake314 import CMake314
 from .core.cmake325 import CMake325
@@ -0,0 +1,13 @@
+from enum import Enum
+
+class ETargetWeight(Enum):
+    """
+    Defines how targets are weighted when analyzing the target graph.
+    """
+    # Every target has a weight of 1.
+    UNIT = "unit"
+    # Targets are weighted by the number of source files that they compile.
+    SOURCES = "sources"
+    # Targets are weighted by the time taken to build them in a previous
+    #   build, as recorded in a Ninja log file.
+    BUILD_TIME = "build-time"
@@ -0,0 +1,14 @@
+from enum import Enum
+
+class ETraceFileFormat(Enum):
+    """
+    Defines the formats that trace files can be written in.
+    """
+    # Human-readable YAML files.
+    YAML = "yaml"
+    # JSON files.
+    JSON = "json"
+    # Compact, gzip-compressed JSON files.
+    BINARY = "binary"
+    # A single SQLite database containing all trace data.
+    DATABASE = "database"
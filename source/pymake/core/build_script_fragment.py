@@ -0,0 +1,53 @@
+from pathlib import Path
+from pymake.core.build_script import BuildScript
+from pymake.targets.target import ITarget
+from typing import Dict, List, NamedTuple, Tuple
+
+class BuildScriptFragment(NamedTuple):
+    """
+    Stores everything a subdirectory build script added to the project when it
+      was evaluated in a worker process.
+    """
+    ## Absolute path to the subdirectory build script that was evaluated.
+    script_path: Path
+
+    ## Targets added while evaluating the build script, in the order they were
+    #    added.
+    # Each target is paired with the name of the project it was added to.
+    targets: List[Tuple[str, ITarget]]
+
+    ## Build scripts created while evaluating the build script, in the order
+    #    they were created.
+    # Each build script is paired with the absolute path of the PyMake build
+    #   script it was created for.
+    build_scripts: List[Tuple[Path, BuildScript]]
+
+    ## Absolute paths of the Python files executed while evaluating the build
+    #    script, including any modules the build script imported.
+    executed_files: List[Path]
+
+    ## Listings of the directories scanned while evaluating the build script,
+    #    indexed by directory path.
+    # Each listing stores the directory's modification time in nanoseconds, the
+    #   names of the files in the directory, and the names of the
+    #   subdirectories in the directory.
+    directory_scans: Dict[str, Tuple[int, List[str], List[str]]]
+
+    ## Number of build scripts loaded from the bytecode cache.
+    bytecode_hits: int
+
+    ## Number of build scripts that had to be compiled.
+    bytecode_misses: int
+
+    ## Compile time saved by loading build scripts from the bytecode cache, in
+    #    seconds.
+    bytecode_saved_seconds: float
+
+    ## Text the build script wrote to `sys.stdout`.
+    # This is written to the main process' standard output once the fragment
+    #   is merged so that output appears in the order the subdirectories were
+    #   added.
+    stdout: str
+
+    ## Text the build script wrote to `sys.stderr`.
+    stderr: str
@@ -0,0 +1,208 @@
+from __future__ import annotations
+import hashlib
+import importlib
+from importlib import util
+from importlib.abc import Loader, MetaPathFinder
+from importlib.machinery import ModuleSpec
+import os
+from pathlib import Path
+from pymake.util.bytecode_cache import BytecodeCache
+import sys
+from types import ModuleType
+from typing import Dict, Optional, Sequence
+
+class BuildScriptRegistry(MetaPathFinder, Loader):
+    """
+    Ensures that each PyMake build script is executed exactly once.
+    Build scripts are loaded both by `ICMake.add_subdirectory()` and by other
+      build scripts importing them. Each build script is given a canonical
+      module name based on its path relative to the root build script's
+      directory, such as `foo.make` for `foo/make.py`, and both ways of
+      loading a build script resolve to the module registered under that name.
+      The root build script, which runs as `__main__`, is registered as `make`.
+    """
+    # File name of PyMake build scripts
+    BUILD_SCRIPT_NAME = "make.py"
+
+    def __init__(self, root_dir: Path, bytecode_cache: BytecodeCache):
+        """
+        Initializes the registry.
+        @param root_dir Directory containing the root build script. Must be an
+          absolute path. Module names are relative to this directory.
+        @param bytecode_cache Cache to load the code of build scripts from.
+        """
+        self._root_dir = root_dir
+        self._bytecode_cache = bytecode_cache
+
+        # Module executed for each build script, indexed by the absolute path
+        #   of the build script
+        self._modules: Dict[str, ModuleType] = {}
+
+
+    @staticmethod
+    def install(registry: BuildScriptRegistry) -> None:
+        """
+        Makes a registry handle imports of build scripts.
+        Any previously installed registry is removed.
+        @param registry Registry to install.
+        """
+        sys.meta_path[:] = [
+            f for f in sys.meta_path if not isinstance(f, BuildScriptRegistry)
+        ]
+        sys.meta_path.insert(0, registry)
+
+
+    def get_module_name(self, script_path: Path) -> str:
+        """
+        Gets the canonical module name of a build script.
+        @param script_path Absolute path to the build script.
+        @returns The module name. If the build script is not within the root
+          directory or its path can't be expressed as a module name, a unique
+          name derived from the path is returned instead.
+        """
+        try:
+            rel_path = script_path.relative_to(self._root_dir)
+            parts = rel_path.with_suffix("").parts
+        except ValueError:
+            parts = ()
+        if parts and all(p.isidentifier() for p in parts):
+            return ".".join(parts)
+
+        digest = hashlib.sha1(str(script_path).encode("utf-8")).hexdigest()
+        return f"_pymake_make_{digest[:16]}"
+
+
+    def is_loaded(self, script_path: Path) -> bool:
+        """
+        Checks whether a build script has been executed or is being executed.
+        @param script_path Absolute path to the build script.
+        @returns True if the build script has been loaded by the registry.
+        """
+        return os.path.normcase(os.path.abspath(script_path)) in self._modules
+
+
+    def load(self, script_path: Path) -> bool:
+        """
+        Executes a build script if it hasn't already been executed.
+        @param script_path Absolute path to the build script.
+        @returns True if the build script was executed by this call, or False
+          if it was already executed or is being executed.
+        """
+        key = os.path.normcase(os.path.abspath(script_path))
+        if key in self._modules:
+            return False
+
+        module_name = self.get_module_name(script_path)
+        if module_name in sys.modules:
+            # The build script may have been imported before the registry was
+            #   installed
+            module = sys.modules[module_name]
+            if BuildScriptRegistry._is_module_for(module, key):
+                self._modules[key] = module
+                return False
+
+        spec = util.spec_from_file_location(
+            module_name,
+            script_path,
+            loader=self
+        )
+        assert spec
+        module = util.module_from_spec(spec)
+
+        # Register the module before executing it so that build scripts that
+        #   import each other get the partially executed module
+        sys.modules[module_name] = module
+        try:
+            self.exec_module(module)
+        except BaseException:
+            del sys.modules[module_name]
+            raise
+
+        # Bind the module to its parent package like the import system does so
+        #   that `import foo.make` followed by `foo.make.x` works
+        parent_name, _, child_name = module_name.rpartition(".")
+        if parent_name:
+            try:
+                parent = importlib.import_module(parent_name)
+            except ImportError:
+                return True
+            setattr(parent, child_name, module)
+        return True
+
+
+    def register_main(self, script_path: Path) -> None:
+        """
+        Registers the root build script, which runs as `__main__`.
+        The root build script is aliased as `make` so that other build scripts
+          importing it don't execute it a second time.
+        @param script_path Absolute path to the root build script.
+        """
+        key = os.path.normcase(os.path.abspath(script_path))
+        main_module = sys.modules.get("__main__")
+        if main_module is None or \
+            not BuildScriptRegistry._is_module_for(main_module, key):
+            return
+
+        self._modules[key] = main_module
+        module_name = self.get_module_name(script_path)
+        if module_name not in sys.modules:
+            sys.modules[module_name] = main_module
+
+
+    def find_spec(self,
+        fullname: str,
+        path: Optional[Sequence[str]],
+        target: Optional[ModuleType] = None) -> Optional[ModuleSpec]:
+        """
+        Finds the spec for a build script being imported.
+        Only modules whose name maps to a build script within the root
+          directory are handled. All other imports are left to the other
+          finders.
+        @param fullname Name of the module being imported.
+        @param path Search path of the parent package.
+        @param target Module being reloaded, if any.
+        @returns The spec for the build script, or None if the module is not
+          a build script.
+        """
+        parts = fullname.split(".")
+        if parts[-1] + ".py" != BuildScriptRegistry.BUILD_SCRIPT_NAME:
+            return None
+        script_path = self._root_dir.joinpath(*parts).with_suffix(".py")
+        if not script_path.is_file():
+            return None
+        return util.spec_from_file_location(fullname, script_path, loader=self)
+
+
+    def create_module(self, spec: ModuleSpec) -> Optional[ModuleType]:
+        """
+        Creates the module for a build script.
+        @param spec Spec of the module.
+        @returns None so that the default module creation is used.
+        """
+        return None
+
+
+    def exec_module(self, module: ModuleType) -> None:
+        """
+        Executes a build script's module.
+        @param module Module to execute. Must have been created from a spec
+          returned by this registry.
+        """
+        assert module.__file__
+        script_path = Path(module.__file__)
+        self._modules[os.path.normcase(os.path.abspath(script_path))] = module
+        exec(self._bytecode_cache.load_code(script_path), module.__dict__)
+
+
+    @staticmethod
+    def _is_module_for(module: ModuleType, key: str) -> bool:
+        """
+        Checks whether a module was loaded from a build script.
+        @param module Module to check.
+        @param key Normalized absolute path of the build script.
+        @returns True if the module was loaded from the build script.
+        """
+        file_name = getattr(module, "__file__", None)
+        if not file_name:
+            return False
+        return os.path.normcase(os.path.abspath(file_name)) == key
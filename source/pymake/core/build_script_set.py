@@ -1,10 +1,14 @@
+import functools
 import os
 from pathlib import Path
 from pymake.core.build_script import BuildScript
 from pymake.generators.cmake_generator import CMakeGenerator
-from pymake.tracing.caller_info import CallerInfo
 from pymake.tracing.caller_info_formatter import ICallerInfoFormatter
-from typing import Dict, Optional
+from pymake.tracing.origin_context import OriginContext
+from pymake.util.directory_scan_cache import DirectoryScanCache
+from pymake.util.parallel_file_writer import ParallelFileWriter
+from pymake.util.path_resolver import PathResolver
+from typing import Dict, Iterator, List, Optional
 
 class BuildScriptSet:
     """
@@ -17,7 +21,8 @@ class BuildScriptSet:
     def __init__(self,
         source_directory: Path,
         generated_directory: Path,
-        formatter: ICallerInfoFormatter):
+        formatter: ICallerInfoFormatter,
+        directory_scan_cache: Optional[DirectoryScanCache] = None):
         """
         Initializes the set.
         @param source_directory Path to the directory containing the source
@@ -26,6 +31,8 @@ class BuildScriptSet:
           generate the CMake files. Must be an absolute path.
         @param formatter Formatter that should be used when printing tracing
           info.
+        @param directory_scan_cache Cache used when scanning directories for
+          source files. If this is None, an empty cache will be used.
         """
         assert source_directory.is_absolute()
         assert generated_directory.is_absolute()
@@ -41,6 +48,14 @@ class BuildScriptSet:
         # Each build script path will be an absolute path.
         self._build_scripts: Dict[Path, BuildScript] = {}
 
+        # Resolver shared by every target that adds paths to the build scripts
+        self._path_resolver = PathResolver()
+
+        # Cache shared by every target that scans directories for sources
+        self._directory_scan_cache = directory_scan_cache \
+            if directory_scan_cache is not None else DirectoryScanCache()
+        self._directory_scan_cache.ignore_directory(generated_directory)
+
 
     def __bool__(self) -> bool:
         """
@@ -49,6 +64,13 @@ class BuildScriptSet:
         return bool(self._build_scripts)
 
 
+    def __iter__(self) -> Iterator[BuildScript]:
+        """
+        Iterates over the build scripts in the set.
+        """
+        return iter(self._build_scripts.values())
+
+
     def __len__(self) -> int:
         """
         Gets the number of build scripts in the set.
@@ -56,6 +78,32 @@ class BuildScriptSet:
         return len(self._build_scripts)
 
 
+    @property
+    def caller_paths(self) -> List[Path]:
+        """
+        Gets the paths of the PyMake build scripts that build scripts were
+          created for.
+        """
+        return list(self._build_scripts.keys())
+
+
+    @property
+    def directory_scan_cache(self) -> DirectoryScanCache:
+        """
+        Gets the cache used when scanning directories for source files.
+        """
+        return self._directory_scan_cache
+
+
+    @property
+    def path_resolver(self) -> PathResolver:
+        """
+        Gets the resolver used to convert paths added to targets into absolute
+          paths.
+        """
+        return self._path_resolver
+
+
     def get_or_add_build_script(self, caller_path: Optional[Path] = None) \
         -> BuildScript:
         """
@@ -64,10 +112,11 @@ class BuildScriptSet:
           script instance will be created and added to the set.
         @param caller_path Path to the PyMake build script that triggered the
           creation of the build script. If this is None, the caller path will
-          be determined using the closest external frame.
+          be determined using the active origin context or, if no context is
+          active, the closest external frame.
         """
         if caller_path is None:
-            caller_path = CallerInfo.closest_external_frame().file_path
+            caller_path = OriginContext.capture().file_path
         assert caller_path.is_absolute()
 
         # If a build script already exists for the file, return it
@@ -100,13 +149,64 @@ class BuildScriptSet:
         return build_script
 
 
-    def generate(self):
+    def merge_build_script(self,
+        caller_path: Path,
+        build_script: BuildScript) -> None:
+        """
+        Adds a build script that was created by another build script set.
+        This is used to add the build scripts created by worker processes that
+          evaluated PyMake build scripts. If the set already has a build
+          script for the caller path, the other build script's commands are
+          appended to it.
+        @param caller_path Absolute path to the PyMake build script that the
+          build script was created for.
+        @param build_script Build script to add.
+        """
+        assert caller_path.is_absolute()
+        if caller_path in self._build_scripts:
+            self._build_scripts[caller_path].generator.commands.extend(
+                build_script.generator.commands)
+        else:
+            self._build_scripts[caller_path] = build_script
+
+
+    def coalesce_commands(self) -> int:
+        """
+        Merges repeated target commands in every build script.
+        @returns The total number of commands that were eliminated.
+        """
+        return sum(
+            build_script.generator.coalesce_commands()
+            for build_script in self._build_scripts.values()
+        )
+
+
+    def generate(self, max_workers: Optional[int] = None) -> int:
         """
         Generates all build scripts.
+        Build scripts whose contents are unchanged are not rewritten.
+        @param max_workers Maximum number of threads to write files with. If
+          this is None, a default number of threads will be used.
+        @returns The number of build scripts that were written.
+        """
+        writer = ParallelFileWriter(max_workers)
+        self.queue_writes(writer)
+        return sum(writer.write_all())
+
+
+    def queue_writes(self, writer: ParallelFileWriter) -> None:
+        """
+        Queues all build scripts to be written by a writer.
+        @param writer Writer to queue the build scripts with.
         """
         for build_script in self._build_scripts.values():
-            print(f"Generating '{build_script.target_path}'...")
-            build_script.generator.write_file(build_script.target_path)
+            writer.add(
+                build_script.target_path,
+                functools.partial(
+                    build_script.generator.write_file,
+                    build_script.target_path
+                )
+            )
 
 
     @staticmethod
@@ -1,31 +1,76 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
 import argparse
-from importlib import util
+import copy
+import functools
+import os
 from pathlib import Path
 from pymake.common.cmake_version import ECMakeVersion
 from pymake.common.project_language import EProjectLanguage
+from pymake.common.target_weight import ETargetWeight
+from pymake.common.trace_file_format import ETraceFileFormat
+from pymake.core.build_script_registry import BuildScriptRegistry
 from pymake.core.build_script_set import BuildScriptSet
+from pymake.core.cmake_invocation import CMakeInvocation
+from pymake.core.concurrent_preset_builder import ConcurrentPresetBuilder
+from pymake.core.configure_stamp import ConfigureStamp
+from pymake.core.critical_path_analysis import CriticalPathAnalysis
+from pymake.core.generation_manifest import GenerationManifest
 from pymake.core.preset import Preset
 from pymake.core.project import Project
 from pymake.core.pymake_args import PyMakeArgs
-from pymake.targets.target import ITarget
+from pymake.core.subdirectory_evaluator import SubdirectoryEvaluator
+from pymake.core.target_graph import TargetGraph
+from pymake.generators.binary_file_generator import BinaryFileGenerator
+from pymake.generators.cmake_command import CMakeCommand
+from pymake.generators.json_file_generator import JsonFileGenerator
+from pymake.generators.trace_file_generator import ITraceFileGenerator
 from pymake.generators.yaml_file_generator import YamlFileGenerator
+from pymake.targets.target import ITarget
 from pymake.tracing.caller_info import CallerInfo
 from pymake.tracing.caller_info_formatter import ICallerInfoFormatter
+from pymake.tracing.frame_walker import FrameWalker
+from pymake.tracing.null_caller_info_formatter import NullCallerInfoFormatter
+from pymake.tracing.origin_context import OriginContext
 from pymake.tracing.shortened_caller_info_formatter \
     import ShortenedCallerInfoFormatter
+from pymake.tracing.trace_database import TraceDatabase
+from pymake.tracing.trace_record import TraceRecord
+from pymake.util.bytecode_cache import BytecodeCache
+from pymake.util.directory_scan_cache import DirectoryScanCache
+from pymake.util.parallel_file_writer import ParallelFileWriter
+from pymake.util.system_resources import SystemResources
+import subprocess
 import sys
-from typing import Dict, Iterable, List, Optional, Sequence
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 class ICMake(ABC):
     """
     Represents a single PyMake-based CMake project.
     """
+    # Name of the Ninja job pool that limits the number of parallel link jobs
+    LINK_JOB_POOL = "pymake_link"
+
+    # Options that only take effect when the project is created
+    # Each option is stored as the name of its attribute in `PyMakeArgs` and
+    #   the flag that sets it.
+    _INIT_OPTIONS = (
+        ("trace", "--no-trace"),
+        ("regenerate", "--regenerate"),
+        ("eval_jobs", "--eval-jobs"),
+        ("lazy", "--lazy"),
+        ("targets", "--target"),
+        ("critical_path", "--critical-path"),
+        ("explain", "--explain"),
+        ("who_added", "--who-added")
+    )
+
     def __init__(self,
         minimum_version: ECMakeVersion,
         source_directory: str | Path,
-        generated_directory: str | Path):
+        generated_directory: str | Path,
+        enable_tracing: Optional[bool] = None,
+        args: Optional[Sequence[str]] = None):
         """
         Initializes the CMake project.
         @param minimum_version Minimum CMake version required to build the
@@ -36,11 +81,28 @@ class ICMake(ABC):
         @param generated_directory Path to the directory where PyMake should
           generate the CMake files. If this is a relative path, it will be
           interpreted relative to the caller's directory.
+        @param enable_tracing Whether tracing information should be captured
+          and written to the generated files. If this is None, tracing will be
+          enabled unless `--no-trace` was passed on the command line.
+        @param args Arguments to process to determine how the project should
+          be evaluated and built. If not supplied, the arguments will be read
+          from sys.argv.
         """
         self._minimum_version = minimum_version
+        self._args = list(sys.argv[1:] if args is None else args)
+        cli_args = ICMake._parse_init_args(self._args)
+        self._cli_args = cli_args
+
+        # Determine whether tracing should be enabled
+        # This must be done before any traced values are created since
+        #   disabling tracing skips capturing tracing information entirely.
+        if enable_tracing is None:
+            enable_tracing = cli_args.trace
+        self._tracing_enabled = enable_tracing
+        OriginContext.set_tracing_enabled(enable_tracing)
 
         # Get the path to the caller's directory
-        caller_info = CallerInfo.closest_external_frame()
+        caller_info = OriginContext.capture()
         caller_dir = Path(caller_info.file_path).parent
 
         # Add the caller's directory to the Python path so that PyMake build
@@ -61,9 +123,50 @@ class ICMake(ABC):
         self._source_dir = source_directory
         self._generated_dir = generated_directory
 
+        # Check whether the files generated by a previous run are up to date
+        # If they are, subdirectories won't be evaluated and no files will be
+        #   generated.
+        self._manifest_path = self._generated_dir / \
+            GenerationManifest.FILE_NAME
+        self._manifest_inputs = GenerationManifest.capture_inputs(
+            ICMake._get_generation_args(cli_args))
+        # Analyzing the target graph requires every subdirectory to be
+        #   evaluated, so the manifest is ignored in that case.
+        self._is_up_to_date = False
+        self._manifest: Optional[GenerationManifest] = None
+        if not cli_args.regenerate and not cli_args.critical_path:
+            manifest = GenerationManifest.load(self._manifest_path)
+            if manifest is not None and \
+                manifest.is_up_to_date(self._manifest_inputs):
+                self._is_up_to_date = True
+                self._manifest = manifest
+
+        # Whether PyMake was run to query the trace database
+        # Trace queries don't require the project to be evaluated.
+        self._is_query = cli_args.explain is not None or \
+            cli_args.who_added is not None
+
+        # PyMake build scripts that have been executed for the project
+        self._executed_scripts: List[Path] = [caller_info.file_path]
+
+        # Cache of compiled subdirectory build scripts
+        self._bytecode_cache = BytecodeCache(
+            self._generated_dir / BytecodeCache.DIR_NAME)
+
+        # Registry that ensures each build script is only executed once, no
+        #   matter whether it's loaded by `add_subdirectory()` or imported by
+        #   another build script
+        self._script_registry = BuildScriptRegistry(
+            caller_dir,
+            self._bytecode_cache
+        )
+        self._script_registry.register_main(caller_info.file_path)
+        BuildScriptRegistry.install(self._script_registry)
+
         # Formatter that should be used when printing tracing info
         self._formatter: ICallerInfoFormatter = \
-            ShortenedCallerInfoFormatter(self._source_dir)
+            ShortenedCallerInfoFormatter(self._source_dir) \
+            if self._tracing_enabled else NullCallerInfoFormatter()
 
         # Project scopes added to the project, indexed by project name
         self._projects: Dict[str, Project] = {}
@@ -74,16 +177,59 @@ class ICMake(ABC):
         # Presets to use if none are specified
         self._default_presets: List[Preset] = []
 
+        # Create the generated directory before any build script scans the
+        #   source tree for files
+        # Creating it later would change the modification time of its parent
+        #   after the parent was scanned.
+        if not self._is_up_to_date and not self._is_query:
+            self._generated_dir.mkdir(parents=True, exist_ok=True)
+
         # Build script set to write CMake code to
+        # Directory listings from the previous run are reused so that
+        #   unchanged directories don't need to be scanned again.
+        self._scan_cache_path = self._generated_dir / \
+            DirectoryScanCache.FILE_NAME
         self._build_scripts = BuildScriptSet(
             self._source_dir,
             self._generated_dir,
-            self._formatter
+            self._formatter,
+            DirectoryScanCache.load(self._scan_cache_path) \
+                if not self._is_up_to_date and not self._is_query else None
         )
 
         # Targets that have been added by any project
         self._targets: Dict[str, ITarget] = {}
 
+        # Link dependencies between all targets in the project
+        self._target_graph = TargetGraph()
+
+        # Evaluator for subdirectory build scripts
+        # If `--eval-jobs` was passed, subdirectories added by the root build
+        #   script are evaluated in worker processes before generating. If
+        #   `--lazy` was passed, only subdirectories needed by the requested
+        #   targets are evaluated.
+        self._subdirectory_evaluator = SubdirectoryEvaluator(
+            self._build_scripts,
+            self._projects,
+            self._target_graph,
+            self._script_registry,
+            self._bytecode_cache,
+            self._formatter,
+            self._capture_evaluation_state,
+            cli_args.eval_jobs,
+            cli_args.lazy
+        )
+
+        # Commands that add each subdirectory queued for lazy evaluation,
+        #   indexed by the path of the subdirectory's build script
+        # The commands of subdirectories that are never evaluated are removed
+        #   so that the generated CMake files don't refer to them.
+        self._subdirectory_commands: Dict[Path, CMakeCommand] = {}
+
+        # Python files executed by the subdirectory evaluator's worker
+        #   processes
+        self._worker_files: List[Path] = []
+
 
     def add_subdirectory(self, subdirectory: str | Path):
         """
@@ -94,8 +240,17 @@ class ICMake(ABC):
         @throws FileNotFoundError Thrown if the subdirectory does not contain
           a 'make.py' file.
         """
+        # If the generated files are up to date or a trace query is being
+        #   answered, the subdirectory's build script doesn't need to be
+        #   evaluated
+        if self._is_up_to_date or self._is_query:
+            return
+
         # Get the path to the caller's directory
-        caller_info = CallerInfo.closest_external_frame()
+        # Note that an origin context is not opened until after the
+        #   subdirectory's build script has been executed since the build
+        #   script's own calls must capture their own origins.
+        caller_info = OriginContext.capture()
         caller_dir = Path(caller_info.file_path).parent
 
         # Get absolute path to the subdirectory
@@ -112,19 +267,22 @@ class ICMake(ABC):
                 "a 'make.py' file.")
 
         # Call the subdirectory's make.py file
-        spec = util.spec_from_file_location("make", make_py_path)
-        assert spec
-        assert spec.loader
-        module = util.module_from_spec(spec)
-        spec.loader.exec_module(module)
+        # If another build script already imported the subdirectory's build
+        #   script, it won't be executed again. If subdirectories are evaluated
+        #   in parallel, the build script is only queued here.
+        self._executed_scripts.append(make_py_path)
+        self._subdirectory_evaluator.submit(make_py_path)
 
         # Generate the CMake code for the subdirectory
         subdir_rel_path = subdirectory.relative_to(self._source_dir)
-        generator = self._build_scripts.get_or_add_build_script().generator
-        with generator.open_method_block("add_subdirectory") as b:
-            b.add_arguments(str(subdir_rel_path))
+        with OriginContext(caller_info):
+            generator = self._build_scripts.get_or_add_build_script().generator
+            with generator.open_method_block("add_subdirectory") as b:
+                b.add_arguments(str(subdir_rel_path))
+            self._subdirectory_commands[make_py_path] = b.command
 
 
+    @OriginContext.entry_point
     def add_project(self,
         project_name: str,
         project_languages: EProjectLanguage | Iterable[EProjectLanguage]) -> Project:
@@ -156,6 +314,7 @@ class ICMake(ABC):
         return project
 
 
+    @OriginContext.entry_point
     def add_preset(self, preset_name: str) -> Preset:
         """
         Adds a preset to the CMake project.
@@ -178,6 +337,32 @@ class ICMake(ABC):
         return preset
 
 
+    @property
+    def is_up_to_date(self) -> bool:
+        """
+        Gets whether the files generated by a previous run are up to date.
+        If this is true, subdirectories are not evaluated and `generate()` will
+          not generate any files.
+        """
+        return self._is_up_to_date
+
+
+    @property
+    def target_graph(self) -> TargetGraph:
+        """
+        Gets the link dependencies between all targets in the project.
+        """
+        return self._target_graph
+
+
+    @property
+    def tracing_enabled(self) -> bool:
+        """
+        Gets whether tracing information is captured and generated.
+        """
+        return self._tracing_enabled
+
+
     def build(self,
         generate_first: bool = True,
         args: Optional[Sequence[str]] = None) -> None:
@@ -186,34 +371,45 @@ class ICMake(ABC):
         @param generate_first If True, the CMake build scripts will be
           generated before building the project.
         @param args Arguments to process to determine how the build should be
-          run. If not supplied, the arguments will be read from sys.argv.
+          run. If not supplied, the arguments the project was created with will
+          be used. Options that affect how the project is evaluated, such as
+          `--no-trace` or `--lazy`, only take effect when passed to the
+          constructor; a warning is printed if they differ from the
+          constructor's arguments.
         """
-        if generate_first:
-            self.generate()
-
         # Process command line arguments
-        parser = argparse.ArgumentParser()
-        parser.add_argument(
-            "-v",
-            "--verbose",
-            action="store_true",
-            help="Enables verbose output from CMake."
-        )
-        parser.add_argument(
-            "presets",
-            nargs="*",
-            help="PyMake preset(s) to use when building the project."
-        )
+        # Unlike the constructor, this exits if help was requested or if the
+        #   arguments are malformed.
         if not args:
-            args = sys.argv[1:]
-        cli_args = parser.parse_known_args(
-            args,
-            namespace=PyMakeArgs(
-                verbose=False,
-                presets=[]
+            cli_args = ICMake._parse_args(self._args)
+        else:
+            cli_args = ICMake._parse_args(args)
+            self._warn_ignored_args(cli_args)
+
+        # Trace queries are answered using the trace database written by a
+        #   previous run, so nothing is generated or built
+        if cli_args.explain is not None or cli_args.who_added is not None:
+            self._query_trace_database(cli_args)
+            return
+
+        # Analyzing the target graph only requires the project to have been
+        #   evaluated, so nothing is generated or built
+        if cli_args.critical_path:
+            self._analyze_critical_path(cli_args)
+            return
+
+        if generate_first:
+            self.generate(
+                generate_trace_files=cli_args.trace,
+                coalesce_commands=cli_args.coalesce,
+                emit_jobs=cli_args.emit_jobs,
+                trace_format=cli_args.trace_format
             )
-        )[0]
-        assert isinstance(cli_args, PyMakeArgs)
+
+        # Presets defined by subdirectory build scripts are missing if the
+        #   subdirectories weren't evaluated
+        if self._is_up_to_date:
+            self._restore_presets()
 
         # Get the presets to use
         selected_presets: List[Preset] = []
@@ -225,6 +421,7 @@ class ICMake(ABC):
             selected_presets = self._default_presets
         if not selected_presets:
             raise ValueError("Error: No presets were specified")
+        ICMake._resolve_job_counts(cli_args, selected_presets)
 
         # Run CMake
         exit_code = self._run_cmake(cli_args, selected_presets)
@@ -232,36 +429,90 @@ class ICMake(ABC):
             raise RuntimeError(f"CMake failed with exit code {exit_code}")
 
 
-    def generate(self, generate_trace_files: bool = True) -> None:
+    def generate(self,
+        generate_trace_files: bool = True,
+        coalesce_commands: bool = False,
+        emit_jobs: Optional[int] = None,
+        trace_format: ETraceFileFormat = ETraceFileFormat.JSON) -> None:
         """
         Generates the CMake build scripts.
-        @param generate_trace_files Whether to also generate trace files.
+        @param generate_trace_files Whether to also generate trace files. Trace
+          files are never generated if tracing is disabled.
+        @param coalesce_commands Whether repeated target commands should be
+          merged into single command invocations before generating the CMake
+          build scripts.
+        @param emit_jobs Maximum number of threads to write generated files
+          with. If this is None, a default number of threads will be used.
+        @param trace_format Format to write trace files in.
         """
-        self._build_scripts.generate()
-        self._generate_presets(self._generated_dir / "CMakePresets.json")
+        # Nothing is generated if a trace query is being answered since the
+        #   project was not fully evaluated
+        if self._is_query:
+            return
+        if self._is_up_to_date:
+            print("Generated files are up to date; skipping generation.")
+            return
+        self._evaluate_pending_subdirectories()
 
-        if generate_trace_files:
-            # Generate trace files for each target
-            for _, t in self._targets.items():
-                trace_file_path = self._generated_dir.joinpath(
-                    f"{t.target_name}.target.yaml")
-                print(f"Generating '{trace_file_path}'...")
-                t.generate_trace_file(
-                    trace_file_path,
-                    YamlFileGenerator()
-                )
-
-            # Generate trace files for each preset
-            for _, p in self._presets.items():
-                trace_file_path = self._generated_dir.joinpath(
-                    f"{p.preset_name}.preset.yaml")
-                print(f"Generating '{trace_file_path}'...")
-                p.generate_trace_file(
-                    trace_file_path,
-                    YamlFileGenerator()
-                )
+        # Every build script has been evaluated, so the code objects cached
+        #   while capturing origins are no longer needed
+        FrameWalker.clear_code_objects()
+
+        if coalesce_commands:
+            eliminated = self._build_scripts.coalesce_commands()
+            print(f"Coalesced target commands; eliminated {eliminated} " +
+                "command(s).")
 
+        # Queue all files so that they can be written in parallel
+        writer = ParallelFileWriter(emit_jobs)
+        self._build_scripts.queue_writes(writer)
 
+        generate_trace_files = generate_trace_files and self._tracing_enabled
+        if generate_trace_files and \
+            trace_format != ETraceFileFormat.DATABASE:
+            self._queue_trace_files(writer, trace_format)
+
+        # Track how many files were written so that the number of unchanged
+        #   files can be reported
+        generated_files = writer.paths
+        files_written = sum(writer.write_all())
+        presets_path = self._generated_dir / "CMakePresets.json"
+        presets_written = self._generate_presets(presets_path)
+        if presets_written is not None:
+            generated_files.append(presets_path)
+            files_written += presets_written
+
+        if generate_trace_files and \
+            trace_format == ETraceFileFormat.DATABASE:
+            database_path = self._generated_dir / TraceDatabase.FILE_NAME
+            generated_files.append(database_path)
+            files_written += self._generate_trace_database(database_path)
+
+        files_generated = len(generated_files)
+        print(f"Generated {files_generated} file(s): {files_written} " +
+            f"written, {files_generated - files_written} unchanged.")
+        if self._bytecode_cache.hits or self._bytecode_cache.misses:
+            print(f"Loaded {self._bytecode_cache.hits} build script(s) " +
+                "from the bytecode cache, saving " +
+                f"{self._bytecode_cache.saved_seconds * 1000:.1f} ms of " +
+                f"compilation; compiled {self._bytecode_cache.misses}.")
+
+        # Record the inputs used to generate the files so that the next run
+        #   can skip generation if nothing has changed
+        scan_cache = self._build_scripts.directory_scan_cache
+        self._ignore_preset_directories()
+        scan_cache.write_file(self._scan_cache_path)
+        GenerationManifest.capture(
+            self._manifest_inputs,
+            self._get_executed_scripts(),
+            generated_files,
+            scan_cache.scanned_directories,
+            {n: p.generate_trace_dict() for n, p in self._presets.items()},
+            [p.preset_name for p in self._default_presets]
+        ).write_file(self._manifest_path)
+
+
+    @OriginContext.entry_point
     def set_default_presets(self, presets: Preset | Iterable[Preset]):
         """
         Sets the default preset for the CMake project.
@@ -272,27 +523,725 @@ class ICMake(ABC):
 
 
     @abstractmethod
-    def _generate_presets(self, output_path: Path) -> None:
+    def _generate_presets(self, output_path: Path) -> Optional[bool]:
         """
         Generates the CMakePresets.json file (if supported).
+        The file is only written if its contents would change.
         @param output_path Path where the CMakePresets.json file should be
           written.
+        @returns True if the file was written, False if the file was unchanged,
+          or None if presets are not supported.
         """
         raise NotImplementedError()
 
 
     @abstractmethod
+    def _get_cmake_invocation(self,
+        args: PyMakeArgs,
+        presets: List[Preset]) -> CMakeInvocation:
+        """
+        Gets the CMake commands that configure and build the project.
+        @param args Arguments that were passed to PyMake. The job counts must
+          have been resolved.
+        @param presets Presets that should be used when building the project.
+          Will always contain at least one value.
+        @returns The CMake commands to run.
+        """
+        raise NotImplementedError()
+
+
     def _run_cmake(self,
         args: PyMakeArgs,
         presets: List[Preset]) -> int:
         """
         Runs CMake to build the project.
-        @param args Arguments that were passed to PyMake.
+        CMake's configure step is skipped if the build directory was last
+          configured with the same generated files and preset values.
+        @param args Arguments that were passed to PyMake. The job counts must
+          have been resolved.
         @param presets Presets that should be used when building the project.
           Will always contain at least one value.
         @returns The exit code of the CMake process.
         """
-        raise NotImplementedError()
+        if args.concurrent_presets and len(presets) > 1:
+            return self._run_cmake_concurrently(args, presets)
+
+        invocation = self._get_cmake_invocation(args, presets)
+        needs_configure, stamp = self._check_configure_stamp(args, invocation)
+        if needs_configure:
+            print(f"Running command: {' '.join(invocation.configure_cmd)}")
+            configure_process = subprocess.run(
+                invocation.configure_cmd,
+                env=invocation.env,
+                shell=False,
+                cwd=invocation.cwd
+            )
+            if configure_process.returncode != 0:
+                return configure_process.returncode
+            if stamp is not None and invocation.binary_dir is not None:
+                stamp.write_file(invocation.binary_dir)
+        else:
+            print("Build directory is up to date; skipping configure.")
+
+        print(f"Running command: {' '.join(invocation.build_cmd)}")
+        build_process = subprocess.run(
+            invocation.build_cmd,
+            env=invocation.env,
+            shell=False,
+            cwd=invocation.cwd
+        )
+        return build_process.returncode
+
+
+    @staticmethod
+    def _create_arg_parser(add_help: bool) -> argparse.ArgumentParser:
+        """
+        Creates the parser for the arguments passed to PyMake.
+        @param add_help Whether the parser should handle `-h` and exit if the
+          arguments are malformed. If this is False, `-h` is treated as an
+          unknown argument and errors raise an `ArgumentError` instead.
+        @returns The parser.
+        """
+        parser = argparse.ArgumentParser(
+            add_help=add_help,
+            exit_on_error=add_help
+        )
+        parser.add_argument(
+            "-v",
+            "--verbose",
+            action="store_true",
+            help="Enables verbose output from CMake."
+        )
+        parser.add_argument(
+            "--no-trace",
+            dest="trace",
+            action="store_false",
+            help="Disables tracing comments in generated CMake files and " +
+                "the generation of trace files."
+        )
+        parser.add_argument(
+            "--coalesce",
+            action="store_true",
+            help="Merges repeated target commands in generated CMake files."
+        )
+        parser.add_argument(
+            "-j",
+            "--jobs",
+            type=int,
+            help="Number of parallel jobs to build with. Defaults to the " +
+                "presets' value or the number of available CPUs, limited by " +
+                "the available memory."
+        )
+        parser.add_argument(
+            "--link-jobs",
+            type=int,
+            help="Number of parallel link jobs to build with when using a " +
+                "Ninja generator. Defaults to the presets' value or a value " +
+                "based on the available CPUs and memory."
+        )
+        parser.add_argument(
+            "--concurrent-presets",
+            action="store_true",
+            help="Configures and builds each selected preset in its own " +
+                "build directory at the same time, sharing the job budget " +
+                "between the presets."
+        )
+        parser.add_argument(
+            "--reconfigure",
+            action="store_true",
+            help="Runs CMake's configure step even if the build directory " +
+                "was configured with the same generated files and presets."
+        )
+        parser.add_argument(
+            "--emit-jobs",
+            type=int,
+            help="Maximum number of threads used to write generated files."
+        )
+        parser.add_argument(
+            "--eval-jobs",
+            type=int,
+            help="Evaluates independent subdirectory build scripts in this " +
+                "many worker processes. Only supported on platforms that " +
+                "can fork processes."
+        )
+        parser.add_argument(
+            "--lazy",
+            action="store_true",
+            help="Only evaluates and generates the subdirectories needed by " +
+                "the requested targets."
+        )
+        parser.add_argument(
+            "--target",
+            dest="targets",
+            action="append",
+            metavar="TARGET",
+            help="Target to evaluate subdirectories for in lazy mode. May " +
+                "be passed multiple times. Defaults to the selected presets' " +
+                "targets."
+        )
+        parser.add_argument(
+            "--trace-format",
+            type=ETraceFileFormat,
+            choices=list(ETraceFileFormat),
+            metavar="{" + ",".join(f.value for f in ETraceFileFormat) + "}",
+            help="Format to write trace files in. Defaults to 'json'."
+        )
+        parser.add_argument(
+            "--explain",
+            metavar="TARGET",
+            help="Prints every traced value of a target or preset using the " +
+                "trace database, then exits."
+        )
+        parser.add_argument(
+            "--who-added",
+            metavar="VALUE",
+            help="Prints the location that added a path or other value using " +
+                "the trace database, then exits."
+        )
+        parser.add_argument(
+            "--critical-path",
+            action="store_true",
+            help="Prints the critical path through the target graph and " +
+                f"writes it to '{CriticalPathAnalysis.FILE_NAME}', then exits."
+        )
+        parser.add_argument(
+            "--critical-path-weight",
+            type=ETargetWeight,
+            choices=list(ETargetWeight),
+            metavar="{" + ",".join(w.value for w in ETargetWeight) + "}",
+            help="How targets are weighted when finding the critical path. " +
+                "Defaults to 'unit'."
+        )
+        parser.add_argument(
+            "--ninja-log",
+            metavar="PATH",
+            help="Path to the '.ninja_log' file of a previous build. " +
+                "Implies '--critical-path-weight build-time'."
+        )
+        parser.add_argument(
+            "--regenerate",
+            action="store_true",
+            help="Regenerates the CMake files even if they're up to date."
+        )
+        parser.add_argument(
+            "presets",
+            nargs="*",
+            help="PyMake preset(s) to use when building the project."
+        )
+        return parser
+
+
+    @staticmethod
+    def _get_generation_args(cli_args: PyMakeArgs) -> List[str]:
+        """
+        Gets the arguments that may affect the generated files.
+        Arguments that only affect how the project is built, such as job
+          counts and, outside of lazy mode, the selected presets, don't
+          require the generated files to be regenerated.
+        @param cli_args Arguments that were passed to PyMake.
+        @returns The arguments, in a normalized form. Arguments not recognized
+          by PyMake are always included since the build script may use them.
+        """
+        args = list(cli_args.unknown_args)
+        if not cli_args.trace:
+            args.append("--no-trace")
+        if cli_args.coalesce:
+            args.append("--coalesce")
+        args.extend(["--trace-format", cli_args.trace_format.value])
+        if cli_args.lazy:
+            args.append("--lazy")
+            if cli_args.targets:
+                for target in cli_args.targets:
+                    args.extend(["--target", target])
+            else:
+                # Lazy mode evaluates the subdirectories needed by the
+                #   selected presets' targets
+                args.extend(cli_args.presets)
+        return args
+
+
+    @staticmethod
+    def _get_link_job_pool_args(args: PyMakeArgs) -> List[str]:
+        """
+        Gets the arguments that limit the number of parallel link jobs when
+          configuring the project.
+        The limit is implemented using a Ninja job pool, so it's ignored by
+          other generators.
+        @param args Arguments that were passed to PyMake. The job counts must
+          have been resolved.
+        @returns The arguments to pass to CMake's configure step.
+        """
+        return [
+            f"-DCMAKE_JOB_POOLS={ICMake.LINK_JOB_POOL}={args.link_jobs}",
+            f"-DCMAKE_JOB_POOL_LINK={ICMake.LINK_JOB_POOL}"
+        ]
+
+
+    @staticmethod
+    def _merge_presets(presets: List[Preset]) -> Preset:
+        """
+        Merges the full values of several presets into a single preset.
+        @param presets Presets to merge. Must contain at least one value. Later
+          presets take precedence over earlier presets.
+        @returns The merged preset.
+        """
+        preset = presets[0].as_full_preset()
+        for p in presets[1:]:
+            preset.merge(p.as_full_preset())
+        return preset
+
+
+    @staticmethod
+    def _parse_args(
+        args: Sequence[str],
+        parser: Optional[argparse.ArgumentParser] = None) -> PyMakeArgs:
+        """
+        Parses the arguments passed to PyMake.
+        Arguments not recognized by PyMake are stored in the `unknown_args`
+          field so that they can be processed by the build script.
+        @param args Arguments to parse.
+        @param parser Parser to use. If this is None, a parser that handles
+          `-h` and exits on malformed arguments is used.
+        @returns The parsed arguments.
+        """
+        if parser is None:
+            parser = ICMake._create_arg_parser(True)
+        cli_args, unknown_args = parser.parse_known_args(
+            args,
+            namespace=PyMakeArgs(
+                verbose=False,
+                presets=[]
+            )
+        )
+        assert isinstance(cli_args, PyMakeArgs)
+        cli_args.unknown_args = unknown_args
+        return cli_args
+
+
+    @staticmethod
+    def _parse_init_args(args: Sequence[str]) -> PyMakeArgs:
+        """
+        Parses the arguments passed to PyMake when the project is created.
+        The build script may parse the same arguments with its own parser
+          before calling `build()`, so this never exits. Help requests and
+          malformed arguments are reported by `build()` instead.
+        @param args Arguments to parse.
+        @returns The parsed arguments, or the default arguments if the
+          arguments are malformed.
+        """
+        parser = ICMake._create_arg_parser(False)
+        try:
+            return ICMake._parse_args(args, parser)
+        except argparse.ArgumentError:
+            return ICMake._parse_args([], parser)
+
+
+    def _analyze_critical_path(self, cli_args: PyMakeArgs) -> None:
+        """
+        Prints and exports the critical path through the target graph.
+        @param cli_args Arguments that were passed to PyMake.
+        @throws ValueError Thrown if targets should be weighted by build time
+          but no Ninja log file was given.
+        """
+        self._evaluate_pending_subdirectories()
+        weight_kind = cli_args.critical_path_weight
+        if cli_args.ninja_log is not None:
+            weight_kind = ETargetWeight.BUILD_TIME
+        analysis = CriticalPathAnalysis(
+            self._target_graph,
+            CriticalPathAnalysis.get_weights(
+                self._target_graph,
+                weight_kind,
+                cli_args.ninja_log
+            ),
+            weight_kind
+        )
+        print(analysis.format_report(self._formatter))
+
+        output_path = self._generated_dir / CriticalPathAnalysis.FILE_NAME
+        analysis.write_file(output_path)
+        print(f"Wrote critical path analysis to '{output_path}'.")
+
+
+    def _capture_evaluation_state(self) -> object:
+        """
+        Captures the state of the project that isn't stored in targets or
+          build scripts.
+        Subdirectory build scripts that change this state can't be evaluated
+          in worker processes.
+        @returns A value that compares equal to the value returned by a later
+          call if the state is unchanged.
+        """
+        return (
+            list(self._projects),
+            [p.generate_trace_dict() for p in self._presets.values()],
+            [p.preset_name for p in self._default_presets]
+        )
+
+
+    def _check_configure_stamp(self,
+        args: PyMakeArgs,
+        invocation: CMakeInvocation) -> Tuple[bool, Optional[ConfigureStamp]]:
+        """
+        Checks whether CMake's configure step must be run.
+        The configure step can be skipped if the build directory was last
+          configured with the same generated CMake files, configure command,
+          and preset values. If the configure step must be run, the build
+          directory's stamp is removed so that a failed configure step is
+          never mistaken for a successful one.
+        @param args Arguments that were passed to PyMake.
+        @param invocation CMake commands that configure and build the project.
+        @returns Whether the configure step must be run, and the stamp to write
+          to the build directory if the configure step succeeds. The stamp is
+          None if the build directory or the generated files are not known.
+        """
+        # The generated files are recorded in the manifest even if generation
+        #   was skipped because the files were up to date
+        manifest = GenerationManifest.load(self._manifest_path)
+        if invocation.binary_dir is None or manifest is None:
+            return True, None
+
+        stamp = ConfigureStamp.capture(
+            [Path(p) for p in manifest.generated_files],
+            invocation.configure_cmd,
+            invocation.preset
+        )
+        if not args.reconfigure and \
+            stamp.is_up_to_date(invocation.binary_dir):
+            return False, stamp
+        ConfigureStamp.remove(invocation.binary_dir / ConfigureStamp.FILE_NAME)
+        return True, stamp
+
+
+    @staticmethod
+    def _create_trace_file_generator(trace_format: ETraceFileFormat) \
+        -> ITraceFileGenerator:
+        """
+        Creates the generator used to write trace files in a format.
+        @param trace_format Format to write trace files in.
+        @returns The generator for the format.
+        """
+        if trace_format == ETraceFileFormat.YAML:
+            return YamlFileGenerator()
+        elif trace_format == ETraceFileFormat.BINARY:
+            return BinaryFileGenerator()
+        return JsonFileGenerator()
+
+
+    def _generate_trace_database(self, output_path: Path) -> bool:
+        """
+        Writes the tracing information for all targets and presets to a
+          single trace database.
+        @param output_path Path to write the trace database to.
+        @returns True if the file was written, or False if the file was
+          unchanged.
+        """
+        database = TraceDatabase.create()
+        try:
+            for _, t in self._targets.items():
+                database.add_target(t.target_name, t.generate_trace_dict())
+            for _, p in self._presets.items():
+                database.add_preset(p.preset_name, p.generate_trace_dict())
+            return database.write_file(output_path)
+        finally:
+            database.close()
+
+
+    def _evaluate_pending_subdirectories(self) -> None:
+        """
+        Evaluates the subdirectory build scripts queued for parallel or lazy
+          evaluation.
+        Subdirectories skipped by lazy evaluation are removed from the
+          generated CMake files.
+        """
+        self._worker_files.extend(
+            self._subdirectory_evaluator.evaluate_pending(
+                self._get_requested_targets()))
+
+        skipped_scripts = self._subdirectory_evaluator.skipped_scripts
+        if not skipped_scripts:
+            return
+        skipped_commands = set(
+            id(self._subdirectory_commands[p]) for p in skipped_scripts)
+        for build_script in self._build_scripts:
+            commands = build_script.generator.commands
+            commands[:] = [c for c in commands if id(c) not in skipped_commands]
+        print(f"Skipped {len(skipped_scripts)} subdirectory(s) not needed " +
+            "by the requested targets.")
+
+
+    def _get_executed_scripts(self) -> List[Path]:
+        """
+        Gets all Python files executed as part of evaluating the project.
+        This includes PyMake build scripts as well as any modules within the
+          source directory that the build scripts imported.
+        @returns The paths of the executed files.
+        """
+        scripts = list(self._executed_scripts)
+        scripts.extend(self._build_scripts.caller_paths)
+
+        source_dir = str(self._source_dir) + os.path.sep
+        generated_dir = str(self._generated_dir) + os.path.sep
+        file_names = [
+            getattr(module, "__file__", None)
+            for module in list(sys.modules.values())
+        ]
+        file_names.extend(str(p) for p in self._worker_files)
+        for file_name in file_names:
+            if not file_name:
+                continue
+            file_name = os.path.abspath(file_name)
+            if file_name.startswith(source_dir) and \
+                not file_name.startswith(generated_dir):
+                scripts.append(Path(file_name))
+        return scripts
+
+
+    def _get_requested_targets(self) -> List[str]:
+        """
+        Gets the targets that the build was requested to build.
+        @returns The targets passed with `--target`, or the targets of the
+          selected presets if none were passed.
+        """
+        if self._cli_args.targets:
+            return list(self._cli_args.targets)
+
+        presets = [
+            self._presets[p]
+            for p in self._cli_args.presets
+            if p in self._presets
+        ]
+        if not presets:
+            presets = self._default_presets
+        targets: List[str] = []
+        for preset in presets:
+            targets.extend(preset.as_full_preset().targets)
+        return targets
+
+
+    def _ignore_preset_directories(self) -> None:
+        """
+        Prevents later runs from scanning the presets' build and install
+          directories for source files.
+        Presets may be defined after sources are globbed, so the directories
+          are recorded in the directory scan cache for the next run rather
+          than being ignored before the build scripts are evaluated.
+        """
+        scan_cache = self._build_scripts.directory_scan_cache
+        for preset in self._presets.values():
+            full_preset = preset.as_full_preset()
+            for dir_path in (full_preset.binary_dir, full_preset.install_dir):
+                if dir_path:
+                    scan_cache.ignore_directory(
+                        os.path.join(self._source_dir, dir_path))
+
+
+    def _print_trace_records(self, records: List[TraceRecord]) -> None:
+        """
+        Prints records read from the trace database.
+        @param records Records to print.
+        """
+        formatter = ShortenedCallerInfoFormatter(self._source_dir)
+        for record in records:
+            scope = f" [{record.scope}]" if record.scope else ""
+            origin = ""
+            if record.file is not None and record.line is not None:
+                caller_info = CallerInfo(record.file, record.line)
+                origin = f" ({formatter.format(caller_info)})"
+            print(f"{record.object_kind} '{record.object_name}': " +
+                f"{record.property_name}{scope}: {record.value}{origin}")
+
+
+    def _query_trace_database(self, cli_args: PyMakeArgs) -> None:
+        """
+        Answers the trace queries passed on the command line.
+        @param cli_args Arguments that were passed to PyMake.
+        @throws FileNotFoundError Thrown if the trace database does not exist.
+        """
+        database = TraceDatabase.open(
+            self._generated_dir / TraceDatabase.FILE_NAME)
+        try:
+            if cli_args.explain is not None:
+                records = database.explain(cli_args.explain)
+                if not records:
+                    print(f"No trace data found for '{cli_args.explain}'.")
+                self._print_trace_records(records)
+
+            if cli_args.who_added is not None:
+                # Paths are stored as absolute paths, so check for the value
+                #   as given and as a path relative to the working directory
+                value = cli_args.who_added
+                records = database.who_added(value)
+                resolved_value = str(Path(value).absolute().resolve())
+                if resolved_value != value:
+                    records.extend(database.who_added(resolved_value))
+                if not records:
+                    print(f"No trace data found for '{value}'.")
+                self._print_trace_records(records)
+        finally:
+            database.close()
+
+
+    def _queue_trace_files(self,
+        writer: ParallelFileWriter,
+        trace_format: ETraceFileFormat) -> None:
+        """
+        Queues a trace file for each target and preset to be written.
+        @param writer Writer to queue the trace files with.
+        @param trace_format Format to write the trace files in.
+        """
+        # Trace data is collected on this thread so that only rendering and
+        #   writing the trace files is done by the worker threads
+        trace_generator = ICMake._create_trace_file_generator(trace_format)
+        extension = trace_generator.file_extension
+
+        # Generate trace files for each target
+        for _, t in self._targets.items():
+            trace_file_path = self._generated_dir.joinpath(
+                f"{t.target_name}.target.{extension}")
+            writer.add(trace_file_path, functools.partial(
+                trace_generator.write_file,
+                {t.target_name: t.generate_trace_dict()},
+                trace_file_path
+            ))
+
+        # Generate trace files for each preset
+        for _, p in self._presets.items():
+            trace_file_path = self._generated_dir.joinpath(
+                f"{p.preset_name}.preset.{extension}")
+            writer.add(trace_file_path, functools.partial(
+                trace_generator.write_file,
+                {p.preset_name: p.generate_trace_dict()},
+                trace_file_path
+            ))
+
+
+    @staticmethod
+    def _resolve_job_counts(
+        cli_args: PyMakeArgs,
+        presets: List[Preset]) -> None:
+        """
+        Determines the number of parallel jobs to build with.
+        Values passed on the command line take precedence over values set by
+          the presets. If neither sets a value, the value is based on the CPUs
+          and memory available to PyMake, taking container limits into
+          account.
+        @param cli_args Arguments that were passed to PyMake. The job counts
+          are updated in place.
+        @param presets Presets that will be used to build the project.
+        @throws ValueError Thrown if a job count is less than 1.
+        """
+        preset = ICMake._merge_presets(presets)
+        jobs = cli_args.jobs if cli_args.jobs is not None else preset.jobs
+        link_jobs = cli_args.link_jobs \
+            if cli_args.link_jobs is not None else preset.link_jobs
+
+        if jobs is None or link_jobs is None:
+            resources = SystemResources()
+            if jobs is None:
+                jobs = resources.default_compile_jobs
+            if link_jobs is None:
+                link_jobs = min(jobs, resources.default_link_jobs)
+        if jobs < 1:
+            raise ValueError(f"Error: Invalid job count {jobs}")
+        if link_jobs < 1:
+            raise ValueError(f"Error: Invalid link job count {link_jobs}")
+
+        cli_args.jobs = jobs
+        cli_args.link_jobs = link_jobs
+        print(f"Building with {jobs} job(s) and {link_jobs} link job(s).")
+
+
+    def _restore_presets(self) -> None:
+        """
+        Restores the presets recorded by the run that generated the files.
+        Subdirectory build scripts aren't evaluated when the generated files
+          are up to date, so any presets or default presets they define are
+          missing. Since the build scripts haven't changed, the recorded
+          presets match the presets that evaluating them would define.
+        """
+        assert self._manifest is not None
+        for preset_name, props in self._manifest.presets.items():
+            if preset_name not in self._presets:
+                self._presets[preset_name] = \
+                    Preset.from_trace_dict(preset_name, props)
+        self._default_presets = [
+            self._presets[n] for n in self._manifest.default_presets
+            if n in self._presets
+        ]
+
+
+    def _run_cmake_concurrently(self,
+        args: PyMakeArgs,
+        presets: List[Preset]) -> int:
+        """
+        Configures and builds the project for each preset at the same time.
+        Each preset is built in its own build directory. The job counts are
+          treated as a budget that's shared between the presets, so building
+          several presets at once doesn't oversubscribe the machine.
+        @param args Arguments that were passed to PyMake. The job counts must
+          have been resolved.
+        @param presets Presets to build. Must contain at least two values.
+        @returns 0 if every preset was built, or else the exit code of the
+          first preset that failed.
+        @throws ValueError Thrown if two presets use the same build directory.
+        """
+        jobs = ICMake._split_job_budget(args.jobs, len(presets))
+        link_jobs = ICMake._split_job_budget(args.link_jobs, len(presets))
+        print(f"Building {len(presets)} preset(s) concurrently with a " +
+            f"budget of {args.jobs} job(s) and {args.link_jobs} link job(s).")
+
+        builder = ConcurrentPresetBuilder()
+        binary_dirs: Dict[Path, str] = {}
+        for preset, preset_jobs, preset_link_jobs in \
+            zip(presets, jobs, link_jobs):
+            # A preset's own job counts may lower its share of the budget
+            full_preset = preset.as_full_preset()
+            preset_args = copy.copy(args)
+            preset_args.jobs = min(preset_jobs, full_preset.jobs or preset_jobs)
+            preset_args.link_jobs = min(
+                preset_link_jobs,
+                full_preset.link_jobs or preset_link_jobs
+            )
+
+            invocation = self._get_cmake_invocation(preset_args, [preset])
+            if invocation.binary_dir is not None:
+                binary_dir = invocation.binary_dir.resolve()
+                if binary_dir in binary_dirs:
+                    raise ValueError("Error: Presets " +
+                        f"'{binary_dirs[binary_dir]}' and " +
+                        f"'{preset.preset_name}' use the same build " +
+                        "directory and can't be built concurrently")
+                binary_dirs[binary_dir] = preset.preset_name
+
+            needs_configure, stamp = self._check_configure_stamp(
+                preset_args,
+                invocation
+            )
+            builder.add_pipeline(
+                preset.preset_name,
+                invocation,
+                needs_configure,
+                stamp
+            )
+        return builder.run()
+
+
+    @staticmethod
+    def _split_job_budget(budget: Optional[int], count: int) -> List[int]:
+        """
+        Splits a job budget between several presets.
+        @param budget Total number of jobs. Must have been resolved.
+        @param count Number of presets to split the budget between.
+        @returns The number of jobs for each preset. Earlier presets receive
+          any remainder. Each preset receives at least one job, even if the
+          budget is smaller than the number of presets.
+        """
+        assert budget is not None
+        return [
+            max(1, budget // count + (1 if i < budget % count else 0))
+            for i in range(count)
+        ]
 
 
     def _on_target_added(self, target: ITarget) -> Optional[ITarget]:
@@ -305,3 +1254,29 @@ class ICMake(ABC):
         if target.target_name in self._targets:
             return self._targets[target.target_name]
         self._targets[target.target_name] = target
+        self._target_graph.add_target(target)
+        target.on_target_linked = self._target_graph.add_link
+
+
+    def _warn_ignored_args(self, cli_args: PyMakeArgs) -> None:
+        """
+        Warns about options passed to `build()` that only take effect when
+          passed to the constructor.
+        @param cli_args Arguments that were passed to `build()`.
+        """
+        ignored_flags = [
+            flag
+            for name, flag in ICMake._INIT_OPTIONS
+            if getattr(cli_args, name) != getattr(self._cli_args, name)
+        ]
+
+        # In lazy mode, the selected presets determine which subdirectories
+        #   are evaluated
+        if self._cli_args.lazy and cli_args.presets != self._cli_args.presets:
+            ignored_flags.append("presets")
+
+        if ignored_flags:
+            print("Warning: The following arguments passed to build() " +
+                "differ from the arguments the project was created with and " +
+                "only take effect when passed to the constructor: " +
+                f"{', '.join(ignored_flags)}.", file=sys.stderr)
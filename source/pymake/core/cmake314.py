@@ -2,18 +2,22 @@ import os
 from pathlib import Path
 from pymake.common.cmake_version import ECMakeVersion
 from pymake.core.cmake import ICMake
+from pymake.core.cmake_invocation import CMakeInvocation
 from pymake.core.preset import Preset
 from pymake.core.pymake_args import PyMakeArgs
-import subprocess
-from typing import List
+from pymake.tracing.origin_context import OriginContext
+from typing import List, Optional, Sequence
 
 class CMake314(ICMake):
     """
     ICMake implementation that generates CMake v3.14-compliant code.
     """
+    @OriginContext.entry_point
     def __init__(self,
         source_directory: str | Path = ".",
-        generated_directory: str | Path = ".pymake"):
+        generated_directory: str | Path = ".pymake",
+        enable_tracing: Optional[bool] = None,
+        args: Optional[Sequence[str]] = None):
         """
         Initializes the CMake instance.
         @param source_directory Path to the directory containing the source
@@ -22,11 +26,19 @@ class CMake314(ICMake):
         @param generated_directory Path to the directory where PyMake should
           generate the CMake files. If this is a relative path, it will be
           interpreted relative to the caller's directory.
+        @param enable_tracing Whether tracing information should be captured
+          and written to the generated files. If this is None, tracing will be
+          enabled unless `--no-trace` was passed on the command line.
+        @param args Arguments to process to determine how the project should
+          be evaluated and built. If not supplied, the arguments will be read
+          from sys.argv.
         """
         super().__init__(
             ECMakeVersion.V3_14,
             source_directory,
-            generated_directory
+            generated_directory,
+            enable_tracing,
+            args
         )
 
         # Generate the initial CMake code
@@ -35,37 +47,43 @@ class CMake314(ICMake):
             b.add_keyword_arguments("VERSION", self._minimum_version.value)
 
 
-    def _generate_presets(self, output_path: Path) -> None:
+    def _generate_presets(self, output_path: Path) -> Optional[bool]:
         """
         Generates the CMakePresets.json file (if supported).
+        The file is only written if its contents would change.
         @param output_path Path where the CMakePresets.json file should be
           written.
+        @returns True if the file was written, False if the file was unchanged,
+          or None if presets are not supported.
         """
         # Do nothing - presets are not supported in CMake v3.14
+        return None
 
 
-    def _run_cmake(self, args: PyMakeArgs, presets: List[Preset]) -> int:
+    def _get_cmake_invocation(self,
+        args: PyMakeArgs,
+        presets: List[Preset]) -> CMakeInvocation:
         """
-        Runs CMake to build the project.
-        @param args Arguments that were passed to PyMake.
+        Gets the CMake commands that configure and build the project.
+        @param args Arguments that were passed to PyMake. The job counts must
+          have been resolved.
         @param presets Presets that should be used when building the project.
           Will always contain at least one value.
-        @returns The exit code of the CMake process.
+        @returns The CMake commands to run.
         """
         # In the dev container, CMake is in the /usr/bin directory
         cmake = "cmake3.14"
 
         # Get the full preset values to use
-        preset = presets[0].as_full_preset()
-        if len(presets) > 1:
-            for p in presets[1:]:
-                preset.merge(p.as_full_preset())
+        preset = ICMake._merge_presets(presets)
 
         # Fall back to CMake defaults if values aren't provided
         binary_dir = preset.binary_dir if preset.binary_dir else "build"
 
         # Get the environment variables to use
-        env_vars = preset.env_variables
+        # The preset's variables are copied so that the preset only records
+        #   the variables it sets.
+        env_vars = dict(preset.env_variables)
         env_vars.update(os.environ)
 
         # Generate the configure command
@@ -89,33 +107,26 @@ class CMake314(ICMake):
             cmake_configure_cmd.extend([
                 "-D" + k + "=" + v
             ])
+        cmake_configure_cmd.extend(ICMake._get_link_job_pool_args(args))
         if args.verbose:
             cmake_configure_cmd.append("--verbose")
 
-        # Run the configuration step
-        print(f"Running command: {' '.join(cmake_configure_cmd)}")
-        configure_process = subprocess.run(
-            cmake_configure_cmd,
-            env=env_vars,
-            shell=False
-        )
-        if configure_process.returncode != 0:
-            return configure_process.returncode
-
         # Generate the build command
         cmake_build_cmd = [
             cmake,
             "--build",
             binary_dir,
             "--target",
-            "install"
+            "install",
+            "--parallel",
+            str(args.jobs)
         ]
 
-        # Run the build step
-        print(f"Running command: {' '.join(cmake_build_cmd)}")
-        build_process = subprocess.run(
+        return CMakeInvocation(
+            preset,
+            cmake_configure_cmd,
             cmake_build_cmd,
-            env=env_vars,
-            shell=False
+            Path(binary_dir),
+            env_vars,
+            None
         )
-        return build_process.returncode
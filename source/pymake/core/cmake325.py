@@ -2,18 +2,23 @@ import json
 from pathlib import Path
 from pymake.common.cmake_version import ECMakeVersion
 from pymake.core.cmake import ICMake
+from pymake.core.cmake_invocation import CMakeInvocation
 from pymake.core.preset import Preset
 from pymake.core.pymake_args import PyMakeArgs
-import subprocess
-from typing import Dict, List
+from pymake.tracing.origin_context import OriginContext
+from pymake.util.file_writer import FileWriter
+from typing import Dict, List, Optional, Sequence
 
 class CMake325(ICMake):
     """
     ICMake implementation that generates CMake v3.25-compliant code.
     """
+    @OriginContext.entry_point
     def __init__(self,
         source_directory: str | Path = ".",
-        generated_directory: str | Path = ".pymake"):
+        generated_directory: str | Path = ".pymake",
+        enable_tracing: Optional[bool] = None,
+        args: Optional[Sequence[str]] = None):
         """
         Initializes the CMake instance.
         @param source_directory Path to the directory containing the source
@@ -22,11 +27,19 @@ class CMake325(ICMake):
         @param generated_directory Path to the directory where PyMake should
           generate the CMake files. If this is a relative path, it will be
           interpreted relative to the caller's directory.
+        @param enable_tracing Whether tracing information should be captured
+          and written to the generated files. If this is None, tracing will be
+          enabled unless `--no-trace` was passed on the command line.
+        @param args Arguments to process to determine how the project should
+          be evaluated and built. If not supplied, the arguments will be read
+          from sys.argv.
         """
         super().__init__(
             ECMakeVersion.V3_25,
             source_directory,
-            generated_directory
+            generated_directory,
+            enable_tracing,
+            args
         )
 
         # Generate the initial CMake code
@@ -35,11 +48,14 @@ class CMake325(ICMake):
             b.add_keyword_arguments("VERSION", self._minimum_version.value)
 
 
-    def _generate_presets(self, output_path: Path) -> None:
+    def _generate_presets(self, output_path: Path) -> Optional[bool]:
         """
         Generates the CMakePresets.json file (if supported).
+        The file is only written if its contents would change.
         @param output_path Path where the CMakePresets.json file should be
           written.
+        @returns True if the file was written, False if the file was unchanged,
+          or None if presets are not supported.
         """
         # Generate the dictionary to convert to a JSON object
         presets_file: Dict[str, object] = {}
@@ -69,17 +85,22 @@ class CMake325(ICMake):
         presets_file["buildPresets"] = build_presets
 
         # Write the presets file
-        with open(output_path, "w") as f:
-            json.dump(presets_file, f, indent=2)
+        return FileWriter.write_if_changed(
+            output_path,
+            json.dumps(presets_file, indent=2)
+        )
 
 
-    def _run_cmake(self, args: PyMakeArgs, presets: List[Preset]) -> int:
+    def _get_cmake_invocation(self,
+        args: PyMakeArgs,
+        presets: List[Preset]) -> CMakeInvocation:
         """
-        Runs CMake to build the project.
-        @param args Arguments that were passed to PyMake.
+        Gets the CMake commands that configure and build the project.
+        @param args Arguments that were passed to PyMake. The job counts must
+          have been resolved.
         @param presets Presets that should be used when building the project.
           Will always contain at least one value.
-        @returns The exit code of the CMake process.
+        @returns The CMake commands to run.
         """
         # In the dev container, CMake is in the /usr/bin directory
         cmake = "cmake3.25"
@@ -93,16 +114,7 @@ class CMake325(ICMake):
                 "--preset",
                 preset.preset_name
             ])
-
-        # Run the configure command
-        print(f"Running command: {' '.join(cmake_configure_cmd)}")
-        configure_process = subprocess.run(
-            cmake_configure_cmd,
-            shell=False,
-            cwd=self._generated_dir
-        )
-        if configure_process.returncode != 0:
-            return configure_process.returncode
+        cmake_configure_cmd.extend(ICMake._get_link_job_pool_args(args))
 
         # Generate the build command
         cmake_build_cmd = [
@@ -114,12 +126,23 @@ class CMake325(ICMake):
                 "--preset",
                 preset.preset_name
             ])
+        cmake_build_cmd.extend([
+            "--parallel",
+            str(args.jobs)
+        ])
 
-        # Run the build step
-        print(f"Running command: {' '.join(cmake_build_cmd)}")
-        build_process = subprocess.run(
+        # The build directory is set by the presets, so it's resolved the same
+        #   way as when the presets are written to CMakePresets.json
+        full_preset = ICMake._merge_presets(presets)
+        binary_dir = full_preset.as_configure_preset(
+            self._source_dir,
+            self._generated_dir
+        ).get("binaryDir")
+        return CMakeInvocation(
+            full_preset,
+            cmake_configure_cmd,
             cmake_build_cmd,
-            shell=False,
-            cwd=self._generated_dir
+            Path(str(binary_dir)) if binary_dir else None,
+            None,
+            self._generated_dir
         )
-        return build_process.returncode
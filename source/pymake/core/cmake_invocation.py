@@ -0,0 +1,30 @@
+from pathlib import Path
+from pymake.core.preset import Preset
+from typing import Dict, List, NamedTuple, Optional
+
+class CMakeInvocation(NamedTuple):
+    """
+    Stores the CMake commands that configure and build the project for a set
+      of presets.
+    """
+    ## Full preset that the build directory is configured with.
+    # If several presets were selected, this is the result of merging them.
+    preset: Preset
+
+    ## Command that runs CMake's configure step.
+    configure_cmd: List[str]
+
+    ## Command that runs CMake's build step.
+    build_cmd: List[str]
+
+    ## Path to the build directory, or None if it's not known.
+    # The configure step is always run if the build directory is not known.
+    binary_dir: Optional[Path]
+
+    ## Environment variables to run CMake with.
+    # If this is None, CMake inherits PyMake's environment.
+    env: Optional[Dict[str, str]]
+
+    ## Directory to run CMake in.
+    # If this is None, CMake is run in PyMake's working directory.
+    cwd: Optional[Path]
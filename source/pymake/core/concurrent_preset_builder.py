@@ -0,0 +1,199 @@
+import asyncio
+from pymake.core.cmake_invocation import CMakeInvocation
+from pymake.core.configure_stamp import ConfigureStamp
+import sys
+import time
+from typing import List, Optional, Tuple
+
+class ConcurrentPresetBuilder:
+    """
+    Configures and builds the project for several presets at the same time.
+    Each preset's configure and build steps run in order, but the steps of
+      different presets run concurrently. Each line of CMake's output is
+      prefixed with the name of the preset that produced it so that the
+      interleaved output can be told apart.
+    """
+    # Number of bytes to read from a CMake process' output at a time
+    _READ_SIZE = 1 << 16
+
+    def __init__(self):
+        """
+        Initializes the builder.
+        """
+        # Presets to build
+        # Each preset is stored as its name, the CMake commands to run, whether
+        #   the configure step must be run, and the stamp to write to the
+        #   build directory if the configure step succeeds.
+        self._pipelines: List[Tuple[
+            str,
+            CMakeInvocation,
+            bool,
+            Optional[ConfigureStamp]
+        ]] = []
+
+        # Result of each preset's pipeline, in the order the presets were
+        #   added
+        # Each result is stored as the time the pipeline took in seconds and
+        #   the exit code of the last CMake process that was run.
+        self._results: List[Tuple[float, int]] = []
+
+
+    @property
+    def results(self) -> List[Tuple[float, int]]:
+        """
+        Gets the duration in seconds and exit code of each preset's pipeline,
+          in the order the presets were added.
+        """
+        return self._results
+
+
+    def add_pipeline(self,
+        preset_name: str,
+        invocation: CMakeInvocation,
+        needs_configure: bool,
+        stamp: Optional[ConfigureStamp]) -> None:
+        """
+        Adds a preset to configure and build.
+        @param preset_name Name of the preset. Used to prefix CMake's output.
+        @param invocation CMake commands that configure and build the preset.
+        @param needs_configure Whether the configure step must be run. If this
+          is False, only the build step is run.
+        @param stamp Stamp to write to the build directory if the configure
+          step succeeds.
+        """
+        self._pipelines.append(
+            (preset_name, invocation, needs_configure, stamp))
+
+
+    def run(self) -> int:
+        """
+        Runs every preset's pipeline and waits for them all to finish.
+        A failing pipeline doesn't stop the other pipelines. Once every
+          pipeline has finished, a summary of each preset's result is printed.
+        @returns 0 if every pipeline succeeded, or else the exit code of the
+          first preset whose pipeline failed.
+        """
+        self._results = asyncio.run(self._run_all())
+
+        name_width = max(len(p[0]) for p in self._pipelines)
+        print("Preset summary:")
+        for (preset_name, _, _, _), (duration, exit_code) in \
+            zip(self._pipelines, self._results):
+            print(f"  {preset_name:<{name_width}}  {duration:8.2f} s  " +
+                f"exit code {exit_code}")
+        sys.stdout.flush()
+
+        for _, exit_code in self._results:
+            if exit_code != 0:
+                return exit_code
+        return 0
+
+
+    async def _run_all(self) -> List[Tuple[float, int]]:
+        """
+        Runs every preset's pipeline concurrently.
+        @returns The result of each pipeline.
+        """
+        return list(await asyncio.gather(*[
+            self._run_pipeline(*p) for p in self._pipelines
+        ]))
+
+
+    async def _run_pipeline(self,
+        preset_name: str,
+        invocation: CMakeInvocation,
+        needs_configure: bool,
+        stamp: Optional[ConfigureStamp]) -> Tuple[float, int]:
+        """
+        Configures and builds a single preset.
+        @param preset_name Name of the preset.
+        @param invocation CMake commands that configure and build the preset.
+        @param needs_configure Whether the configure step must be run.
+        @param stamp Stamp to write to the build directory if the configure
+          step succeeds.
+        @returns The time the pipeline took in seconds and the exit code of
+          the last CMake process that was run.
+        """
+        start = time.perf_counter()
+        prefix = f"[{preset_name}] "
+        if needs_configure:
+            exit_code = await ConcurrentPresetBuilder._run_command(
+                prefix,
+                invocation,
+                invocation.configure_cmd
+            )
+            if exit_code != 0:
+                return time.perf_counter() - start, exit_code
+            if stamp is not None and invocation.binary_dir is not None:
+                stamp.write_file(invocation.binary_dir)
+        else:
+            ConcurrentPresetBuilder._write_line(prefix,
+                "Build directory is up to date; skipping configure.")
+
+        exit_code = await ConcurrentPresetBuilder._run_command(
+            prefix,
+            invocation,
+            invocation.build_cmd
+        )
+        return time.perf_counter() - start, exit_code
+
+
+    @staticmethod
+    async def _run_command(
+        prefix: str,
+        invocation: CMakeInvocation,
+        cmd: List[str]) -> int:
+        """
+        Runs a CMake command, prefixing each line of its output.
+        @param prefix Prefix to add to each line of output.
+        @param invocation CMake commands that the command belongs to. Used to
+          get the command's environment and working directory.
+        @param cmd Command to run.
+        @returns The exit code of the process.
+        """
+        ConcurrentPresetBuilder._write_line(prefix,
+            f"Running command: {' '.join(cmd)}")
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                env=invocation.env,
+                cwd=invocation.cwd
+            )
+        except OSError as e:
+            ConcurrentPresetBuilder._write_line(prefix,
+                f"Error: Failed to run '{cmd[0]}': {e}")
+            return 1
+        assert process.stdout
+
+        # Output is read in chunks rather than lines so that long lines can't
+        #   exceed the stream's buffer limit
+        pending = b""
+        while True:
+            chunk = await process.stdout.read(
+                ConcurrentPresetBuilder._READ_SIZE)
+            if not chunk:
+                break
+            lines = (pending + chunk).split(b"\n")
+            pending = lines.pop()
+            for line in lines:
+                ConcurrentPresetBuilder._write_line(prefix,
+                    line.rstrip(b"\r").decode("utf-8", errors="replace"))
+        if pending:
+            ConcurrentPresetBuilder._write_line(prefix,
+                pending.rstrip(b"\r").decode("utf-8", errors="replace"))
+        return await process.wait()
+
+
+    @staticmethod
+    def _write_line(prefix: str, line: str) -> None:
+        """
+        Writes a line of output.
+        Each line is written and flushed in a single call so that lines from
+          different presets are never interleaved mid-line.
+        @param prefix Prefix to add to the line.
+        @param line Line to write, without a trailing newline.
+        """
+        sys.stdout.write(f"{prefix}{line}\n")
+        sys.stdout.flush()
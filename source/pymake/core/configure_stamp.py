@@ -0,0 +1,146 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+from pathlib import Path
+from pymake.core.generation_manifest import GenerationManifest
+from pymake.core.preset import Preset
+from pymake.util.file_writer import FileWriter
+from typing import Iterable, Optional, Sequence
+
+class ConfigureStamp:
+    """
+    Records the inputs that a CMake build directory was configured with.
+    The stamp is written to the build directory after CMake's configure step
+      succeeds. If a later build would configure the build directory with the
+      same generated files and preset values, the configure step can be
+      skipped and CMake can be run in build mode directly.
+    """
+    # Name of the stamp file within the build directory
+    FILE_NAME = "pymake_configure_stamp.json"
+
+    # Version of the stamp file format
+    # This must be incremented whenever the format of the file changes.
+    FORMAT_VERSION = 1
+
+    # Names of the generated files that are read by CMake's configure step
+    # Other generated files, such as trace files, don't affect the build
+    #   directory.
+    CMAKE_FILE_NAMES = ("CMakeLists.txt", "CMakePresets.json")
+
+    # Name of the file that CMake's configure step writes to the build
+    #   directory
+    CMAKE_CACHE_FILE_NAME = "CMakeCache.txt"
+
+    def __init__(self, digest: str):
+        """
+        Initializes the stamp.
+        @param digest Hash of the inputs that the build directory was
+          configured with.
+        """
+        self._digest = digest
+
+
+    @property
+    def digest(self) -> str:
+        """
+        Gets the hash of the inputs that the build directory was configured
+          with.
+        """
+        return self._digest
+
+
+    @staticmethod
+    def capture(
+        generated_files: Iterable[Path],
+        configure_cmd: Sequence[str],
+        preset: Preset) -> ConfigureStamp:
+        """
+        Creates a stamp for the current configure inputs.
+        @param generated_files Paths to all files generated by PyMake. Only the
+          files read by CMake's configure step are hashed.
+        @param configure_cmd Command used to run CMake's configure step.
+        @param preset Full preset that the build directory is configured with.
+        @returns The stamp for the inputs.
+        """
+        cmake_files = {
+            str(p): GenerationManifest.hash_file(p)
+            for p in sorted(set(generated_files))
+            if p.name in ConfigureStamp.CMAKE_FILE_NAMES
+        }
+        inputs = {
+            "files": cmake_files,
+            "command": list(configure_cmd),
+            "generator": preset.generator,
+            "binaryDir": preset.binary_dir,
+            "installDir": preset.install_dir,
+            "cacheVariables": preset.cache_variables,
+            "environment": preset.env_variables
+        }
+        return ConfigureStamp(hashlib.sha256(
+            json.dumps(inputs, sort_keys=True).encode("utf-8")).hexdigest())
+
+
+    @staticmethod
+    def load(stamp_path: str | Path) -> Optional[ConfigureStamp]:
+        """
+        Loads a stamp written by a previous build.
+        @param stamp_path Path to the stamp file.
+        @returns The stamp, or None if the stamp does not exist or could not
+          be read.
+        """
+        try:
+            with open(stamp_path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(data, dict) or \
+            data.get("version") != ConfigureStamp.FORMAT_VERSION or \
+            not isinstance(data.get("digest"), str):
+            return None
+        return ConfigureStamp(data["digest"])
+
+
+    @staticmethod
+    def remove(stamp_path: str | Path) -> None:
+        """
+        Removes a stamp file if it exists.
+        This must be done before the configure step runs so that a failed
+          configure step is never mistaken for a successful one.
+        @param stamp_path Path to the stamp file.
+        """
+        try:
+            os.unlink(stamp_path)
+        except FileNotFoundError:
+            pass
+
+
+    def is_up_to_date(self, binary_dir: str | Path) -> bool:
+        """
+        Checks whether a build directory was configured with the same inputs.
+        @param binary_dir Path to the build directory.
+        @returns True if the build directory's stamp matches this stamp and the
+          build directory still contains a CMake cache.
+        """
+        binary_dir = Path(binary_dir)
+        stamp = ConfigureStamp.load(binary_dir / ConfigureStamp.FILE_NAME)
+        if stamp is None or stamp._digest != self._digest:
+            return False
+        return (binary_dir / ConfigureStamp.CMAKE_CACHE_FILE_NAME).is_file()
+
+
+    def write_file(self, binary_dir: str | Path) -> bool:
+        """
+        Writes the stamp to a build directory.
+        @param binary_dir Path to the build directory.
+        @returns True if the file was written, or False if the file was
+          unchanged.
+        """
+        return FileWriter.write_if_changed(
+            Path(binary_dir) / ConfigureStamp.FILE_NAME,
+            json.dumps({
+                "version": ConfigureStamp.FORMAT_VERSION,
+                "digest": self._digest
+            }, indent=2)
+        )
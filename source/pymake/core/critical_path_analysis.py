@@ -0,0 +1,251 @@
+import json
+from pathlib import Path
+from pymake.common.target_weight import ETargetWeight
+from pymake.core.target_analysis import TargetAnalysis
+from pymake.core.target_graph import TargetGraph
+from pymake.core.target_link import TargetLink
+from pymake.tracing.caller_info_formatter import ICallerInfoFormatter
+from pymake.util.file_writer import FileWriter
+from pymake.util.ninja_log import NinjaLog
+from typing import Dict, List, Optional
+
+class CriticalPathAnalysis:
+    """
+    Finds the longest chain of dependent targets in a project's target graph.
+    Targets on the critical path must be built one after another, so the
+      critical path limits how fast the project can be built no matter how
+      many targets are built in parallel. Breaking links on the critical path
+      is the most effective way to shorten the build.
+    """
+    # Name of the file that the analysis is exported to within the generated
+    #   directory
+    FILE_NAME = "pymake_critical_path.json"
+
+    def __init__(self,
+        graph: TargetGraph,
+        weights: Dict[str, float],
+        weight_kind: ETargetWeight = ETargetWeight.UNIT):
+        """
+        Analyzes the target graph.
+        @param graph Target graph to analyze.
+        @param weights Cost of building each target, indexed by target name.
+          Targets without a weight are given a weight of 0.
+        @param weight_kind How the weights were determined.
+        """
+        self._graph = graph
+        self._weight_kind = weight_kind
+
+        # Analysis of each target, indexed by target name and ordered
+        #   topologically
+        self._targets: Dict[str, TargetAnalysis] = {}
+        levels = graph.get_levels()
+        for name, level in levels.items():
+            weight = weights.get(name, 0.0)
+            start = max(
+                (self._targets[d].finish
+                    for d in graph.get_dependencies(name)),
+                default=0.0
+            )
+            self._targets[name] = TargetAnalysis(
+                target_name=name,
+                weight=weight,
+                level=level,
+                fan_in=len(graph.get_dependents(name)),
+                fan_out=len(graph.get_dependencies(name)),
+                finish=start + weight
+            )
+
+        # Follow the latest-finishing dependency back from the target that
+        #   finishes last
+        self._critical_links: List[TargetLink] = []
+        self._critical_path: List[str] = []
+        name = max(
+            self._targets,
+            key=lambda n: self._targets[n].finish,
+            default=None
+        )
+        while name is not None:
+            self._critical_path.append(name)
+            links = graph.get_links(name)
+            if not links:
+                break
+            link = max(
+                links,
+                key=lambda l: self._targets[l.dependency_name].finish
+            )
+            self._critical_links.append(link)
+            name = link.dependency_name
+
+
+    @property
+    def critical_links(self) -> List[TargetLink]:
+        """
+        Gets the links between the targets on the critical path.
+        These are the links that are worth breaking to shorten the build.
+        """
+        return self._critical_links
+
+
+    @property
+    def critical_path(self) -> List[str]:
+        """
+        Gets the names of the targets on the critical path.
+        The first target is the last target to finish building and each
+          following target is a target that the previous target links to.
+        """
+        return self._critical_path
+
+
+    @property
+    def critical_path_weight(self) -> float:
+        """
+        Gets the total weight of the targets on the critical path.
+        """
+        if not self._critical_path:
+            return 0.0
+        return self._targets[self._critical_path[0]].finish
+
+
+    @property
+    def targets(self) -> List[TargetAnalysis]:
+        """
+        Gets the analysis of each target, ordered topologically.
+        """
+        return list(self._targets.values())
+
+
+    @property
+    def total_weight(self) -> float:
+        """
+        Gets the total weight of every target in the graph.
+        """
+        return sum(t.weight for t in self._targets.values())
+
+
+    def get_level_widths(self) -> List[int]:
+        """
+        Gets the number of targets on each level.
+        Targets on the same level never depend on each other, so each value is
+          the maximum number of targets that can be built in parallel at that
+          level.
+        @returns The number of targets on each level, indexed by level.
+        """
+        widths: List[int] = []
+        for target in self._targets.values():
+            while len(widths) <= target.level:
+                widths.append(0)
+            widths[target.level] += 1
+        return widths
+
+
+    @staticmethod
+    def get_weights(
+        graph: TargetGraph,
+        weight_kind: ETargetWeight,
+        ninja_log_path: Optional[str | Path] = None) -> Dict[str, float]:
+        """
+        Gets the weight of each target in a graph.
+        @param graph Graph containing the targets to weight.
+        @param weight_kind How the targets should be weighted.
+        @param ninja_log_path Path to the Ninja log file of a previous build.
+          Only used if `weight_kind` is `ETargetWeight.BUILD_TIME`.
+        @returns The weight of each target, indexed by target name.
+        @throws ValueError Thrown if targets should be weighted by build time
+          but no Ninja log file was given.
+        """
+        if weight_kind == ETargetWeight.SOURCES:
+            return {
+                t.target_name: float(len(t.sources.public) +
+                    len(t.sources.private))
+                for t in graph.targets
+            }
+        if weight_kind == ETargetWeight.BUILD_TIME:
+            if ninja_log_path is None:
+                raise ValueError("Error: A Ninja log file must be specified " +
+                    "to weight targets by build time.")
+            return NinjaLog.load_target_times(
+                ninja_log_path,
+                [t.target_name for t in graph.targets]
+            )
+        return {t.target_name: 1.0 for t in graph.targets}
+
+
+    def format_report(self, formatter: ICallerInfoFormatter) -> str:
+        """
+        Formats the analysis as a human-readable report.
+        @param formatter Formatter used to print the origins of links.
+        @returns The report.
+        """
+        critical_weight = self.critical_path_weight
+        speedup = self.total_weight / critical_weight \
+            if critical_weight > 0 else 1.0
+        lines = [
+            f"Critical path analysis (weight: {self._weight_kind.value})",
+            f"  Targets: {len(self._targets)}, " +
+                f"links: {len(self._graph.links)}",
+            f"  Total weight: {self.total_weight:g}, " +
+                f"critical path weight: {critical_weight:g}, " +
+                f"maximum speedup: {speedup:.2f}x",
+            "Critical path:"
+        ]
+        for i, name in enumerate(self._critical_path):
+            target = self._targets[name]
+            lines.append(f"  {name} (weight {target.weight:g}, " +
+                f"finishes at {target.finish:g})")
+            if i < len(self._critical_links):
+                link = self._critical_links[i]
+                origin = formatter.format(link.origin)
+                origin = f" at {origin}" if origin else ""
+                lines.append(f"    links to '{link.dependency_name}' " +
+                    f"({link.scope.value}){origin}")
+
+        lines.append("Parallelism by level:")
+        for level, width in enumerate(self.get_level_widths()):
+            lines.append(f"  Level {level}: {width} target(s)")
+
+        lines.append("Targets:")
+        name_width = max((len(n) for n in self._targets), default=0)
+        for target in self._targets.values():
+            lines.append(f"  {target.target_name:<{name_width}}  " +
+                f"weight {target.weight:<8g} level {target.level:<4} " +
+                f"fan-in {target.fan_in:<4} fan-out {target.fan_out:<4} " +
+                f"finish {target.finish:g}")
+        return "\n".join(lines)
+
+
+    def to_dict(self) -> Dict[str, object]:
+        """
+        Converts the analysis to a dictionary that can be serialized.
+        @returns The analysis as a dictionary.
+        """
+        return {
+            "weight": self._weight_kind.value,
+            "total_weight": self.total_weight,
+            "critical_path_weight": self.critical_path_weight,
+            "critical_path": self._critical_path,
+            "critical_links": [
+                {
+                    "target": l.target_name,
+                    "dependency": l.dependency_name,
+                    "scope": l.scope.value,
+                    "file": str(l.origin.file_path),
+                    "line": l.origin.line_number
+                }
+                for l in self._critical_links
+            ],
+            "level_widths": self.get_level_widths(),
+            "targets": [t._asdict() for t in self._targets.values()]
+        }
+
+
+    def write_file(self, output_path: str | Path) -> bool:
+        """
+        Exports the analysis to a JSON file.
+        @param output_path Path to write the file to.
+        @returns True if the file was written, or False if the file was
+          unchanged.
+        """
+        return FileWriter.write_if_changed(
+            output_path,
+            json.dumps(self.to_dict(), indent=2)
+        )
@@ -0,0 +1,294 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+from pathlib import Path
+from pymake.util.file_writer import FileWriter
+import sys
+from typing import Dict, Iterable, List, Optional, Sequence
+
+class GenerationManifest:
+    """
+    Records the inputs used to generate a PyMake project's CMake files.
+    If the inputs recorded by a previous run match the current inputs, the
+      generated files are known to be up to date and evaluating the PyMake
+      build scripts can be skipped entirely.
+    """
+    # Name of the manifest file within the generated directory
+    FILE_NAME = "pymake_manifest.json"
+
+    # Version of the manifest file format
+    # This must be incremented whenever the format of the file changes.
+    FORMAT_VERSION = 3
+
+    # Prefix of environment variables that are recorded as inputs
+    # Build scripts that read environment variables should use this prefix so
+    #   that changing the variables invalidates the generated files.
+    ENV_VAR_PREFIX = "PYMAKE_"
+
+    def __init__(self,
+        inputs: Dict[str, str],
+        build_scripts: Dict[str, str],
+        generated_files: Dict[str, int],
+        directories: Optional[Dict[str, int]] = None,
+        presets: Optional[Dict[str, Dict[str, object]]] = None,
+        default_presets: Optional[List[str]] = None):
+        """
+        Initializes the manifest.
+        @param inputs Values that affect the generated files, such as the
+          command line arguments and the PyMake version, indexed by name.
+        @param build_scripts Hash of each build script that was executed,
+          indexed by the absolute path of the build script.
+        @param generated_files Size of each generated file, indexed by the
+          absolute path of the generated file.
+        @param directories Modification time in nanoseconds of each directory
+          that was scanned for source files, indexed by the absolute path of
+          the directory.
+        @param presets Properties of each preset defined by the build scripts,
+          as returned by `Preset.generate_trace_dict()`, indexed by preset
+          name.
+        @param default_presets Names of the presets to use if none are
+          specified.
+        """
+        self._inputs = inputs
+        self._build_scripts = build_scripts
+        self._generated_files = generated_files
+        self._directories = directories if directories is not None else {}
+        self._presets = presets if presets is not None else {}
+        self._default_presets = default_presets \
+            if default_presets is not None else []
+
+
+    @property
+    def inputs(self) -> Dict[str, str]:
+        """
+        Gets the values that affect the generated files, indexed by name.
+        """
+        return self._inputs
+
+
+    @property
+    def build_scripts(self) -> Dict[str, str]:
+        """
+        Gets the hash of each executed build script, indexed by path.
+        """
+        return self._build_scripts
+
+
+    @property
+    def generated_files(self) -> Dict[str, int]:
+        """
+        Gets the size of each generated file, indexed by path.
+        """
+        return self._generated_files
+
+
+    @property
+    def directories(self) -> Dict[str, int]:
+        """
+        Gets the modification time of each scanned directory, indexed by path.
+        """
+        return self._directories
+
+
+    @property
+    def presets(self) -> Dict[str, Dict[str, object]]:
+        """
+        Gets the properties of each preset defined by the build scripts,
+          indexed by preset name.
+        Subdirectory build scripts aren't evaluated if the generated files are
+          up to date, so presets they define must be restored from here.
+        """
+        return self._presets
+
+
+    @property
+    def default_presets(self) -> List[str]:
+        """
+        Gets the names of the presets to use if none are specified.
+        """
+        return self._default_presets
+
+
+    @staticmethod
+    def capture(
+        inputs: Dict[str, str],
+        build_scripts: Iterable[Path],
+        generated_files: Iterable[Path],
+        directories: Optional[Dict[str, int]] = None,
+        presets: Optional[Dict[str, Dict[str, object]]] = None,
+        default_presets: Optional[List[str]] = None) -> GenerationManifest:
+        """
+        Creates a manifest for the current state of the project.
+        @param inputs Values that affect the generated files, as returned by
+          `capture_inputs()`.
+        @param build_scripts Paths to all build scripts that were executed.
+        @param generated_files Paths to all files that were generated.
+        @param directories Modification time of each directory that was
+          scanned for source files, indexed by directory path.
+        @param presets Properties of each preset defined by the build scripts,
+          indexed by preset name.
+        @param default_presets Names of the presets to use if none are
+          specified.
+        @returns The manifest for the project.
+        """
+        return GenerationManifest(
+            inputs,
+            {
+                str(p): GenerationManifest.hash_file(p)
+                for p in sorted(set(build_scripts))
+            },
+            {
+                str(p): os.stat(p).st_size
+                for p in sorted(set(generated_files))
+            },
+            dict(sorted(directories.items())) if directories else {},
+            presets,
+            default_presets
+        )
+
+
+    @staticmethod
+    def capture_inputs(args: Sequence[str]) -> Dict[str, str]:
+        """
+        Gets the values other than build scripts that affect generated files.
+        @param args Command line arguments passed to the PyMake build script.
+        @returns The values that affect the generated files, indexed by name.
+        """
+        env_vars = {
+            k: v for k, v in os.environ.items()
+            if k.startswith(GenerationManifest.ENV_VAR_PREFIX)
+        }
+        return {
+            "args": json.dumps(list(args)),
+            "environment": json.dumps(env_vars, sort_keys=True),
+            "platform": sys.platform,
+            "pymake": GenerationManifest.get_pymake_fingerprint(),
+            "python": sys.version
+        }
+
+
+    @staticmethod
+    def get_pymake_fingerprint() -> str:
+        """
+        Gets a value that changes whenever PyMake itself changes.
+        PyMake does not have a version number, so the fingerprint is based on
+          the name, size, and modification time of each of PyMake's files.
+        @returns The fingerprint of the PyMake installation.
+        """
+        pymake_dir = Path(__file__).parent.parent
+        digest = hashlib.sha256()
+        dirs = [str(pymake_dir)]
+        while dirs:
+            with os.scandir(dirs.pop()) as it:
+                entries = sorted(it, key=lambda e: e.name)
+            for entry in entries:
+                if entry.is_dir():
+                    if entry.name != "__pycache__":
+                        dirs.append(entry.path)
+                elif entry.name.endswith(".py"):
+                    stat = entry.stat()
+                    digest.update(
+                        f"{entry.path}:{stat.st_size}:{stat.st_mtime_ns}\n"
+                            .encode("utf-8")
+                    )
+        return digest.hexdigest()
+
+
+    @staticmethod
+    def hash_file(file_path: str | Path) -> str:
+        """
+        Hashes the contents of a file.
+        @param file_path Path to the file to hash.
+        @returns The hash of the file, or an empty string if the file could not
+          be read.
+        """
+        try:
+            with open(file_path, "rb") as f:
+                return hashlib.sha256(f.read()).hexdigest()
+        except OSError:
+            return ""
+
+
+    @staticmethod
+    def load(manifest_path: str | Path) -> Optional[GenerationManifest]:
+        """
+        Loads a manifest written by a previous run.
+        @param manifest_path Path to the manifest file.
+        @returns The manifest, or None if the manifest does not exist or could
+          not be read.
+        """
+        try:
+            with open(manifest_path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if not isinstance(data, dict) or \
+            data.get("version") != GenerationManifest.FORMAT_VERSION:
+            return None
+        try:
+            return GenerationManifest(
+                dict(data["inputs"]),
+                dict(data["build_scripts"]),
+                dict(data["generated_files"]),
+                dict(data["directories"]),
+                {str(k): dict(v) for k, v in data["presets"].items()},
+                [str(p) for p in data["default_presets"]]
+            )
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return None
+
+
+    def is_up_to_date(self, inputs: Dict[str, str]) -> bool:
+        """
+        Checks whether the files recorded in the manifest are up to date.
+        @param inputs Current values that affect the generated files, as
+          returned by `capture_inputs()`.
+        @returns True if the inputs match the recorded inputs, no recorded
+          build script or scanned directory has changed, and every generated
+          file still exists.
+        """
+        if inputs != self._inputs:
+            return False
+
+        # Check the generated files first since checking them doesn't require
+        #   reading any files
+        for file_path, size in self._generated_files.items():
+            try:
+                if os.stat(file_path).st_size != size:
+                    return False
+            except OSError:
+                return False
+
+        # Files added to or removed from a scanned directory may change the
+        #   source files matched by a glob pattern
+        for dir_path, mtime in self._directories.items():
+            try:
+                if os.stat(dir_path).st_mtime_ns != mtime:
+                    return False
+            except OSError:
+                return False
+
+        for file_path, file_hash in self._build_scripts.items():
+            if GenerationManifest.hash_file(file_path) != file_hash:
+                return False
+        return True
+
+
+    def write_file(self, manifest_path: str | Path) -> bool:
+        """
+        Writes the manifest to a file.
+        @param manifest_path Path to write the manifest to.
+        @returns True if the file was written, or False if the file was
+          unchanged.
+        """
+        return FileWriter.write_if_changed(manifest_path, json.dumps({
+            "version": GenerationManifest.FORMAT_VERSION,
+            "inputs": self._inputs,
+            "build_scripts": self._build_scripts,
+            "generated_files": self._generated_files,
+            "directories": self._directories,
+            "presets": self._presets,
+            "default_presets": self._default_presets
+        }, indent=2))
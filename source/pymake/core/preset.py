@@ -24,6 +24,8 @@ class Preset(ITraced):
         env_vars: Optional[Dict[str, str]] = None,
         inherits: Optional[Preset] | Sequence[Preset] = None,
         targets: str | Iterable[str] = "install",
+        jobs: Optional[int] = None,
+        link_jobs: Optional[int] = None,
         is_full_preset: bool = False):
         """
         Initializes the preset.
@@ -42,6 +44,11 @@ class Preset(ITraced):
         @param env_vars Dictionary of environment variables to set.
         @param inherits Presets that this preset inherits from.
         @param targets Target(s) that should be built when using the preset.
+        @param jobs Number of parallel jobs to build with. If this is None,
+          PyMake will pick a number based on the available CPUs and memory.
+        @param link_jobs Number of parallel link jobs to build with. Only
+          supported by Ninja generators. If this is None, PyMake will pick a
+          number based on the available CPUs and memory.
         @param is_full_preset Whether the preset includes all values from
           presets that it inherits from.
         """
@@ -68,6 +75,8 @@ class Preset(ITraced):
             self._targets = [targets]
         else:
             self._targets = list(targets)
+        self._jobs = jobs
+        self._link_jobs = link_jobs
         self._is_full_preset = is_full_preset
 
 
@@ -223,6 +232,38 @@ class Preset(ITraced):
             self._targets = list(value)
 
 
+    @property
+    def jobs(self) -> Optional[int]:
+        """
+        Gets the number of parallel jobs to build with.
+        """
+        return self._jobs
+
+
+    @jobs.setter
+    def jobs(self, value: Optional[int]) -> None:
+        """
+        Sets the number of parallel jobs to build with.
+        """
+        self._jobs = value
+
+
+    @property
+    def link_jobs(self) -> Optional[int]:
+        """
+        Gets the number of parallel link jobs to build with.
+        """
+        return self._link_jobs
+
+
+    @link_jobs.setter
+    def link_jobs(self, value: Optional[int]) -> None:
+        """
+        Sets the number of parallel link jobs to build with.
+        """
+        self._link_jobs = value
+
+
     @property
     def base_presets(self) -> List[Preset]:
         """
@@ -252,6 +293,12 @@ class Preset(ITraced):
         preset["configurePreset"] = self._name
         preset["inheritConfigureEnvironment"] = True
         preset["targets"] = self._targets
+
+        # Build presets don't inherit from other presets, so the job count
+        #   must include inherited values
+        jobs = self.as_full_preset()._jobs
+        if jobs is not None:
+            preset["jobs"] = jobs
         return preset
 
 
@@ -328,13 +375,59 @@ class Preset(ITraced):
         return preset
 
 
-    def generate_trace_file(self,
-        output_path: Path,
-        generator: ITraceFileGenerator):
+    @staticmethod
+    def from_trace_dict(name: str, props: Dict[str, object]) -> Preset:
         """
-        Generates a trace file for the target.
-        @param output_path Path to the output file.
-        @param generator Generator to create the trace file using.
+        Creates a full preset from the properties returned by
+          `generate_trace_dict()`.
+        @param name Name of the preset.
+        @param props Properties of the preset.
+        @returns The preset. The preset doesn't inherit from any presets since
+          the properties already include all inherited values.
+        @throws TypeError Thrown if a property has the wrong type.
+        @throws ValueError Thrown if a property has an invalid value.
+        """
+        def get_str(key: str) -> Optional[str]:
+            value = props.get(key)
+            if value is not None and not isinstance(value, str):
+                raise TypeError(f"Error: Invalid value for '{key}'")
+            return value
+
+        def get_int(key: str) -> Optional[int]:
+            value = props.get(key)
+            if value is not None and not isinstance(value, int):
+                raise TypeError(f"Error: Invalid value for '{key}'")
+            return value
+
+        def get_dict(key: str) -> Dict[str, str]:
+            value = props.get(key, {})
+            if not isinstance(value, dict):
+                raise TypeError(f"Error: Invalid value for '{key}'")
+            return {str(k): str(v) for k, v in value.items()}
+
+        targets = props.get("targets", [])
+        if not isinstance(targets, list):
+            raise TypeError("Error: Invalid value for 'targets'")
+        return Preset(
+            name=name,
+            desc=get_str("description"),
+            is_hidden=bool(props.get("hidden", False)),
+            cmake_generator=get_str("generator"),
+            binary_path=get_str("binaryDir"),
+            install_path=get_str("installDir"),
+            cache_vars=get_dict("cacheVariables"),
+            env_vars=get_dict("environment"),
+            targets=[str(t) for t in targets],
+            jobs=get_int("jobs"),
+            link_jobs=get_int("linkJobs"),
+            is_full_preset=True
+        )
+
+
+    def generate_trace_dict(self) -> Dict[str, object]:
+        """
+        Generates a dictionary containing the properties of the preset.
+        @return Dictionary containing the properties of the preset.
         """
         # Generate a dictionary containing the properties to write to the trace
         #   file
@@ -348,9 +441,24 @@ class Preset(ITraced):
         props["cacheVariables"] = full_preset._cache_variables
         props["environment"] = full_preset._env_variables
         props["targets"] = full_preset._targets
+        props["jobs"] = full_preset._jobs
+        props["linkJobs"] = full_preset._link_jobs
         props["inherits"] = [p._name for p in full_preset._base_presets]
-        generator.write_file({
-            full_preset.preset_name: props
+        return props
+
+
+    def generate_trace_file(self,
+        output_path: Path,
+        generator: ITraceFileGenerator) -> bool:
+        """
+        Generates a trace file for the target.
+        @param output_path Path to the output file.
+        @param generator Generator to create the trace file using.
+        @returns True if the file was written, or False if the file was
+          unchanged.
+        """
+        return generator.write_file({
+            self.preset_name: self.generate_trace_dict()
         }, output_path)
 
 
@@ -373,6 +481,10 @@ class Preset(ITraced):
             self._binary_dir = preset._binary_dir
         if preset._install_dir is not None:
             self._install_dir = preset._install_dir
+        if preset._jobs is not None:
+            self._jobs = preset._jobs
+        if preset._link_jobs is not None:
+            self._link_jobs = preset._link_jobs
         self._cache_variables.update(preset._cache_variables)
         self._env_variables.update(preset._env_variables)
 
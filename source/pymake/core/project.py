@@ -4,13 +4,15 @@ from pymake.targets.executable_target import ExecutableTarget
 from pymake.targets.shared_library_target import SharedLibraryTarget
 from pymake.targets.static_library_target import StaticLibraryTarget
 from pymake.targets.target import ITarget
+from pymake.tracing.origin_context import OriginContext
 from pymake.tracing.traced import ITraced
-from typing import Callable, Dict, Iterable, Optional
+from typing import Callable, Dict, Iterable, List, Optional
 
 class Project(ITraced):
     """
     Represents a single project scope in a PyMake project.
     """
+    @OriginContext.entry_point
     def __init__(self,
         build_scripts: BuildScriptSet,
         project_name: str,
@@ -73,6 +75,15 @@ class Project(ITraced):
         return self._project_languages
 
 
+    @property
+    def targets(self) -> List[ITarget]:
+        """
+        Gets the targets added to the project, in the order they were added.
+        """
+        return list(self._targets.values())
+
+
+    @OriginContext.entry_point
     def add_executable(self,
         target_name: str) -> ExecutableTarget:
         """
@@ -89,6 +100,7 @@ class Project(ITraced):
         return target
 
 
+    @OriginContext.entry_point
     def add_static_library(self,
         target_name: str) -> StaticLibraryTarget:
         """
@@ -105,6 +117,7 @@ class Project(ITraced):
         return target
 
 
+    @OriginContext.entry_point
     def add_shared_library(self,
         target_name: str) -> SharedLibraryTarget:
         """
@@ -141,6 +154,25 @@ class Project(ITraced):
         return target
 
 
+    def _merge_target(self, target: ITarget) -> ITarget:
+        """
+        Adds a target that was created by another process to the project.
+        Unlike `_add_target()`, no CMake code is generated for the target since
+          the CMake code was already generated by the process that created the
+          target.
+        @param target Target to add.
+        @throws ValueError Thrown if a target with the given name already
+          exists and is defined at a different location.
+        @returns The added target, or the previously added target if it was
+          defined at the same location as the target being added.
+        """
+        prev_target = self._check_is_target_redefined(target)
+        if prev_target:
+            return prev_target
+        self._targets[target.target_name] = target
+        return target
+
+
     def _check_is_target_redefined(self,
         target: ITarget) -> Optional[ITarget]:
         """
@@ -158,9 +190,9 @@ class Project(ITraced):
         if prev_target:
             # If the previously added target is defined at the same location as
             #   the target being added, return the previously added target
-            # This is necessary to allow build scripts to import targets from
-            #   other build scripts while also allowing build scripts to contain
-            #   code in the top-level scope.
+            # Build scripts are normally only executed once, but a build script
+            #   that's loaded under a different module name outside of PyMake's
+            #   build script registry may still run its top-level code again.
             if prev_target.origin.file_path == target.origin.file_path and \
                 prev_target.origin.line_number == target.origin.line_number:
                 return prev_target
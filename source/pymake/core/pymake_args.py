@@ -1,14 +1,91 @@
 from argparse import Namespace
+from pymake.common.target_weight import ETargetWeight
+from pymake.common.trace_file_format import ETraceFileFormat
+from typing import List, Optional
 
 class PyMakeArgs(Namespace):
     """
     Stores arguments passed to PyMake.
     """
-    def __init__(self, verbose: bool, presets: list[str]) -> None:
+    def __init__(self,
+        verbose: bool,
+        presets: list[str],
+        trace: bool = True,
+        coalesce: bool = False,
+        regenerate: bool = False,
+        emit_jobs: Optional[int] = None,
+        trace_format: ETraceFileFormat = ETraceFileFormat.JSON,
+        explain: Optional[str] = None,
+        who_added: Optional[str] = None,
+        critical_path: bool = False,
+        critical_path_weight: ETargetWeight = ETargetWeight.UNIT,
+        ninja_log: Optional[str] = None,
+        eval_jobs: Optional[int] = None,
+        lazy: bool = False,
+        targets: Optional[List[str]] = None,
+        jobs: Optional[int] = None,
+        link_jobs: Optional[int] = None,
+        reconfigure: bool = False,
+        concurrent_presets: bool = False,
+        unknown_args: Optional[List[str]] = None) -> None:
         """
         Initializes the PyMake arguments.
         @param verbose Whether verbose output should be enabled.
         @param presets Names of presets to enable.
+        @param trace Whether tracing information should be generated.
+        @param coalesce Whether repeated target commands should be merged in
+          the generated CMake files.
+        @param regenerate Whether the CMake files should be regenerated even if
+          they're up to date.
+        @param emit_jobs Maximum number of threads used to write generated
+          files. If this is None, a default number of threads will be used.
+        @param trace_format Format to write trace files in.
+        @param explain Name of a target or preset whose traced values should
+          be printed.
+        @param who_added Value whose origin should be printed.
+        @param critical_path Whether the critical path through the target
+          graph should be analyzed instead of building the project.
+        @param critical_path_weight How targets should be weighted when
+          analyzing the critical path.
+        @param ninja_log Path to the Ninja log file of a previous build. Used
+          to weight targets by build time.
+        @param eval_jobs Number of worker processes used to evaluate
+          independent subdirectory build scripts. If this is None,
+          subdirectory build scripts are evaluated serially as they're added.
+        @param lazy Whether only the subdirectories needed by the requested
+          targets should be evaluated.
+        @param targets Targets that subdirectories should be evaluated for in
+          lazy mode. If this is None, the selected presets' targets are used.
+        @param jobs Number of parallel jobs to build with. If this is None,
+          the presets' value or a value based on the available CPUs and memory
+          is used.
+        @param link_jobs Number of parallel link jobs to build with. If this is
+          None, the presets' value or a value based on the available CPUs and
+          memory is used.
+        @param reconfigure Whether CMake's configure step should be run even if
+          the build directory is up to date.
+        @param concurrent_presets Whether each selected preset should be
+          configured and built concurrently instead of merging the presets.
+        @param unknown_args Arguments that weren't recognized by PyMake. These
+          may be processed by the build script.
         """
         self.verbose = verbose
         self.presets = presets
+        self.trace = trace
+        self.coalesce = coalesce
+        self.regenerate = regenerate
+        self.emit_jobs = emit_jobs
+        self.trace_format = trace_format
+        self.explain = explain
+        self.who_added = who_added
+        self.critical_path = critical_path
+        self.critical_path_weight = critical_path_weight
+        self.ninja_log = ninja_log
+        self.eval_jobs = eval_jobs
+        self.lazy = lazy
+        self.targets = targets
+        self.jobs = jobs
+        self.link_jobs = link_jobs
+        self.reconfigure = reconfigure
+        self.concurrent_presets = concurrent_presets
+        self.unknown_args = unknown_args if unknown_args is not None else []
@@ -1,7 +1,7 @@
 from __future__ import annotations
 from pymake.common.scope import EScope
 from pymake.tracing.traced_set import TracedSet
-from typing import Dict, Generic, Optional, TypeVar
+from typing import Callable, Dict, Generic, Optional, TypeVar
 
 T = TypeVar("T")
 
@@ -15,16 +15,23 @@ class ScopedSets(Generic[T]):
     def __init__(self,
         public: Optional[TracedSet[T]] = None,
         interface: Optional[TracedSet[T]] = None,
-        private: Optional[TracedSet[T]] = None):
+        private: Optional[TracedSet[T]] = None,
+        on_change: Optional[Callable[[], None]] = None):
         """
         Initializes the set.
         @param public Public values to add to the set.
         @param interface Interface values to add to the set.
         @param private Private values to add to the set.
+        @param on_change Callback invoked whenever values are added to any of
+          the sets.
         """
         self._public: TracedSet[T] = public if public else TracedSet()
         self._interface: TracedSet[T] = interface if interface else TracedSet()
         self._private: TracedSet[T] = private if private else TracedSet()
+        if on_change:
+            self._public.on_change = on_change
+            self._interface.on_change = on_change
+            self._private.on_change = on_change
 
 
     @property
@@ -0,0 +1,633 @@
+from __future__ import annotations
+import ast
+import contextlib
+import functools
+import io
+import multiprocessing
+from pathlib import Path
+import pickle
+from pymake.core.build_script_fragment import BuildScriptFragment
+from pymake.core.build_script_registry import BuildScriptRegistry
+from pymake.core.build_script_set import BuildScriptSet
+from pymake.core.project import Project
+from pymake.core.target_graph import TargetGraph
+from pymake.targets.target import ITarget
+from pymake.tracing.caller_info_formatter import ICallerInfoFormatter
+from pymake.util.bytecode_cache import BytecodeCache
+import sys
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+class SubdirectoryEvaluator:
+    """
+    Evaluates the build scripts of subdirectories added to the project.
+    By default, each subdirectory's build script is executed as soon as the
+      subdirectory is added. If parallel evaluation is enabled, subdirectories
+      added by the root build script are queued instead and evaluated once
+      `evaluate_pending()` is called. Queued build scripts that neither import
+      nor are imported by other build scripts are evaluated in worker
+      processes forked from the main process. Each worker returns a fragment
+      containing everything its build script added, and the fragments are
+      merged in the order the subdirectories were added so that the result
+      never depends on the number of workers. Anything a build script prints
+      in a worker is written once its fragment is merged.
+    Build scripts that depend on other build scripts, that failed in a worker,
+      or that modified anything created before they were evaluated are
+      executed in the main process instead, in the same order. Build scripts
+      that fail or modify existing state in a worker are therefore executed
+      twice, so any side effects outside of the project, such as writing
+      files, happen twice as well. Their output from the worker is discarded.
+    In lazy mode, subdirectories are also queued, but only the build scripts
+      that define the requested targets are evaluated. Targets that those
+      targets link to are defined by build scripts that they import, which the
+      build script registry executes on demand.
+    """
+    # Targets generated by CMake itself
+    # Building one of these targets requires every subdirectory.
+    _AGGREGATE_TARGETS = ("all", "clean", "install", "package", "test")
+
+    # Methods of `Project` that add targets
+    _TARGET_METHODS = ("add_executable", "add_shared_library",
+        "add_static_library")
+
+    # Evaluator whose queued build scripts are being evaluated by workers
+    # Workers are forked from the main process, so they find the evaluator
+    #   through this variable instead of receiving it as an argument.
+    _active: Optional[SubdirectoryEvaluator] = None
+
+    def __init__(self,
+        build_scripts: BuildScriptSet,
+        projects: Dict[str, Project],
+        target_graph: TargetGraph,
+        script_registry: BuildScriptRegistry,
+        bytecode_cache: BytecodeCache,
+        formatter: ICallerInfoFormatter,
+        capture_state: Callable[[], object],
+        max_workers: Optional[int] = None,
+        lazy: bool = False):
+        """
+        Initializes the evaluator.
+        @param build_scripts Build script set that build scripts write to.
+        @param projects Projects in the PyMake project, indexed by name.
+        @param target_graph Graph containing every target in the project.
+        @param script_registry Registry used to execute build scripts.
+        @param bytecode_cache Cache used to load the code of build scripts.
+        @param formatter Formatter used by the build script set.
+        @param capture_state Callback that captures any state of the PyMake
+          project not covered by the targets and build scripts, such as its
+          presets. Build scripts that change the captured state are evaluated
+          in the main process.
+        @param max_workers Number of worker processes to evaluate build scripts
+          with. If this is None, build scripts are evaluated immediately in the
+          main process.
+        @param lazy Whether subdirectories should only be evaluated if they're
+          needed by the targets passed to `evaluate_pending()`.
+        @throws ValueError Thrown if `max_workers` is less than 1.
+        """
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("Error: The number of evaluation jobs must be " +
+                "at least 1.")
+
+        self._build_scripts = build_scripts
+        self._projects = projects
+        self._target_graph = target_graph
+        self._script_registry = script_registry
+        self._bytecode_cache = bytecode_cache
+        self._formatter = formatter
+        self._capture_state = capture_state
+        self._max_workers = max_workers
+        self._lazy = lazy
+
+        # Build scripts waiting to be evaluated, in the order they were added
+        self._queue: List[Path] = []
+
+        # Whether queued build scripts are being evaluated
+        # Subdirectories added while queued build scripts are evaluated are
+        #   evaluated immediately.
+        self._is_evaluating = False
+
+        # Queued build scripts that were never evaluated
+        self._skipped_scripts: List[Path] = []
+
+
+    @property
+    def is_parallel(self) -> bool:
+        """
+        Gets whether build scripts are evaluated in worker processes.
+        """
+        return self._max_workers is not None
+
+
+    @property
+    def skipped_scripts(self) -> List[Path]:
+        """
+        Gets the queued build scripts that were never evaluated because none
+          of the requested targets needed them.
+        """
+        return self._skipped_scripts
+
+
+    def evaluate_pending(self,
+        required_targets: Optional[Iterable[str]] = None) -> List[Path]:
+        """
+        Evaluates the queued build scripts.
+        @param required_targets Names of the targets that must be defined once
+          the build scripts are evaluated. Only used in lazy mode, where build
+          scripts that don't define any of these targets are skipped. If this
+          is None or empty, every queued build script is evaluated.
+        @returns The paths of the Python files that the evaluation depended on
+          but that aren't recorded in `sys.modules`, such as files executed by
+          worker processes or build scripts that were only parsed.
+        @throws Exception Any exception raised by a build script is propagated
+          as if the build script had been evaluated in the main process.
+        """
+        queue = [
+            p for p in self._queue
+            if not self._script_registry.is_loaded(p)
+        ]
+        self._queue = []
+        if not queue:
+            return []
+
+        self._is_evaluating = True
+        try:
+            input_files: List[Path] = []
+            target_names = list(required_targets) if required_targets else []
+            script_paths = queue
+            if self._lazy and target_names:
+                script_paths = self._find_required_scripts(
+                    queue,
+                    target_names,
+                    input_files
+                )
+            input_files.extend(self._evaluate_scripts(script_paths))
+
+            # Parsing can't tell whether a target is only defined under some
+            #   conditions, so evaluate everything if a target is still missing
+            missing_targets = [
+                t for t in target_names if t not in self._target_graph
+            ]
+            if len(script_paths) < len(queue) and missing_targets:
+                print(f"Note: The target '{missing_targets[0]}' was not " +
+                    "defined by the subdirectories expected to define it; " +
+                    "evaluating every subdirectory.", file=sys.stderr)
+                script_paths = queue
+                input_files.extend(self._evaluate_scripts([
+                    p for p in queue
+                    if not self._script_registry.is_loaded(p)
+                ]))
+
+            evaluated_scripts = set(script_paths)
+            self._skipped_scripts.extend(
+                p for p in queue
+                if p not in evaluated_scripts and
+                    not self._script_registry.is_loaded(p)
+            )
+            return input_files
+        finally:
+            self._is_evaluating = False
+
+
+    def submit(self, script_path: Path) -> None:
+        """
+        Evaluates a subdirectory's build script or queues it to be evaluated.
+        If the build script was already executed, it won't be executed again.
+        @param script_path Absolute path to the build script.
+        """
+        if (self._max_workers is None and not self._lazy) or \
+            self._is_evaluating:
+            self._script_registry.load(script_path)
+        elif script_path not in self._queue and \
+            not self._script_registry.is_loaded(script_path):
+            self._queue.append(script_path)
+
+
+    def _capture_shared_state(self,
+        target_count: int,
+        build_script_count: int) -> object:
+        """
+        Captures the state of everything that existed before a build script
+          was evaluated in a worker.
+        @param target_count Number of targets that existed.
+        @param build_script_count Number of build scripts that existed.
+        @returns A value that compares equal to the value returned by a later
+          call if nothing that existed was modified.
+        """
+        return (
+            [t.generate_trace_dict()
+                for t in self._target_graph.targets[:target_count]],
+            [len(b.generator.commands)
+                for b in list(self._build_scripts)[:build_script_count]],
+            self._capture_state()
+        )
+
+
+    def _evaluate_scripts(self, script_paths: List[Path]) -> List[Path]:
+        """
+        Evaluates build scripts, using worker processes if enabled.
+        @param script_paths Absolute paths to the build scripts, in the order
+          they were added.
+        @returns The paths of the Python files executed by worker processes.
+        """
+        results: Dict[Path, Optional[bytes]] = {}
+        if self._max_workers is not None:
+            independent_scripts = self._find_independent_scripts(script_paths)
+            results = self._run_workers(
+                [p for p in script_paths if p in independent_scripts])
+
+        executed_files: List[Path] = []
+        for script_path in script_paths:
+            data = results.get(script_path)
+            if data is None:
+                self._script_registry.load(script_path)
+                continue
+            fragment = self._load_fragment(data)
+            self._merge_fragment(fragment)
+            executed_files.extend(fragment.executed_files)
+        return executed_files
+
+
+    def _evaluate_in_worker(self, script_path: Path) -> Optional[bytes]:
+        """
+        Evaluates a build script and pickles everything that it added.
+        This is only called by worker processes.
+        @param script_path Absolute path to the build script.
+        @returns The pickled fragment, or None if the build script must be
+          evaluated in the main process instead.
+        """
+        target_count = len(self._target_graph)
+        caller_paths = set(self._build_scripts.caller_paths)
+        module_names = set(sys.modules)
+        hits = self._bytecode_cache.hits
+        misses = self._bytecode_cache.misses
+        saved_seconds = self._bytecode_cache.saved_seconds
+        state = self._capture_shared_state(target_count, len(caller_paths))
+
+        # Output is captured so that the main process can write it in merge
+        #   order, and so that it's discarded if the build script is evaluated
+        #   again by the main process
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+
+        # Build scripts that fail are evaluated again by the main process so
+        #   that the error is reported the same way as without workers
+        try:
+            with contextlib.redirect_stdout(stdout), \
+                contextlib.redirect_stderr(stderr):
+                self._script_registry.load(script_path)
+        except Exception:
+            return None
+        if self._capture_shared_state(target_count, len(caller_paths)) != \
+            state:
+            return None
+
+        project_names = {
+            t.target_name: p.project_name
+            for p in self._projects.values()
+            for t in p.targets
+        }
+        new_targets = self._target_graph.targets[target_count:]
+        if any(t.target_name not in project_names for t in new_targets):
+            return None
+
+        executed_files: List[Path] = []
+        for name, module in list(sys.modules.items()):
+            file_name = getattr(module, "__file__", None)
+            if name not in module_names and file_name:
+                executed_files.append(Path(file_name))
+
+        fragment = BuildScriptFragment(
+            script_path=script_path,
+            targets=[(project_names[t.target_name], t) for t in new_targets],
+            build_scripts=[
+                (p, b)
+                for p, b in zip(self._build_scripts.caller_paths,
+                    self._build_scripts)
+                if p not in caller_paths
+            ],
+            executed_files=executed_files,
+            directory_scans=\
+                self._build_scripts.directory_scan_cache.get_scans(),
+            bytecode_hits=self._bytecode_cache.hits - hits,
+            bytecode_misses=self._bytecode_cache.misses - misses,
+            bytecode_saved_seconds=\
+                self._bytecode_cache.saved_seconds - saved_seconds,
+            stdout=stdout.getvalue(),
+            stderr=stderr.getvalue()
+        )
+
+        # Objects shared with the main process are pickled by reference so
+        #   that the fragment refers to the main process' instances once it's
+        #   unpickled
+        buffer = io.BytesIO()
+        pickler = pickle.Pickler(buffer, pickle.HIGHEST_PROTOCOL)
+        pickler.persistent_id = functools.partial(
+            self._get_persistent_id,
+            {id(t) for t in new_targets}
+        )
+        try:
+            pickler.dump(fragment)
+        except Exception:
+            # The build script stored a value that can't be pickled
+            return None
+        return buffer.getvalue()
+
+
+    def _find_independent_scripts(self, script_paths: List[Path]) -> Set[Path]:
+        """
+        Finds the build scripts that can be evaluated in worker processes.
+        A build script is independent if it doesn't import any subdirectory
+          build script and isn't imported by any of the other build scripts.
+          Importing the root build script is allowed since workers are forked
+          after the root build script has been executed.
+        @param script_paths Absolute paths to the build scripts.
+        @returns The independent build scripts.
+        """
+        module_paths = {
+            self._script_registry.get_module_name(p): p
+            for p in script_paths
+        }
+        dependent_scripts: Set[Path] = set()
+        for script_path in script_paths:
+            imported_scripts = SubdirectoryEvaluator._get_imported_scripts(
+                script_path)
+            if imported_scripts is None or imported_scripts:
+                dependent_scripts.add(script_path)
+            for module_name in imported_scripts or []:
+                if module_name in module_paths:
+                    dependent_scripts.add(module_paths[module_name])
+        return set(script_paths) - dependent_scripts
+
+
+    def _find_required_scripts(self,
+        script_paths: List[Path],
+        target_names: List[str],
+        parsed_files: List[Path]) -> List[Path]:
+        """
+        Finds the build scripts that define the requested targets.
+        @param script_paths Absolute paths to the queued build scripts.
+        @param target_names Names of the requested targets.
+        @param parsed_files List to add the path of every parsed build script
+          to.
+        @returns The build scripts that must be evaluated, in the order they
+          were added. If a requested target is generated by CMake itself or
+          isn't defined by any build script, every build script is returned.
+        """
+        # Targets defined by each build script, including targets defined by
+        #   the subdirectories it adds
+        # Build scripts whose targets can't be determined are always evaluated.
+        owners: Dict[str, Path] = {}
+        required_scripts: Set[Path] = set()
+        for script_path in script_paths:
+            defined_targets = SubdirectoryEvaluator._get_defined_targets(
+                script_path, parsed_files)
+            if defined_targets is None:
+                required_scripts.add(script_path)
+                continue
+            for target_name in defined_targets:
+                owners.setdefault(target_name, script_path)
+
+        for target_name in target_names:
+            if target_name in SubdirectoryEvaluator._AGGREGATE_TARGETS:
+                return list(script_paths)
+            if target_name in self._target_graph:
+                continue
+            if target_name not in owners:
+                print("Warning: No subdirectory defines the target " +
+                    f"'{target_name}'; evaluating every subdirectory.",
+                    file=sys.stderr)
+                return list(script_paths)
+            required_scripts.add(owners[target_name])
+        return [p for p in script_paths if p in required_scripts]
+
+
+    @staticmethod
+    def _get_defined_targets(
+        script_path: Path,
+        parsed_files: List[Path]) -> Optional[List[str]]:
+        """
+        Finds the targets that a build script defines without executing it.
+        Build scripts of subdirectories that the build script adds are parsed
+          as well.
+        @param script_path Absolute path to the build script.
+        @param parsed_files List to add the path of every parsed build script
+          to.
+        @returns The names of the defined targets, or None if a target name or
+          subdirectory path is not a string literal or a build script can't
+          be parsed.
+        """
+        target_names: List[str] = []
+        pending_scripts = [script_path]
+        while pending_scripts:
+            path = pending_scripts.pop()
+            if path in parsed_files:
+                continue
+            parsed_files.append(path)
+            tree = SubdirectoryEvaluator._parse_script(path)
+            if tree is None:
+                return None
+
+            for node in ast.walk(tree):
+                if not isinstance(node, ast.Call) or \
+                    not isinstance(node.func, ast.Attribute):
+                    continue
+                method_name = node.func.attr
+                if method_name != "add_subdirectory" and method_name not in \
+                    SubdirectoryEvaluator._TARGET_METHODS:
+                    continue
+                if not node.args or \
+                    not isinstance(node.args[0], ast.Constant) or \
+                    not isinstance(node.args[0].value, str):
+                    return None
+
+                if method_name == "add_subdirectory":
+                    pending_scripts.append(path.parent / node.args[0].value /
+                        BuildScriptRegistry.BUILD_SCRIPT_NAME)
+                else:
+                    target_names.append(node.args[0].value)
+        return target_names
+
+
+    @staticmethod
+    def _get_imported_scripts(script_path: Path) -> Optional[List[str]]:
+        """
+        Gets the subdirectory build scripts that a build script imports.
+        @param script_path Absolute path to the build script.
+        @returns The module names of the imported build scripts, or None if
+          the build script can't be parsed or uses relative imports.
+        """
+        tree = SubdirectoryEvaluator._parse_script(script_path)
+        if tree is None:
+            return None
+
+        module_names: List[str] = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                module_names.extend(a.name for a in node.names)
+            elif isinstance(node, ast.ImportFrom):
+                if node.level or not node.module:
+                    return None
+                module_names.append(node.module)
+                module_names.extend(
+                    f"{node.module}.{a.name}" for a in node.names)
+
+        # The root build script's module is named `make`, so only modules
+        #   within a package can be subdirectory build scripts
+        script_name = Path(BuildScriptRegistry.BUILD_SCRIPT_NAME).stem
+        return [
+            m for m in module_names
+            if "." in m and m.rpartition(".")[2] == script_name
+        ]
+
+
+    def _get_persistent_id(self,
+        new_targets: Set[int],
+        obj: object) -> Optional[Tuple[str, Optional[str]]]:
+        """
+        Gets the ID to pickle an object shared with the main process as.
+        @param new_targets IDs of the targets added by the build script.
+        @param obj Object being pickled.
+        @returns The ID of the object, or None if the object should be pickled
+          by value.
+        """
+        if isinstance(obj, ITarget) and id(obj) not in new_targets:
+            return ("target", obj.target_name)
+        elif obj is self._build_scripts:
+            return ("build_scripts", None)
+        elif obj is self._target_graph:
+            return ("target_graph", None)
+        elif obj is self._formatter:
+            return ("formatter", None)
+        return None
+
+
+    def _load_fragment(self, data: bytes) -> BuildScriptFragment:
+        """
+        Unpickles a fragment returned by a worker.
+        @param data Pickled fragment.
+        @returns The fragment.
+        """
+        unpickler = pickle.Unpickler(io.BytesIO(data))
+        unpickler.persistent_load = self._load_persistent_id
+        fragment = unpickler.load()
+        assert isinstance(fragment, BuildScriptFragment)
+        return fragment
+
+
+    def _load_persistent_id(self, pid: Tuple[str, Optional[str]]) -> object:
+        """
+        Gets the object that a persistent ID refers to.
+        @param pid ID returned by `_get_persistent_id()`.
+        @returns The main process' instance of the object.
+        @throws UnpicklingError Thrown if the ID is not recognized.
+        """
+        kind, name = pid
+        if kind == "target" and name is not None:
+            return self._target_graph.get_target(name)
+        elif kind == "build_scripts":
+            return self._build_scripts
+        elif kind == "target_graph":
+            return self._target_graph
+        elif kind == "formatter":
+            return self._formatter
+        raise pickle.UnpicklingError(f"Error: Unknown object '{kind}'.")
+
+
+    def _merge_fragment(self, fragment: BuildScriptFragment) -> None:
+        """
+        Adds everything in a fragment to the project.
+        @param fragment Fragment to merge.
+        @throws ValueError Thrown if a target in the fragment has the same name
+          as an existing target or if a link would create a dependency cycle.
+        """
+        merged_targets: List[ITarget] = []
+        for project_name, target in fragment.targets:
+            project = self._projects[project_name]
+            if project._merge_target(target) is target:
+                merged_targets.append(target)
+
+        # Links are restored once every target in the fragment was added since
+        #   targets may link to targets added after them
+        for target in merged_targets:
+            target._restore_links()
+
+        for caller_path, build_script in fragment.build_scripts:
+            self._build_scripts.merge_build_script(caller_path, build_script)
+        self._build_scripts.directory_scan_cache.merge_scans(
+            fragment.directory_scans)
+        self._bytecode_cache.add_stats(
+            fragment.bytecode_hits,
+            fragment.bytecode_misses,
+            fragment.bytecode_saved_seconds
+        )
+
+        sys.stdout.write(fragment.stdout)
+        sys.stderr.write(fragment.stderr)
+
+
+    @staticmethod
+    def _parse_script(script_path: Path) -> Optional[ast.Module]:
+        """
+        Parses a build script.
+        @param script_path Absolute path to the build script.
+        @returns The parsed build script, or None if it can't be read or is not
+          valid Python.
+        """
+        try:
+            with open(script_path, "rb") as f:
+                return ast.parse(f.read(), str(script_path))
+        except (OSError, SyntaxError, ValueError):
+            return None
+
+
+    @staticmethod
+    def _run_worker_task(script_path: Path) -> Optional[bytes]:
+        """
+        Entry point for worker processes.
+        @param script_path Absolute path to the build script to evaluate.
+        @returns The pickled fragment, or None if the build script must be
+          evaluated in the main process instead.
+        """
+        evaluator = SubdirectoryEvaluator._active
+        assert evaluator
+        return evaluator._evaluate_in_worker(script_path)
+
+
+    def _run_workers(self,
+        script_paths: List[Path]) -> Dict[Path, Optional[bytes]]:
+        """
+        Evaluates build scripts in worker processes.
+        @param script_paths Absolute paths to the build scripts.
+        @returns The pickled fragment for each build script, indexed by the
+          build script's path. Build scripts that must be evaluated in the
+          main process will not have a fragment.
+        """
+        if not script_paths:
+            return {}
+        if "fork" not in multiprocessing.get_all_start_methods():
+            # Code coverage is recorded on Linux; ignore non-Linux branches
+            print("Note: Subdirectories can only be evaluated in parallel " +
+                "on platforms that support forking processes.",
+                file=sys.stderr) # pragma: no cover
+            return {} # pragma: no cover
+
+        # Anything buffered would be written again by each worker
+        sys.stdout.flush()
+        sys.stderr.flush()
+
+        # Each worker only evaluates a single build script so that every build
+        #   script starts from the state of the main process
+        assert self._max_workers is not None
+        SubdirectoryEvaluator._active = self
+        try:
+            context = multiprocessing.get_context("fork")
+            with context.Pool(
+                processes=min(self._max_workers, len(script_paths)),
+                maxtasksperchild=1) as pool:
+                results = pool.map(
+                    SubdirectoryEvaluator._run_worker_task,
+                    script_paths,
+                    chunksize=1
+                )
+        finally:
+            SubdirectoryEvaluator._active = None
+        return dict(zip(script_paths, results))
@@ -0,0 +1,27 @@
+from typing import NamedTuple
+
+class TargetAnalysis(NamedTuple):
+    """
+    Stores the results of analyzing a single target in the target graph.
+    """
+    ## Name of the target.
+    target_name: str
+
+    ## Cost of building the target.
+    # The unit depends on how targets were weighted.
+    weight: float
+
+    ## Number of links in the longest dependency chain below the target.
+    # Targets that don't link to any targets are on level 0.
+    level: int
+
+    ## Number of targets that link directly to the target.
+    fan_in: int
+
+    ## Number of targets that the target links to directly.
+    fan_out: int
+
+    ## Earliest time that the target can finish building.
+    # This assumes unlimited parallelism and that a target can only start
+    #   building once every target that it links to has finished.
+    finish: float
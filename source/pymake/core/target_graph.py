@@ -0,0 +1,349 @@
+from pymake.common.scope import EScope
+from pymake.core.target_graph_stats import TargetGraphStats
+from pymake.core.target_link import TargetLink
+from pymake.targets.target import ITarget
+from pymake.tracing.caller_info import CallerInfo
+from pymake.tracing.origin_context import OriginContext
+from typing import Dict, List, Optional, Set
+
+class TargetGraph:
+    """
+    Stores the link dependencies between all targets in a PyMake project.
+    The graph is built incrementally as targets are added and linked. Links
+      that would create a dependency cycle are rejected when they are made, so
+      the graph is always acyclic.
+    """
+    def __init__(self):
+        """
+        Initializes the graph.
+        """
+        # Targets in the graph, indexed by target name
+        # Targets are stored in the order that they were added.
+        self._targets: Dict[str, ITarget] = {}
+
+        # Links from each target to the targets that it links to
+        # The outer dictionary is indexed by the name of the linking target and
+        #   the inner dictionary is indexed by the name of the linked target.
+        #   Only the first link between two targets is recorded.
+        self._links: Dict[str, Dict[str, TargetLink]] = {}
+
+        # Names of the targets that link to each target, indexed by the name of
+        #   the linked target
+        self._dependents: Dict[str, List[str]] = {}
+
+
+    def __contains__(self, target_name: object) -> bool:
+        """
+        Checks whether a target with the given name is in the graph.
+        """
+        return target_name in self._targets
+
+
+    def __len__(self) -> int:
+        """
+        Gets the number of targets in the graph.
+        """
+        return len(self._targets)
+
+
+    @property
+    def targets(self) -> List[ITarget]:
+        """
+        Gets all targets in the graph, in the order they were added.
+        """
+        return list(self._targets.values())
+
+
+    @property
+    def links(self) -> List[TargetLink]:
+        """
+        Gets all links in the graph, in the order they were added per target.
+        """
+        return [
+            link
+            for target_links in self._links.values()
+            for link in target_links.values()
+        ]
+
+
+    def add_target(self, target: ITarget) -> None:
+        """
+        Adds a target to the graph.
+        Adding a target that is already in the graph has no effect.
+        @param target Target to add.
+        """
+        if target.target_name in self._targets:
+            return
+        self._targets[target.target_name] = target
+        self._links[target.target_name] = {}
+        self._dependents[target.target_name] = []
+
+
+    def add_link(self,
+        target: ITarget,
+        dependency: ITarget,
+        scope: EScope,
+        origin: Optional[CallerInfo] = None) -> None:
+        """
+        Records that a target links to another target.
+        Either target will be added to the graph if it isn't already in it.
+        @param target Target that links to the dependency.
+        @param dependency Target that is linked to.
+        @param scope Scope that the dependency is linked with.
+        @param origin Location of the code that linked the targets. If this is
+          None, the origin of the active origin context will be used.
+        @throws ValueError Thrown if the link would create a dependency cycle.
+        """
+        self.add_target(target)
+        self.add_target(dependency)
+        target_links = self._links[target.target_name]
+        if dependency.target_name in target_links:
+            return
+
+        # The origin is captured even if tracing is disabled since it's needed
+        #   to report dependency cycles
+        if origin is None:
+            origin = OriginContext.capture()
+        link = TargetLink(
+            target.target_name,
+            dependency.target_name,
+            scope,
+            origin
+        )
+
+        # If the target can already be reached from the dependency, adding
+        #   the link would close a cycle
+        cycle = self.find_path(dependency.target_name, target.target_name)
+        if cycle is not None:
+            raise ValueError(TargetGraph._get_cycle_error(link, cycle))
+
+        target_links[dependency.target_name] = link
+        self._dependents[dependency.target_name].append(target.target_name)
+
+
+    def find_path(self,
+        source_name: str,
+        dest_name: str) -> Optional[List[TargetLink]]:
+        """
+        Finds a chain of links from one target to another.
+        @param source_name Name of the target to start at.
+        @param dest_name Name of the target to find.
+        @returns The links that lead from the source target to the destination
+          target, in order. The list will be empty if the targets are the same
+          target. Returns None if the destination can't be reached.
+        """
+        if source_name == dest_name:
+            return []
+
+        # Link used to reach each visited target
+        # This is used to rebuild the path once the destination is found.
+        reached_by: Dict[str, Optional[TargetLink]] = {source_name: None}
+        stack = [source_name]
+        while stack:
+            name = stack.pop()
+            for link in self._links.get(name, {}).values():
+                if link.dependency_name in reached_by:
+                    continue
+                reached_by[link.dependency_name] = link
+                if link.dependency_name == dest_name:
+                    return TargetGraph._rebuild_path(reached_by, dest_name)
+                stack.append(link.dependency_name)
+        return None
+
+
+    def get_dependencies(self, target_name: str) -> List[str]:
+        """
+        Gets the targets that a target links to directly.
+        @param target_name Name of the target.
+        @returns Names of the linked targets, in the order they were linked.
+        @throws KeyError Thrown if the target is not in the graph.
+        """
+        return list(self._links[target_name])
+
+
+    def get_dependents(self, target_name: str) -> List[str]:
+        """
+        Gets the targets that link directly to a target.
+        @param target_name Name of the target.
+        @returns Names of the linking targets, in the order they were linked.
+        @throws KeyError Thrown if the target is not in the graph.
+        """
+        return list(self._dependents[target_name])
+
+
+    def get_links(self, target_name: str) -> List[TargetLink]:
+        """
+        Gets the links from a target to the targets that it links to.
+        @param target_name Name of the target.
+        @returns The target's links, in the order they were made.
+        @throws KeyError Thrown if the target is not in the graph.
+        """
+        return list(self._links[target_name].values())
+
+
+    def get_levels(self) -> Dict[str, int]:
+        """
+        Gets the level of every target in the graph.
+        A target's level is the number of links in the longest dependency chain
+          that starts at the target. Targets that don't link to any targets are
+          on level 0.
+        @returns The level of each target, indexed by target name and ordered
+          topologically.
+        """
+        levels: Dict[str, int] = {}
+        for name in self.get_topological_order():
+            levels[name] = max(
+                (levels[d] + 1 for d in self._links[name]),
+                default=0
+            )
+        return levels
+
+
+    def get_stats(self) -> TargetGraphStats:
+        """
+        Gets summary statistics for the graph.
+        @returns The statistics for the graph.
+        """
+        level_widths: Dict[int, int] = {}
+        for level in self.get_levels().values():
+            level_widths[level] = level_widths.get(level, 0) + 1
+
+        return TargetGraphStats(
+            target_count=len(self._targets),
+            link_count=sum(len(l) for l in self._links.values()),
+            depth=len(level_widths),
+            width=max(level_widths.values(), default=0),
+            root_count=sum(1 for d in self._dependents.values() if not d),
+            leaf_count=sum(1 for l in self._links.values() if not l)
+        )
+
+
+    def get_target(self, target_name: str) -> ITarget:
+        """
+        Gets a target in the graph.
+        @param target_name Name of the target.
+        @returns The target.
+        @throws KeyError Thrown if the target is not in the graph.
+        """
+        return self._targets[target_name]
+
+
+    def get_topological_order(self) -> List[str]:
+        """
+        Gets all targets ordered so that each target follows its dependencies.
+        Ties are broken by the order that targets were added and linked, so the
+          order is deterministic.
+        @returns Names of all targets in the graph.
+        """
+        order: List[str] = []
+        visited: Set[str] = set()
+
+        # Walk the graph iteratively so that deep dependency chains don't
+        #   exceed the recursion limit
+        # Each entry stores a target name and whether its dependencies have
+        #   been added to the stack.
+        for root in self._targets:
+            stack = [(root, False)]
+            while stack:
+                name, expanded = stack.pop()
+                if expanded:
+                    order.append(name)
+                    continue
+                if name in visited:
+                    continue
+                visited.add(name)
+
+                stack.append((name, True))
+                stack.extend(
+                    (d, False)
+                    for d in reversed(self._links[name])
+                    if d not in visited
+                )
+        return order
+
+
+    def get_transitive_dependencies(self, target_name: str) -> List[str]:
+        """
+        Gets every target that a target links to directly or indirectly.
+        @param target_name Name of the target.
+        @returns Names of the targets, ordered topologically.
+        @throws KeyError Thrown if the target is not in the graph.
+        """
+        reachable = self._get_reachable(target_name, self._links)
+        return [n for n in self.get_topological_order() if n in reachable]
+
+
+    def get_transitive_dependents(self, target_name: str) -> List[str]:
+        """
+        Gets every target that links to a target directly or indirectly.
+        These are the targets affected by a change to the target.
+        @param target_name Name of the target.
+        @returns Names of the targets, ordered topologically.
+        @throws KeyError Thrown if the target is not in the graph.
+        """
+        reachable = self._get_reachable(target_name, self._dependents)
+        return [n for n in self.get_topological_order() if n in reachable]
+
+
+    @staticmethod
+    def _get_cycle_error(link: TargetLink, path: List[TargetLink]) -> str:
+        """
+        Gets the error message for a link that would create a cycle.
+        @param link Link that would create the cycle.
+        @param path Existing links that lead from the link's dependency back to
+          the link's target.
+        @returns The error message.
+        """
+        error_str = f"Error: Linking target '{link.target_name}' to " + \
+            f"'{link.dependency_name}' would create a dependency cycle.\n"
+        for l in path:
+            error_str += f"Note: '{l.target_name}' links to " + \
+                f"'{l.dependency_name}' at " + \
+                f"{l.origin.file_path}:{l.origin.line_number}\n"
+        error_str += f"Note: '{link.target_name}' is being linked to " + \
+            f"'{link.dependency_name}' at " + \
+            f"{link.origin.file_path}:{link.origin.line_number}"
+        return error_str
+
+
+    @staticmethod
+    def _get_reachable(
+        target_name: str,
+        edges: Dict[str, Dict[str, TargetLink]] | Dict[str, List[str]]) \
+        -> Set[str]:
+        """
+        Gets the targets reachable from a target, excluding the target itself.
+        @param target_name Name of the target to start at.
+        @param edges Names of the targets adjacent to each target, indexed by
+          target name.
+        @returns Names of the reachable targets.
+        @throws KeyError Thrown if the target is not in the graph.
+        """
+        reachable: Set[str] = set()
+        stack = list(edges[target_name])
+        while stack:
+            name = stack.pop()
+            if name in reachable:
+                continue
+            reachable.add(name)
+            stack.extend(edges[name])
+        return reachable
+
+
+    @staticmethod
+    def _rebuild_path(
+        reached_by: Dict[str, Optional[TargetLink]],
+        dest_name: str) -> List[TargetLink]:
+        """
+        Rebuilds the path found by `find_path()`.
+        @param reached_by Link used to reach each visited target.
+        @param dest_name Name of the target at the end of the path.
+        @returns The links that lead to the destination target, in order.
+        """
+        path: List[TargetLink] = []
+        link = reached_by[dest_name]
+        while link is not None:
+            path.append(link)
+            link = reached_by[link.target_name]
+        path.reverse()
+        return path
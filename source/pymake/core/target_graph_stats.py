@@ -0,0 +1,27 @@
+from typing import NamedTuple
+
+class TargetGraphStats(NamedTuple):
+    """
+    Stores summary statistics for a project's target dependency graph.
+    """
+    ## Number of targets in the graph.
+    target_count: int
+
+    ## Number of links between targets in the graph.
+    link_count: int
+
+    ## Number of targets in the longest dependency chain.
+    # This is the minimum number of steps needed to build every target if
+    #   each target can only be built after all targets it links to.
+    depth: int
+
+    ## Largest number of targets that share the same level.
+    # A target's level is the length of the longest dependency chain below it,
+    #   so targets on the same level never depend on each other.
+    width: int
+
+    ## Number of targets that no other target links to.
+    root_count: int
+
+    ## Number of targets that don't link to any other target.
+    leaf_count: int
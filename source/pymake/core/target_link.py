@@ -0,0 +1,19 @@
+from pymake.common.scope import EScope
+from pymake.tracing.caller_info import CallerInfo
+from typing import NamedTuple
+
+class TargetLink(NamedTuple):
+    """
+    Stores a single edge in a project's target dependency graph.
+    """
+    ## Name of the target that links to the dependency.
+    target_name: str
+
+    ## Name of the target that is linked to.
+    dependency_name: str
+
+    ## Scope that the dependency was linked with.
+    scope: EScope
+
+    ## Location of the code that linked the targets.
+    origin: CallerInfo
@@ -0,0 +1,53 @@
+import gzip
+import json
+from pathlib import Path
+from pymake.generators.trace_file_generator import ITraceFileGenerator
+from pymake.util.file_writer import FileWriter
+from typing import Any
+
+class BinaryFileGenerator(ITraceFileGenerator):
+    """
+    Class that generates a compact binary file containing tracing information.
+    Binary trace files contain minified JSON that is compressed using gzip.
+      They can be read using `gzip.open()` and `json.load()`.
+    """
+
+    @property
+    def file_extension(self) -> str:
+        """
+        Gets the extension to use for generated trace files.
+        """
+        return "json.gz"
+
+
+    def generate(self, data: Any) -> str:
+        """
+        Gets the contents of the generated trace file before compression.
+        @returns The minified JSON that will be compressed and written to the
+          trace file.
+        """
+        return json.dumps(data, separators=(",", ":"))
+
+
+    def generate_bytes(self, data: Any) -> bytes:
+        """
+        Gets the contents of the generated trace file.
+        @returns The compressed contents of the generated trace file.
+        """
+        # The modification time must be fixed so that the output only depends
+        #   on the data being written
+        return gzip.compress(self.generate(data).encode("utf-8"), mtime=0)
+
+
+    def write_file(self, data: Any, output_path: str | Path) -> bool:
+        """
+        Writes the generated trace file to the specified path.
+        The file is only written if its contents would change.
+        @param output_path Path to write the generated trace file to.
+        @returns True if the file was written, or False if the file was
+          unchanged.
+        """
+        return FileWriter.write_bytes_if_changed(
+            output_path,
+            self.generate_bytes(data)
+        )
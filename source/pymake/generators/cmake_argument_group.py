@@ -0,0 +1,19 @@
+from pymake.tracing.caller_info import CallerInfo
+from typing import List, NamedTuple, Optional
+
+class CMakeArgumentGroup(NamedTuple):
+    """
+    Stores a group of arguments passed to a CMake command.
+    """
+    ## Keyword that the arguments are passed under.
+    # If this is None, the arguments are positional arguments.
+    keyword: Optional[str]
+
+    ## Values of the arguments, in the order they should be passed.
+    values: List[str]
+
+    ## Location that added each value, indexed in the same order as `values`.
+    # If this is None, every value was added by the command's origin. An
+    #   individual entry may also be None if no origin was captured for the
+    #   value.
+    origins: Optional[List[Optional[CallerInfo]]] = None
@@ -0,0 +1,91 @@
+from __future__ import annotations
+from pymake.generators.cmake_argument_group import CMakeArgumentGroup
+from pymake.tracing.caller_info import CallerInfo
+from typing import Iterable, List, Optional
+
+class CMakeCommand:
+    """
+    Intermediate representation of a single CMake command invocation.
+    Commands are only converted to text when the build script they belong to
+      is rendered, allowing commands to be inspected or transformed first.
+    """
+    def __init__(self,
+        name: str,
+        origin: Optional[CallerInfo] = None):
+        """
+        Initializes the command.
+        @param name Name of the CMake command.
+        @param origin Location that generated the command. If this is None, no
+          tracing information will be generated for the command.
+        """
+        self._name = name
+        self._origin = origin
+
+        # Arguments passed to the command, in the order they should be passed
+        self._argument_groups: List[CMakeArgumentGroup] = []
+
+
+    @property
+    def name(self) -> str:
+        """
+        Gets the name of the CMake command.
+        """
+        return self._name
+
+
+    @property
+    def origin(self) -> Optional[CallerInfo]:
+        """
+        Gets the location that generated the command.
+        """
+        return self._origin
+
+
+    @property
+    def argument_groups(self) -> List[CMakeArgumentGroup]:
+        """
+        Gets all arguments passed to the command, in the order they're passed.
+        """
+        return self._argument_groups
+
+
+    @property
+    def positional_arguments(self) -> List[str]:
+        """
+        Gets the arguments that aren't passed under a keyword.
+        """
+        return [
+            value
+            for group in self._argument_groups
+            if group.keyword is None
+            for value in group.values
+        ]
+
+
+    @property
+    def keyword_arguments(self) -> List[CMakeArgumentGroup]:
+        """
+        Gets the groups of arguments that are passed under a keyword.
+        """
+        return [g for g in self._argument_groups if g.keyword is not None]
+
+
+    def add_arguments(self, arguments: Iterable[str]) -> None:
+        """
+        Adds keyword-less arguments to the command.
+        @param arguments Arguments to add.
+        """
+        self._argument_groups.append(CMakeArgumentGroup(None, list(arguments)))
+
+
+    def add_keyword_arguments(self,
+        keyword: str,
+        arguments: Iterable[str]) -> None:
+        """
+        Adds arguments under a keyword to the command.
+        @param keyword Keyword to pass the arguments under.
+        @param arguments Arguments to add.
+        """
+        self._argument_groups.append(
+            CMakeArgumentGroup(keyword, list(arguments))
+        )
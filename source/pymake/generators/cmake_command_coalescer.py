@@ -0,0 +1,107 @@
+from pymake.generators.cmake_argument_group import CMakeArgumentGroup
+from pymake.generators.cmake_command import CMakeCommand
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+class CMakeCommandCoalescer:
+    """
+    Merges repeated target commands into a single command invocation.
+    Commands are only merged if they use the same command name, target, and
+      scope. If a command for the same target and command name but a different
+      scope appears between two commands, the commands will not be merged so
+      that the order of values across scopes is preserved.
+    """
+    # Names of commands that may be merged
+    # Each of these commands must take the form `command(target SCOPE values)`
+    #   and must accept values for the same scope being split across commands.
+    COALESCABLE_COMMANDS: FrozenSet[str] = frozenset([
+        "target_include_directories",
+        "target_link_directories",
+        "target_link_libraries",
+        "target_sources"
+    ])
+
+
+    @staticmethod
+    def coalesce(commands: List[CMakeCommand]) -> int:
+        """
+        Merges repeated target commands in the list.
+        Values from merged commands are appended to the first command that they
+          are merged with. The origin of each merged value is preserved.
+        @param commands Commands to merge. This list will be modified in place.
+        @returns The number of commands that were eliminated.
+        """
+        # Command that values should be merged into for each command name and
+        #   target pair, along with the scope of the command
+        open_commands: Dict[Tuple[str, str], Tuple[str, CMakeCommand]] = {}
+
+        result: List[CMakeCommand] = []
+        for command in commands:
+            key = CMakeCommandCoalescer._get_merge_key(command)
+            if key is None:
+                result.append(command)
+                continue
+
+            # Merge the command's values into the previous command if the
+            #   previous command uses the same scope
+            name, target, scope = key
+            open_command = open_commands.get((name, target))
+            if open_command is not None and open_command[0] == scope:
+                CMakeCommandCoalescer._merge(open_command[1], command)
+                continue
+
+            open_commands[(name, target)] = (scope, command)
+            result.append(command)
+
+        eliminated = len(commands) - len(result)
+        commands[:] = result
+        return eliminated
+
+
+    @staticmethod
+    def _get_merge_key(command: CMakeCommand) \
+        -> Optional[Tuple[str, str, str]]:
+        """
+        Gets the values that determine which commands a command can be merged
+          with.
+        @param command Command to get the key for.
+        @returns A tuple containing the command name, target name, and scope,
+          or None if the command can't be merged.
+        """
+        if command.name not in CMakeCommandCoalescer.COALESCABLE_COMMANDS:
+            return None
+
+        groups = command.argument_groups
+        if len(groups) != 2:
+            return None
+        target_group, scope_group = groups
+        if target_group.keyword is not None or len(target_group.values) != 1:
+            return None
+        if scope_group.keyword is None:
+            return None
+        return command.name, target_group.values[0], scope_group.keyword
+
+
+    @staticmethod
+    def _merge(dest: CMakeCommand, src: CMakeCommand) -> None:
+        """
+        Appends the scoped values of a command to another command.
+        @param dest Command to append values to.
+        @param src Command to take values from.
+        """
+        dest_group = dest.argument_groups[-1]
+        src_group = src.argument_groups[-1]
+
+        # Track the origin of each value now that the values no longer share
+        #   the destination command's origin
+        if dest_group.origins is None:
+            dest_group = dest_group._replace(
+                origins=[dest.origin] * len(dest_group.values)
+            )
+            dest.argument_groups[-1] = dest_group
+        assert dest_group.origins is not None
+
+        dest_group.values.extend(src_group.values)
+        if src_group.origins is None:
+            dest_group.origins.extend([src.origin] * len(src_group.values))
+        else:
+            dest_group.origins.extend(src_group.origins)
@@ -1,11 +1,18 @@
 from pathlib import Path
+from pymake.generators.cmake_command import CMakeCommand
+from pymake.generators.cmake_command_coalescer import CMakeCommandCoalescer
 from pymake.generators.cmake_method_builder import CMakeMethodBuilder
 from pymake.generators.text_generator import TextGenerator
+from pymake.tracing.caller_info import CallerInfo
 from pymake.tracing.caller_info_formatter import ICallerInfoFormatter
+from pymake.util.file_writer import FileWriter
+from typing import List, Optional, Tuple
 
 class CMakeGenerator:
     """
     Generator used to generate CMake files.
+    Commands added to the generator are stored as `CMakeCommand` instances and
+      are only rendered to text when the generated file is requested.
     """
     def __init__(self,
     	formatter: ICallerInfoFormatter,
@@ -18,8 +25,46 @@ class CMakeGenerator:
         @param tab_size Only used if `use_spaces` is true. Determines the number
           of spaces inserted for each indentation level.
         """
-        self._text_generator = TextGenerator(use_spaces, tab_size)
         self._formatter = formatter
+        self._use_spaces = use_spaces
+        self._tab_size = tab_size
+
+        # Commands to generate, in the order they should be generated
+        self._commands: List[CMakeCommand] = []
+
+
+    @property
+    def commands(self) -> List[CMakeCommand]:
+        """
+        Gets the commands that will be generated.
+        Commands in this list may be modified, removed, or reordered before the
+          file is generated.
+        """
+        return self._commands
+
+
+    def coalesce_commands(self) -> int:
+        """
+        Merges repeated target commands into single command invocations.
+        @returns The number of commands that were eliminated.
+        """
+        return CMakeCommandCoalescer.coalesce(self._commands)
+
+
+    @property
+    def formatter(self) -> ICallerInfoFormatter:
+        """
+        Gets the formatter used to format tracing information.
+        """
+        return self._formatter
+
+
+    @formatter.setter
+    def formatter(self, value: ICallerInfoFormatter) -> None:
+        """
+        Sets the formatter used to format tracing information.
+        """
+        self._formatter = value
 
 
     def generate(self) -> str:
@@ -27,7 +72,10 @@ class CMakeGenerator:
         Gets the contents of the generated CMake file.
         @returns The contents of the generated CMake file.
         """
-        return self._text_generator.text
+        text_generator = TextGenerator(self._use_spaces, self._tab_size)
+        for command in self._commands:
+            text_generator.append_block(self._render_command(command))
+        return text_generator.text
 
 
     def open_method_block(self, method_name: str) -> CMakeMethodBuilder:
@@ -37,21 +85,69 @@ class CMakeGenerator:
         @returns A builder used to generate the method.
         """
         return CMakeMethodBuilder(
-            self._formatter,
-            self._text_generator,
+            self._commands,
             method_name
         )
 
 
-    def write_file(self, output_path: str | Path) -> None:
+    def write_file(self, output_path: str | Path) -> bool:
         """
         Writes the generated CMake file to the specified path.
+        The file is only written if its contents would change so that CMake
+          doesn't reconfigure the project when nothing has changed.
         @param output_path Path to write the generated CMake file to.
+        @returns True if the file was written, or False if the file was
+          unchanged.
+        """
+        return FileWriter.write_if_changed(output_path, self.generate())
+
+
+    def _render_command(self, command: CMakeCommand) -> List[Tuple[int, str]]:
+        """
+        Converts a command into the lines of text used to generate it.
+        @param command Command to convert.
+        @returns The lines for the command. Each line is a tuple containing the
+          line's indentation level and the line's text.
         """
-        # Create the path to the output file if it doesn't exist
-        output_dir = Path(output_path).parent
-        if not output_dir.exists():
-            output_dir.mkdir(parents=True)
+        lines: List[Tuple[int, str]] = []
+
+        # Only add the tracing information if it's not empty
+        if command.origin is not None:
+            caller_info_str = self._formatter.format(command.origin)
+            if caller_info_str:
+                lines.append((0, f"# {caller_info_str}"))
+
+        # If no arguments were added, place the parentheses on the same line as
+        #   the method name
+        if not command.argument_groups:
+            lines.append((0, f"{command.name}()"))
+        else:
+            lines.append((0, f"{command.name}("))
+            for group in command.argument_groups:
+                # Place the keyword on the argument indentation level, then use
+                #   an increased indentation level for the keyword's arguments
+                level = 1
+                if group.keyword is not None:
+                    lines.append((1, group.keyword))
+                    level = 2
+
+                if group.origins is None:
+                    lines.extend((level, value) for value in group.values)
+                    continue
+
+                # Values merged from other commands keep the tracing
+                #   information of the command that added them
+                prev_origin: Optional[CallerInfo] = command.origin
+                for value, origin in zip(group.values, group.origins):
+                    if origin is not None and origin != prev_origin:
+                        caller_info_str = self._formatter.format(origin)
+                        if caller_info_str:
+                            lines.append((level, f"# {caller_info_str}"))
+                        prev_origin = origin
+                    lines.append((level, value))
+            lines.append((0, ")"))
 
-        with open(output_path, "w") as f:
-            f.write(self.generate())
+        # Add an empty line afterwards to separate this method call from the
+        #   next line of code
+        lines.append((0, ""))
+        return lines
@@ -1,48 +1,47 @@
 from __future__ import annotations
-from pymake.generators.text_generator import TextGenerator
-from pymake.tracing.caller_info import CallerInfo
-from pymake.tracing.caller_info_formatter import ICallerInfoFormatter
+from pymake.generators.cmake_command import CMakeCommand
+from pymake.tracing.origin_context import OriginContext
 from types import TracebackType
-from typing import Iterable, Optional, Type
+from typing import Iterable, List, Optional, Type
 
 class CMakeMethodBuilder:
     """
     Helper type used to generate a CMake method.
+    The method is recorded as a `CMakeCommand` that is added to the generator's
+      commands once the method block is exited.
     """
     def __init__(self,
-        formatter: ICallerInfoFormatter,
-        generator: TextGenerator,
+        commands: List[CMakeCommand],
         method_name: str):
         """
         Initializes the builder.
-        @param generator Generator to write the generated code to.
+        @param commands List of commands to add the method to.
         @param method_name Name of the method.
         """
-        caller_info = CallerInfo.closest_external_frame()
-        caller_info_str = formatter.format(caller_info)
-        self._generator = generator
-        self._arguments_added = False
+        self._commands = commands
 
-        # Only add the tracing information if it's not empty
-        if caller_info_str:
-            self._generator.append_line(f"# {formatter.format(caller_info)}")
+        # Only capture the tracing information if tracing is enabled
+        origin = OriginContext.capture() \
+            if OriginContext.is_tracing_enabled() else None
+        self._command = CMakeCommand(method_name, origin)
 
-        # Open the method
-        self._generator.append_line(f"{method_name}(")
-        self._generator.indentation_level += 1
+
+    @property
+    def command(self) -> CMakeCommand:
+        """
+        Gets the command being built.
+        """
+        return self._command
 
 
     def add_arguments(self, arguments: str | Iterable[str]) -> None:
         """
         Adds keyword-less argument(s) to the method.
-        @param
+        @param arguments Argument(s) to add.
         """
         if isinstance(arguments, str):
             arguments = [arguments]
-
-        self._arguments_added = True
-        for argument in arguments:
-            self._generator.append_line(argument)
+        self._command.add_arguments(arguments)
 
 
     def add_keyword_arguments(self,
@@ -55,16 +54,7 @@ class CMakeMethodBuilder:
         """
         if isinstance(arguments, str):
             arguments = [arguments]
-
-        self._arguments_added = True
-
-        # Place the keyword on the current indentation level, then use an
-        #   increased indentation level for the arguments
-        self._generator.append_line(f"{keyword}")
-        self._generator.increase_indentation_level()
-        for argument in arguments:
-            self._generator.append_line(argument)
-        self._generator.decrease_indentation_level()
+        self._command.add_keyword_arguments(keyword, arguments)
 
 
     def __enter__(self) -> CMakeMethodBuilder:
@@ -85,15 +75,4 @@ class CMakeMethodBuilder:
         @param traceback Traceback of the exception that was raised.
         @returns True if the exception should be suppressed, otherwise False.
         """
-        # If no arguments were added, remove the newline character that was
-        #   added after the opening parenthesis
-        if not self._arguments_added:
-            self._generator.remove_last_instance_of("\n")
-        else:
-            # This should be a no-op, but is included just in case
-            self._generator.finish_line()
-            self._generator.decrease_indentation_level()
-
-        # Finish the line with the parenthesis and add a new line afterwards
-        #   to separate this method call from the next line of code
-        self._generator.append_line(")\n")
+        self._commands.append(self._command)
@@ -1,6 +1,7 @@
 import json
 from pathlib import Path
 from pymake.generators.trace_file_generator import ITraceFileGenerator
+from pymake.util.file_writer import FileWriter
 from typing import Any
 
 class JsonFileGenerator(ITraceFileGenerator):
@@ -8,6 +9,14 @@ class JsonFileGenerator(ITraceFileGenerator):
     Class that generates a JSON file containing tracing information.
     """
 
+    @property
+    def file_extension(self) -> str:
+        """
+        Gets the extension to use for generated trace files.
+        """
+        return "json"
+
+
     def generate(self, data: Any) -> str:
         """
         Gets the contents of the generated trace file.
@@ -16,11 +25,13 @@ class JsonFileGenerator(ITraceFileGenerator):
         return json.dumps(data, indent=4)
 
 
-    def write_file(self, data: Any, output_path: str | Path) -> None:
+    def write_file(self, data: Any, output_path: str | Path) -> bool:
         """
         Writes the generated trace file to the specified path.
+        The file is only written if its contents would change.
         @param output_path Path to write the generated trace file to.
+        @returns True if the file was written, or False if the file was
+          unchanged.
         """
         # Serialize the object as a JSON string and write it to the output path
-        with open(output_path, "w") as file:
-            file.write(self.generate(data))
+        return FileWriter.write_if_changed(output_path, self.generate(data))
@@ -1,6 +1,11 @@
+from typing import Iterable, List, Tuple
+
 class TextGenerator:
     """
     Helper type used to format a text string to make it easy for humans to read.
+    Added text is stored as a list of chunks that are only joined into a single
+      string when the generated text is requested. This avoids reallocating the
+      entire string each time text is added.
     """
     def __init__(self, use_spaces: bool = False, tab_size: int = 4):
         """
@@ -9,8 +14,12 @@ class TextGenerator:
         @param tab_size Only used if `use_spaces` is true. Determines the number
           of spaces inserted for each indentation level.
         """
-        # String that will be added to as text is generated
-        self._text = ""
+        # Chunks of text that will be added to as text is generated
+        # Empty strings are never added to this list.
+        self._chunks: List[str] = []
+
+        # Whether the last chunk of text ends with a newline character
+        self._ends_with_newline = False
 
         # Current indentation level to use for newly added text.
         self._indent_level = 0
@@ -25,7 +34,7 @@ class TextGenerator:
         """
         Gets whether the generator is at the start of a new line.
         """
-        return len(self._text) == 0 or self._text[-1] == "\n"
+        return not self._chunks or self._ends_with_newline
 
 
     @property
@@ -56,7 +65,11 @@ class TextGenerator:
         """
         Gets the string containing the generated text.
         """
-        return self._text
+        # Collapse the chunks into a single chunk so that subsequent calls
+        #   don't need to join the chunks again
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
 
 
     def append(self, text: str) -> None:
@@ -67,10 +80,10 @@ class TextGenerator:
         """
         # If the generator is at the start of a new line, apply the indentation
         #   level before adding the text
-        if len(self._text) > 0 and self._text[-1] == "\n":
+        if self._chunks and self._ends_with_newline:
             self.apply_indentation()
 
-        self._text += text
+        self._add_chunk(text)
 
 
     def append_line(self, text: str) -> None:
@@ -84,11 +97,31 @@ class TextGenerator:
         self.append(text + "\n")
 
 
+    def append_block(self, lines: Iterable[Tuple[int, str]]) -> None:
+        """
+        Adds multiple lines of text to the generator using a single append.
+        A newline character will be appended to each line. Lines containing no
+          text will not be indented.
+        @param lines Lines to add. Each line is a tuple containing the line's
+          indentation level, relative to the current indentation level, and the
+          text for the line.
+        """
+        chunks: List[str] = []
+        for i, (level, text) in enumerate(lines):
+            # The first line only needs to be indented if the generator is at
+            #   the start of a new line
+            if text and (i > 0 or self.at_start_of_line):
+                chunks.append(self._indent * max(self._indent_level + level, 0))
+            chunks.append(text)
+            chunks.append("\n")
+        self._add_chunk("".join(chunks))
+
+
     def apply_indentation(self) -> None:
         """
         Adds whitespace characters to apply the current indentation level.
         """
-        self._text += self._indent * self._indent_level
+        self._add_chunk(self._indent * self._indent_level)
 
 
     def decrease_indentation_level(self, delta: int = 1) -> None:
@@ -136,7 +169,19 @@ class TextGenerator:
         @param text Text to remove.
         @returns True if the text was found and removed; otherwise, false.
         """
-        index = self._text.rfind(text)
+        full_text = self.text
+        index = full_text.rfind(text)
         if index >= 0:
-            self._text = self._text[:index] + self._text[index + len(text):]
+            self._chunks = []
+            self._add_chunk(full_text[:index] + full_text[index + len(text):])
         return index >= 0
+
+
+    def _add_chunk(self, text: str) -> None:
+        """
+        Adds a chunk of text without applying any formatting.
+        @param text Text to add.
+        """
+        if text:
+            self._chunks.append(text)
+            self._ends_with_newline = text[-1] == "\n"
@@ -7,6 +7,16 @@ class ITraceFileGenerator(ABC):
     Base class for types that generate trace files.
     """
 
+    @property
+    @abstractmethod
+    def file_extension(self) -> str:
+        """
+        Gets the extension to use for generated trace files.
+        The extension does not include the leading period.
+        """
+        raise NotImplementedError()
+
+
     @abstractmethod
     def generate(self, data: Any) -> str:
         """
@@ -17,9 +27,12 @@ class ITraceFileGenerator(ABC):
 
 
     @abstractmethod
-    def write_file(self, data: Any, output_path: str | Path) -> None:
+    def write_file(self, data: Any, output_path: str | Path) -> bool:
         """
         Writes the generated trace file to the specified path.
+        The file is only written if its contents would change.
         @param output_path Path to write the generated trace file to.
+        @returns True if the file was written, or False if the file was
+          unchanged.
         """
         raise NotImplementedError()
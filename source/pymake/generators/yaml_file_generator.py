@@ -1,26 +1,44 @@
 from pathlib import Path
 from pymake.generators.trace_file_generator import ITraceFileGenerator
+from pymake.util.file_writer import FileWriter
 from typing import Any
 import yaml
 
+# Use the libyaml-based dumper if PyYAML was built with libyaml support since
+#   it's significantly faster than the pure Python dumper
+try:
+    from yaml import CDumper as Dumper
+except ImportError: # pragma: no cover
+    from yaml import Dumper
+
 class YamlFileGenerator(ITraceFileGenerator):
     """
     Class that generates a YAML file containing tracing information.
     """
 
+    @property
+    def file_extension(self) -> str:
+        """
+        Gets the extension to use for generated trace files.
+        """
+        return "yaml"
+
+
     def generate(self, data: Any) -> str:
         """
         Gets the contents of the generated trace file.
         @returns The contents of the generated trace file.
         """
-        return yaml.dump(data)
+        return yaml.dump(data, Dumper=Dumper)
 
 
-    def write_file(self, data: Any, output_path: str | Path) -> None:
+    def write_file(self, data: Any, output_path: str | Path) -> bool:
         """
         Writes the generated trace file to the specified path.
+        The file is only written if its contents would change.
         @param output_path Path to write the generated trace file to.
+        @returns True if the file was written, or False if the file was
+          unchanged.
         """
         # Serialize the object as a YAML string and write it to the output path
-        with open(output_path, "w") as file:
-            file.write(self.generate(data))
+        return FileWriter.write_if_changed(output_path, self.generate(data))
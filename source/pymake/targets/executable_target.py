@@ -2,6 +2,7 @@ from __future__ import annotations
 from pymake.common.target_type import ETargetType
 from pymake.core.build_script_set import BuildScriptSet
 from pymake.targets.target import ITarget
+from pymake.tracing.origin_context import OriginContext
 from pymake.tracing.traced import Traced
 from typing import Dict, Optional
 
@@ -50,11 +51,12 @@ class ExecutableTarget(ITarget):
 
         # Add executable-specific properties
         if self._install_rpath is not None:
-            trace_dict["install_rpath"] = self._install_rpath
+            trace_dict["install_rpath"] = self._install_rpath.to_dict()
 
         return trace_dict
 
 
+    @OriginContext.entry_point
     def mark_is_test_target(
         self,
         add_valgrind_target: bool = False,
@@ -131,6 +133,7 @@ class ExecutableTarget(ITarget):
                 )
 
 
+    @OriginContext.entry_point
     def set_install_rpath(self, path: str) -> None:
         """
         Sets the rpath that the installed executable will use.
@@ -1,15 +1,18 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
+import os
 from pathlib import Path
 from pymake.common.scope import EScope
 from pymake.common.target_type import ETargetType
 from pymake.core.build_script_set import BuildScriptSet
 from pymake.core.scoped_sets import ScopedSets
 from pymake.generators.trace_file_generator import ITraceFileGenerator
-from pymake.tracing.caller_info import CallerInfo
+from pymake.tracing.origin_context import OriginContext
 from pymake.tracing.traced import ITraced, Traced
+from pymake.util.glob_pattern import GlobPattern
 from pymake.util.platform_statics import PlatformStatics
-from typing import Dict, List, Iterable, Optional
+import sys
+from typing import Callable, Dict, List, Iterable, Optional
 
 class ITarget(ABC, ITraced):
     """
@@ -35,21 +38,25 @@ class ITarget(ABC, ITraced):
         # Note that each of these collections does *not* include values that
         #   were added to targets that this target links to. To get a target
         #   instance with all values, use the `get_full_target()` method.
-        self._sources: ScopedSets[Path] = ScopedSets()
+        self._sources: ScopedSets[Path] = ScopedSets(
+            on_change=self._invalidate_full_targets)
 
         # Include directories to add to the target
         # All paths will be absolute paths.
-        self._include_directories: ScopedSets[Path] = ScopedSets()
+        self._include_directories: ScopedSets[Path] = ScopedSets(
+            on_change=self._invalidate_full_targets)
 
         # Libraries to link to
         # Each item may be a string containing the name or absolute path to an
         #   external library, or a PyMake target. If the item is a PyMake
         #   target, the target will not be an executable target.
-        self._link_libraries: ScopedSets[str | ITarget] = ScopedSets()
+        self._link_libraries: ScopedSets[str | ITarget] = ScopedSets(
+            on_change=self._invalidate_full_targets)
 
         # Paths to directories to search for libraries
         # All paths in this set will be absolute paths.
-        self._link_directories: ScopedSets[Path] = ScopedSets()
+        self._link_directories: ScopedSets[Path] = ScopedSets(
+            on_change=self._invalidate_full_targets)
 
         # Whether the target will be installed
         # If `_is_installed` is `True` but `_install_path` is `None`, the path
@@ -58,6 +65,39 @@ class ITarget(ABC, ITraced):
         self._is_installed = False
         self._install_path: Optional[Traced[str]] = None
 
+        # Full targets generated for this target, indexed by the value of
+        #   `include_private` used to generate them
+        # This is cleared whenever the target or a target that it links to is
+        #   modified.
+        self._full_targets: Dict[bool, ITarget] = {}
+
+        # Targets that link to this target
+        # These targets' full targets must be invalidated whenever this target's
+        #   full targets are invalidated.
+        self._dependents: List[ITarget] = []
+
+        # Callback that will be invoked before the target links to another
+        #   target
+        # The callback will be passed this target, the linked target, and the
+        #   scope of the link. The callback may raise an exception to reject
+        #   the link.
+        self._on_target_linked: Callable[[ITarget, ITarget, EScope], None] = \
+            lambda target, dependency, scope: None
+
+
+    def __getstate__(self) -> Dict[str, object]:
+        """
+        Gets the state of the target to pickle.
+        Cached full targets and the targets that link to this target are not
+          pickled since they may refer to targets that are not being pickled.
+          They are restored by `_restore_links()` once the targets that link to
+          each other have been unpickled.
+        """
+        state = self.__dict__.copy()
+        state["_full_targets"] = {}
+        state["_dependents"] = []
+        return state
+
 
     def __str__(self) -> str:
         """
@@ -138,6 +178,7 @@ class ITarget(ABC, ITraced):
         return self._link_libraries
 
 
+    @OriginContext.entry_point
     def add_sources(self,
         sources: str | Iterable[str],
         scope: EScope = EScope.PRIVATE) -> None:
@@ -145,7 +186,8 @@ class ITarget(ABC, ITraced):
         Adds source files to the target.
         @param sources Source files to add to the target. If any path is a
           relative path, it will be interpreted relative to the caller's
-          directory.
+          directory. A warning will be printed for each source file that
+          does not exist.
         @param scope Scope of the source files.
         """
         if isinstance(sources, str):
@@ -153,36 +195,102 @@ class ITarget(ABC, ITraced):
 
         # Get the path of the caller
         # Any relative paths will be interpreted relative to this path.
-        caller_info = CallerInfo.closest_external_frame()
+        caller_info = OriginContext.capture()
         caller_path = Path(caller_info.file_path).parent
+        resolver = self._build_scripts.path_resolver
 
-        source_abs_paths: List[str] = []
+        new_paths: List[Path] = []
         for source in sources:
             # Convert all paths to absolute paths if they aren't already
-            path = Path(source)
-            if not path.is_absolute():
-                path = caller_path / path
-            path = path.resolve()
+            path = resolver.resolve(caller_path, source)
 
             # Only add the path if it hasn't already been added
             if not self._sources.select_set(scope).add(path):
                 continue
-            source_abs_paths.append(str(path))
+            new_paths.append(path)
 
         # If no new paths were added, skip generating the CMake code
-        if not source_abs_paths:
+        if not new_paths:
             return
 
+        # Report missing files now instead of when CMake configures the
+        #   project
+        # Sources may be generated during the build, so this isn't an error.
+        for path in resolver.find_missing(new_paths):
+            print(f"Warning: The source file '{path}' does not exist.\n" +
+                "Note: The source file was added at " +
+                f"{caller_info.file_path}:{caller_info.line_number}",
+                file=sys.stderr)
+
         # Generate the CMake code
         generator = self._build_scripts.get_or_add_build_script().generator
         with generator.open_method_block("target_sources") as b:
             b.add_arguments(self._target_name)
             b.add_keyword_arguments(
                 scope.value,
-                source_abs_paths
+                [str(p) for p in new_paths]
             )
 
 
+    @OriginContext.entry_point
+    def add_sources_glob(self,
+        patterns: str | Iterable[str],
+        exclude: str | Iterable[str] = (),
+        scope: EScope = EScope.PRIVATE) -> None:
+        """
+        Adds all source files that match glob patterns to the target.
+        Patterns support `*`, `?`, and character classes, which never match
+          across directories, and `**`, which matches any number of
+          directories. Directory listings are cached between runs, and the
+          directories that were scanned are recorded so that adding or removing
+          a file causes the CMake files to be regenerated.
+        @param patterns Patterns matching the source files to add. If any
+          pattern is a relative path, it will be interpreted relative to the
+          caller's directory.
+        @param exclude Patterns matching source files that should not be added,
+          even if they match one of `patterns`. Relative patterns are
+          interpreted relative to the caller's directory.
+        @param scope Scope of the source files.
+        """
+        if isinstance(patterns, str):
+            patterns = [patterns]
+        if isinstance(exclude, str):
+            exclude = [exclude]
+
+        # Get the path of the caller
+        # Any relative patterns will be interpreted relative to this path.
+        caller_info = OriginContext.capture()
+        caller_path = str(Path(caller_info.file_path).parent)
+        scan_cache = self._build_scripts.directory_scan_cache
+
+        exclude_patterns = [
+            GlobPattern(os.path.join(caller_path, p)) for p in exclude
+        ]
+        sources: List[str] = []
+        for pattern_str in patterns:
+            pattern = GlobPattern(os.path.join(caller_path, pattern_str))
+            matches = [
+                path
+                for path in scan_cache.walk(
+                    pattern.base_dir,
+                    pattern.is_recursive
+                )
+                if pattern.matches(path) and
+                    not any(e.matches(path) for e in exclude_patterns)
+            ]
+            if not matches:
+                print(f"Warning: The pattern '{pattern_str}' did not match " +
+                    "any source files.\n" +
+                    "Note: The pattern was added at " +
+                    f"{caller_info.file_path}:{caller_info.line_number}",
+                    file=sys.stderr)
+            sources.extend(matches)
+
+        if sources:
+            self.add_sources(sources, scope)
+
+
+    @OriginContext.entry_point
     def add_include_directories(self,
         include_directories: str | Iterable[str],
         scope: EScope = EScope.PRIVATE) -> None:
@@ -198,16 +306,14 @@ class ITarget(ABC, ITraced):
 
         # Get the path of the caller
         # Any relative paths will be interpreted relative to this path.
-        caller_info = CallerInfo.closest_external_frame()
+        caller_info = OriginContext.capture()
         caller_path = Path(caller_info.file_path).parent
+        resolver = self._build_scripts.path_resolver
 
         include_directory_abs_paths: List[str] = []
         for include_directory in include_directories:
             # Convert all paths to absolute paths if they aren't already
-            path = Path(include_directory)
-            if not path.is_absolute():
-                path = caller_path / path
-            path = path.resolve()
+            path = resolver.resolve(caller_path, include_directory)
 
             if not self._include_directories.select_set(scope).add(path):
                 continue
@@ -227,6 +333,7 @@ class ITarget(ABC, ITraced):
             )
 
 
+    @OriginContext.entry_point
     def add_link_directories(self,
         link_directories: str | Iterable[str],
         scope: EScope = EScope.PRIVATE) -> None:
@@ -242,16 +349,14 @@ class ITarget(ABC, ITraced):
 
         # Get the path of the caller
         # Any relative paths will be interpreted relative to this path.
-        caller_info = CallerInfo.closest_external_frame()
+        caller_info = OriginContext.capture()
         caller_path = Path(caller_info.file_path).parent
+        resolver = self._build_scripts.path_resolver
 
         link_directory_abs_paths: List[str] = []
         for link_directory in link_directories:
             # Convert all paths to absolute paths if they aren't already
-            path = Path(link_directory)
-            if not path.is_absolute():
-                path = caller_path / path
-            path = path.resolve()
+            path = resolver.resolve(caller_path, link_directory)
 
             if not self._link_directories.select_set(scope).add(path):
                 continue
@@ -279,6 +384,7 @@ class ITarget(ABC, ITraced):
         raise NotImplementedError()
 
 
+    @OriginContext.entry_point
     def link_to_target(self,
         target: ITarget,
         scope: EScope = EScope.PRIVATE):
@@ -287,13 +393,18 @@ class ITarget(ABC, ITraced):
         @param target Target to link to. Must not be an executable target.
         @param scope Visibility scope for the library.
         @throws ValueError If the target is an executable target.
+        @throws ValueError If the `on_target_linked` callback rejects the link,
+          such as when the link would create a dependency cycle.
         """
         if target.target_type == ETargetType.EXECUTABLE:
             raise ValueError("Cannot link to an executable target.")
+        self._on_target_linked(self, target, scope)
 
         # If the target has already been added, don't generate new CMake code
         if not self._link_libraries.select_set(scope).add(target):
             return
+        if self not in target._dependents:
+            target._dependents.append(self)
 
         # Generate the CMake code
         generator = self._build_scripts.get_or_add_build_script().generator
@@ -305,6 +416,7 @@ class ITarget(ABC, ITraced):
             )
 
 
+    @OriginContext.entry_point
     def link_to_library(self,
         library: str | Path,
         is_static: bool = False,
@@ -386,13 +498,15 @@ class ITarget(ABC, ITraced):
 
     def generate_trace_file(self,
         output_path: Path,
-        generator: ITraceFileGenerator):
+        generator: ITraceFileGenerator) -> bool:
         """
         Generates a trace file for the target.
         @param output_path Path to the output file.
         @param generator Generator to create the trace file using.
+        @returns True if the file was written, or False if the file was
+          unchanged.
         """
-        generator.write_file({
+        return generator.write_file({
             self.target_name: self.generate_trace_dict()
         }, output_path)
 
@@ -403,74 +517,32 @@ class ITarget(ABC, ITraced):
         Target instances normally do not include values from targets that
           they link to. The target instance returned by this method contains
           all values for the target, including values from linked-to targets.
+        Full targets are cached until the target or any target that it links
+          to is modified, so the returned instance must not be modified.
         @param include_private Whether to include values from private
           dependencies. This should be true for the first call to this method
           and false for every recursive call made by this method.
         @returns A target instance that includes all values from targets that
           this target links to.
         """
-        # Create the target to return
-        target = self._create_empty_clone()
-
-        # Populate the target with properties from each linked-to target
-        linked_targets = [
-            target.value
-            for target in self._link_libraries.select_set(EScope.PUBLIC)
-            if isinstance(target.value, ITarget)
-        ]
-        linked_targets.extend([
-            target.value
-            for target in self._link_libraries.select_set(EScope.INTERFACE)
-            if isinstance(target.value, ITarget)
-        ])
-        if include_private:
-            linked_targets.extend([
-                target.value
-                for target in self._link_libraries.select_set(EScope.PRIVATE)
-                if isinstance(target.value, ITarget)
-            ])
-
-        # Merge all properties from linked targets into the target
-        # Note that the linked target's own linked targets should not be added
-        #   to the full target
-        for linked_target in linked_targets:
-            full_linked_target = linked_target.get_full_target(
-                include_private=False
-            )
-            target._include_directories.merge(
-                full_linked_target._include_directories
-            )
-            target._link_libraries.merge(
-                full_linked_target._link_libraries
-            )
-            target._sources.merge(
-                full_linked_target._sources
-            )
+        cached = self._full_targets.get(include_private)
+        if cached is not None:
+            return cached
 
-        # Merge the properties from this target into the target
-        target._sources.merge(
-            self._sources,
-            merge_private=True
-        )
-        target._include_directories.merge(
-            self._include_directories,
-            merge_private=True
-        )
-        target._link_libraries.merge(
-            self._link_libraries,
-            merge_private=True
-        )
-        target._link_libraries.merge(
-            self._link_libraries,
-            merge_private=True
-        )
-        target._is_installed = self._is_installed
-        target._install_path = self._install_path
-        target._is_full_target = True
+        # Generate the full targets of all linked-to targets first so that
+        #   each full target is generated exactly once, even if multiple
+        #   targets link to the same target
+        for dependency in self._get_dependency_order(include_private):
+            if False not in dependency._full_targets:
+                dependency._full_targets[False] = \
+                    dependency._create_full_target(False)
 
+        target = self._create_full_target(include_private)
+        self._full_targets[include_private] = target
         return target
 
 
+    @OriginContext.entry_point
     def install(self,
         install_path: Optional[str] = None) -> None:
         """
@@ -487,6 +559,7 @@ class ITarget(ABC, ITraced):
         self._is_installed = True
         if install_path:
             self._install_path = Traced(install_path)
+        self._invalidate_full_targets()
 
         # Generate the CMake code
         generator = self._build_scripts.get_or_add_build_script().generator
@@ -515,3 +588,167 @@ class ITarget(ABC, ITraced):
         @returns An empty clone of the target.
         """
         raise NotImplementedError()
+
+
+    def _create_full_target(self, include_private: bool) -> ITarget:
+        """
+        Creates a target instance that includes all values for the target.
+        The full targets of all targets that this target links to must already
+          be cached.
+        @param include_private Whether to include values from private
+          dependencies.
+        @returns A target instance that includes all values from targets that
+          this target links to.
+        """
+        # Create the target to return
+        target = self._create_empty_clone()
+
+        # Merge all properties from linked targets into the target
+        # Note that the linked target's own linked targets should not be added
+        #   to the full target
+        for linked_target in self._get_linked_targets(include_private):
+            # The linked target's full target will only be missing if the
+            #   targets link to each other in a cycle. In that case, only the
+            #   linked target's own values can be merged.
+            full_linked_target = linked_target._full_targets.get(
+                False,
+                linked_target
+            )
+            target._include_directories.merge(
+                full_linked_target._include_directories
+            )
+            target._link_libraries.merge(
+                full_linked_target._link_libraries
+            )
+            target._sources.merge(
+                full_linked_target._sources
+            )
+
+        # Merge the properties from this target into the target
+        target._sources.merge(
+            self._sources,
+            merge_private=True
+        )
+        target._include_directories.merge(
+            self._include_directories,
+            merge_private=True
+        )
+        target._link_libraries.merge(
+            self._link_libraries,
+            merge_private=True
+        )
+        target._is_installed = self._is_installed
+        target._install_path = self._install_path
+        target._is_full_target = True
+
+        return target
+
+
+    def _get_dependency_order(self, include_private: bool) -> List[ITarget]:
+        """
+        Gets the targets whose full targets are needed to create this target's
+          full target.
+        Targets whose full targets are already cached are not included since
+          the full targets of their own dependencies must also be cached.
+        @param include_private Whether to include private dependencies of this
+          target. Private dependencies of other targets are never included.
+        @returns The targets in topological order. Each target will appear
+          after all targets that it links to.
+        """
+        order: List[ITarget] = []
+        visited = set([id(self)])
+
+        # Walk the graph iteratively so that deep dependency chains don't
+        #   exceed the recursion limit
+        # Each entry stores a target and whether its dependencies have been
+        #   added to the stack.
+        stack = [
+            (t, False)
+            for t in reversed(self._get_linked_targets(include_private))
+        ]
+        while stack:
+            target, expanded = stack.pop()
+            if expanded:
+                order.append(target)
+                continue
+            if id(target) in visited or False in target._full_targets:
+                continue
+            visited.add(id(target))
+
+            stack.append((target, True))
+            stack.extend(
+                (t, False)
+                for t in reversed(target._get_linked_targets(False))
+                if id(t) not in visited
+            )
+        return order
+
+
+    def _get_linked_targets(self, include_private: bool) -> List[ITarget]:
+        """
+        Gets the PyMake targets that this target links to.
+        @param include_private Whether to include private dependencies.
+        @returns The linked targets, ordered by scope.
+        """
+        scopes = [EScope.PUBLIC, EScope.INTERFACE]
+        if include_private:
+            scopes.append(EScope.PRIVATE)
+        return [
+            traced.value
+            for scope in scopes
+            for traced in self._link_libraries.select_set(scope)
+            if isinstance(traced.value, ITarget)
+        ]
+
+
+    def _invalidate_full_targets(self) -> None:
+        """
+        Clears the cached full targets for this target and every target that
+          links to it.
+        """
+        targets: List[ITarget] = [self]
+        while targets:
+            target = targets.pop()
+
+            # If a target has no cached full targets, none of the targets that
+            #   link to it can have cached full targets either
+            if not target._full_targets:
+                continue
+            target._full_targets.clear()
+            targets.extend(target._dependents)
+
+
+    def _restore_links(self) -> None:
+        """
+        Reports the target's links to the `on_target_linked` callback again and
+          registers the target with each target it links to.
+        This must be called after an unpickled target has been added to a
+          project since links made before the target was pickled were reported
+          to a different callback.
+        @throws ValueError Thrown if the `on_target_linked` callback rejects a
+          link.
+        """
+        for scope in EScope:
+            for traced in self._link_libraries.select_set(scope):
+                target = traced.value
+                if not isinstance(target, ITarget):
+                    continue
+                with OriginContext(traced.origin):
+                    self._on_target_linked(self, target, scope)
+                if self not in target._dependents:
+                    target._dependents.append(self)
+
+
+    def _set_on_target_linked(self,
+        callback: Callable[[ITarget, ITarget, EScope], None]) -> None:
+        """
+        Sets the callback that will be invoked when the target links to
+          another target.
+        @param callback Callback to invoke before the target links to another
+          target.
+        """
+        self._on_target_linked = callback
+
+
+    # Allow external objects to bind to the `on_target_linked` event
+    on_target_linked = property(fset=_set_on_target_linked)
@@ -1,12 +1,21 @@
 from __future__ import annotations
-import inspect
-import os
 from pathlib import Path
+from pymake.tracing.frame_walker import FrameWalker
+from typing import Dict, Optional, Tuple
 
 class CallerInfo:
     """
     Helper class that captures caller information for a method.
+    Instances captured from stack frames are interned so that every capture of
+      the same file and line returns the same instance. The file path of an
+      interned instance is only resolved when it's first accessed.
     """
+    __slots__ = ("_file_name", "_file_path", "_line_number")
+
+    # Interned instances, indexed by the file name stored in the code object and
+    #   the line number
+    _interned: Dict[Tuple[str, int], CallerInfo] = {}
+
     def __init__(self, file_path: Path | str, line_number: int):
         """
         Initializes the object.
@@ -20,7 +29,8 @@ class CallerInfo:
         if not file_path.is_absolute():
             raise ValueError("file_path must be an absolute path.")
 
-        self._file_path = file_path
+        self._file_name = str(file_path)
+        self._file_path: Optional[Path] = file_path
         self._line_number = line_number
 
 
@@ -31,13 +41,8 @@ class CallerInfo:
         @returns A `CallerInfo` instance that captures the data for the closest
           non-pymake stack frame.
         """
-        i = 1
-        caller_info = CallerInfo.from_stack_frame(i)
-        sep = os.path.sep
-        while f"{sep}pymake{sep}" in str(caller_info.file_path):
-            i += 1
-            caller_info = CallerInfo.from_stack_frame(i)
-        return caller_info
+        file_name, line_number = FrameWalker.closest_external_frame(1)
+        return CallerInfo.intern(file_name, line_number)
 
 
     @staticmethod
@@ -48,25 +53,35 @@ class CallerInfo:
           to capture in the `CallerInfo` instance. A value of 0 will capture
           the caller method's stack frame.
         """
-        # Get the frame for the caller whose information should be captured
+        # Capture the information so that it can be used later
         # Note that 1 is added to the offset passed to this method to account
         #   for this method's stack frame.
-        frame = inspect.currentframe()
-        for _ in range(0, offset + 1):
-            assert frame
-            frame = frame.f_back
+        # Note that the frame must not be stored and used to get the values
+        #   later. Attempting to do so will return values correct at the point
+        #   that the frame's values are accessed, not the time when the frame
+        #   was constructed.
+        file_name, line_number = FrameWalker.get_frame(offset + 1)
+        return CallerInfo.intern(file_name, line_number)
 
-        # Make sure that a stack frame exists at the target level
-        assert frame
 
-        # Capture the information so that it can be used later
-        # Note that `frame` must not be stored and used to get the values later.
-        #   Attempting to do so will return values correct at the point that
-        #   the frame's values are accessed, not the time when the frame was
-        #   constructed.
-        file_path = Path(frame.f_code.co_filename).absolute().resolve()
-        line_number = frame.f_lineno
-        return CallerInfo(file_path, line_number)
+    @staticmethod
+    def intern(file_name: str, line_number: int) -> CallerInfo:
+        """
+        Gets the interned instance for a file and line number.
+        @param file_name Name of the file as stored in a code object. The path
+          will not be resolved until the instance's file path is accessed.
+        @param line_number Line number within the file.
+        @returns The interned `CallerInfo` instance.
+        """
+        key = (file_name, line_number)
+        caller_info = CallerInfo._interned.get(key)
+        if caller_info is None:
+            caller_info = CallerInfo.__new__(CallerInfo)
+            caller_info._file_name = file_name
+            caller_info._file_path = None
+            caller_info._line_number = line_number
+            CallerInfo._interned[key] = caller_info
+        return caller_info
 
 
     @property
@@ -75,6 +90,8 @@ class CallerInfo:
         Gets the file path of the caller's code.
         @invariant This will always be an absolute path.
         """
+        if self._file_path is None:
+            self._file_path = FrameWalker.resolve_path(self._file_name)
         return self._file_path
 
 
@@ -91,7 +108,7 @@ class CallerInfo:
         Generates the hash of the object.
         @returns The hash of the object.
         """
-        return hash((self._file_path, self._line_number))
+        return hash((self.file_path, self._line_number))
 
 
     def __eq__(self, other: object) -> bool:
@@ -100,9 +117,11 @@ class CallerInfo:
         @param other Object to compare to this object.
         @returns True if the two objects are equal.
         """
+        if self is other:
+            return True
         if isinstance(other, CallerInfo):
             return (
-                self._file_path,
+                self.file_path,
                 self._line_number
             ) == (
                 other.file_path,
@@ -0,0 +1,121 @@
+from __future__ import annotations
+import os
+from pathlib import Path
+import sys
+from types import CodeType, FrameType
+from typing import Dict, Optional, Tuple
+
+class FrameWalker:
+    """
+    Helper class used to quickly locate stack frames.
+    Whether a file is part of PyMake is cached for each file and code object so
+      that each file's path only needs to be resolved once, and walking the
+      stack through code objects that were already seen doesn't require any
+      file system calls. Each file's resolved path is cached as well.
+    """
+    # Path component used to check whether a file is part of PyMake
+    PYMAKE_PATH_COMPONENT = f"{os.path.sep}pymake{os.path.sep}"
+
+    # Whether each file is part of PyMake, indexed by the unresolved file name
+    #   stored in code objects
+    _files: Dict[str, bool] = {}
+
+    # Resolved path of each file, indexed by the unresolved file name stored in
+    #   code objects
+    _resolved_paths: Dict[str, Path] = {}
+
+    # Cached data for each code object, indexed by the ID of the code object
+    # Each value stores the code object itself so that the ID can't be reused
+    #   by another code object while the entry exists.
+    _code_objects: Dict[int, Tuple[CodeType, bool]] = {}
+
+
+    @staticmethod
+    def closest_external_frame(offset: int = 0) -> Tuple[str, int]:
+        """
+        Finds the closest stack frame that isn't part of PyMake.
+        @param offset Number of stack frames to skip before searching, relative
+          to the caller's stack frame. A value of 0 will start the search at
+          the caller's stack frame.
+        @returns A tuple containing the unresolved name of the file the frame's
+          code is from and the line number the frame is executing.
+        """
+        # Note that 1 is added to the offset to skip this method's stack frame
+        frame: Optional[FrameType] = sys._getframe(offset + 1)
+        code_objects = FrameWalker._code_objects
+        while True:
+            assert frame
+            code = frame.f_code
+            entry = code_objects.get(id(code))
+            if entry is None or entry[0] is not code:
+                entry = (code, FrameWalker.is_pymake_file(code.co_filename))
+                code_objects[id(code)] = entry
+
+            if not entry[1]:
+                return code.co_filename, frame.f_lineno
+            frame = frame.f_back
+
+
+    @staticmethod
+    def get_frame(offset: int = 0) -> Tuple[str, int]:
+        """
+        Gets the location of the target stack frame.
+        @param offset Offset in numbers of stack frames from the caller's stack
+          frame. A value of 0 will capture the caller's stack frame.
+        @returns A tuple containing the unresolved name of the file the frame's
+          code is from and the line number the frame is executing.
+        """
+        # Note that 1 is added to the offset to skip this method's stack frame
+        frame = sys._getframe(offset + 1)
+        return frame.f_code.co_filename, frame.f_lineno
+
+
+    @staticmethod
+    def clear_cache() -> None:
+        """
+        Clears all cached file and code object data.
+        """
+        FrameWalker._files.clear()
+        FrameWalker._resolved_paths.clear()
+        FrameWalker._code_objects.clear()
+
+
+    @staticmethod
+    def clear_code_objects() -> None:
+        """
+        Clears the cached code object data.
+        Each cached entry keeps its code object alive, so this should be called
+          once no more build scripts will be evaluated.
+        """
+        FrameWalker._code_objects.clear()
+
+
+    @staticmethod
+    def is_pymake_file(file_name: str) -> bool:
+        """
+        Checks whether a file is part of PyMake.
+        @param file_name File name as stored in a code object.
+        @returns True if the file is part of PyMake.
+        """
+        is_pymake_file = FrameWalker._files.get(file_name)
+        if is_pymake_file is None:
+            # The resolved path is checked so that PyMake's files are
+            #   recognized even if PyMake is installed through a symlink
+            is_pymake_file = FrameWalker.PYMAKE_PATH_COMPONENT in \
+                str(FrameWalker.resolve_path(file_name))
+            FrameWalker._files[file_name] = is_pymake_file
+        return is_pymake_file
+
+
+    @staticmethod
+    def resolve_path(file_name: str) -> Path:
+        """
+        Gets the resolved path for a file.
+        @param file_name File name as stored in a code object.
+        @returns The resolved, absolute path to the file.
+        """
+        file_path = FrameWalker._resolved_paths.get(file_name)
+        if file_path is None:
+            file_path = Path(file_name).absolute().resolve()
+            FrameWalker._resolved_paths[file_name] = file_path
+        return file_path
@@ -1,12 +1,19 @@
 from pymake.tracing.caller_info_formatter import ICallerInfoFormatter
 from pymake.tracing.caller_info import CallerInfo
 from pymake.tracing.traced import ITraced, Traced
-from typing import Any
+from typing import Any, Dict
 
 class FullCallerInfoFormatter(ICallerInfoFormatter):
     """
     Formatter that always prints full paths.
     """
+    def __init__(self):
+        """
+        Initializes the formatter.
+        """
+        # Formatted strings, indexed by the caller info they were generated for
+        self._formatted: Dict[CallerInfo, str] = {}
+
 
     def format(self, x: CallerInfo | ITraced | Traced[Any]) -> str:
         """
@@ -20,4 +27,8 @@ class FullCallerInfoFormatter(ICallerInfoFormatter):
         else:
             caller_info = x.origin
 
-        return f"{caller_info.file_path}:{caller_info.line_number}"
+        formatted = self._formatted.get(caller_info)
+        if formatted is None:
+            formatted = f"{caller_info.file_path}:{caller_info.line_number}"
+            self._formatted[caller_info] = formatted
+        return formatted
@@ -0,0 +1,147 @@
+from __future__ import annotations
+from contextvars import ContextVar, Token
+import functools
+import os
+from pymake.tracing.caller_info import CallerInfo
+from types import TracebackType
+from typing import Callable, Optional, ParamSpec, Type, TypeVar
+
+P = ParamSpec("P")
+R = TypeVar("R")
+
+class OriginContext:
+    """
+    Context that pins the origin used for all tracing data captured within it.
+    Public PyMake methods open a context when they're called so that the stack
+      only needs to be walked once per call. Any `Traced` values, builders, or
+      build script lookups created while the context is active will reuse the
+      context's origin instead of capturing their own.
+    """
+    # Origin assigned to traced values while tracing is disabled
+    UNTRACED_ORIGIN = CallerInfo(os.path.abspath(os.path.sep), 0)
+
+    # Origin of the currently active context, if any
+    _active_origin: ContextVar[Optional[CallerInfo]] = ContextVar(
+        "pymake_active_origin",
+        default=None
+    )
+
+    # Whether tracing data should be captured for traced values
+    _tracing_enabled = True
+
+    def __init__(self, origin: Optional[CallerInfo] = None):
+        """
+        Initializes the context.
+        @param origin Origin to use within the context. If not provided, the
+          origin of an enclosing context will be reused if one is active;
+          otherwise, the closest external frame will be captured when the
+          context is entered.
+        """
+        self._origin = origin
+        self._token: Optional[Token[Optional[CallerInfo]]] = None
+
+
+    def __enter__(self) -> CallerInfo:
+        """
+        Enters the context.
+        @returns The origin that will be used within the context.
+        """
+        origin = self._origin
+        if origin is None:
+            # Nested contexts reuse the origin of the outermost context since
+            #   they're part of the same public API call
+            origin = OriginContext._active_origin.get()
+            if origin is not None:
+                return origin
+            origin = CallerInfo.closest_external_frame()
+
+        self._token = OriginContext._active_origin.set(origin)
+        return origin
+
+
+    def __exit__(self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType]) -> None:
+        """
+        Exits the context.
+        @param exc_type Type of exception that was raised.
+        @param exc_value Value of the exception that was raised.
+        @param traceback Traceback of the exception that was raised.
+        """
+        if self._token is not None:
+            OriginContext._active_origin.reset(self._token)
+            self._token = None
+
+
+    @staticmethod
+    def capture() -> CallerInfo:
+        """
+        Gets the origin for tracing data being captured.
+        @returns The origin of the active context if one exists, otherwise the
+          closest external frame.
+        """
+        origin = OriginContext._active_origin.get()
+        if origin is not None:
+            return origin
+        return CallerInfo.closest_external_frame()
+
+
+    @staticmethod
+    def capture_trace() -> CallerInfo:
+        """
+        Gets the origin to record for a traced value.
+        Unlike `capture()`, this method skips capturing the origin entirely if
+          tracing is disabled.
+        @returns The origin to record, or `UNTRACED_ORIGIN` if tracing is
+          disabled.
+        """
+        if not OriginContext._tracing_enabled:
+            return OriginContext.UNTRACED_ORIGIN
+        return OriginContext.capture()
+
+
+    @staticmethod
+    def current() -> Optional[CallerInfo]:
+        """
+        Gets the origin of the active context.
+        @returns The origin of the active context, or None if no context is
+          active.
+        """
+        return OriginContext._active_origin.get()
+
+
+    @staticmethod
+    def entry_point(func: Callable[P, R]) -> Callable[P, R]:
+        """
+        Decorator for public methods that should capture their origin once.
+        @param func Method to wrap.
+        @returns The wrapped method.
+        """
+        @functools.wraps(func)
+        def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            if OriginContext._active_origin.get() is not None:
+                return func(*args, **kwargs)
+            with OriginContext():
+                return func(*args, **kwargs)
+        return wrapper
+
+
+    @staticmethod
+    def is_tracing_enabled() -> bool:
+        """
+        Gets whether tracing data is captured for traced values.
+        """
+        return OriginContext._tracing_enabled
+
+
+    @staticmethod
+    def set_tracing_enabled(enabled: bool) -> None:
+        """
+        Sets whether tracing data is captured for traced values.
+        @param enabled Whether tracing data should be captured. If false, all
+          traced values will use `UNTRACED_ORIGIN` as their origin. Origins
+          needed for PyMake to function, such as the caller's directory or the
+          location that defined a target, are still captured.
+        """
+        OriginContext._tracing_enabled = enabled
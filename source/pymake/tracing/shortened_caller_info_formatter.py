@@ -3,7 +3,7 @@ from pathlib import Path
 from pymake.tracing.caller_info_formatter import ICallerInfoFormatter
 from pymake.tracing.caller_info import CallerInfo
 from pymake.tracing.traced import ITraced, Traced
-from typing import Any
+from typing import Any, Dict
 
 class ShortenedCallerInfoFormatter(ICallerInfoFormatter):
     """
@@ -28,6 +28,11 @@ class ShortenedCallerInfoFormatter(ICallerInfoFormatter):
 
         self._base_path = base_path.resolve()
 
+        # Formatted strings, indexed by the caller info they were generated for
+        # Most caller info instances are interned, so this allows each call site
+        #   to only be formatted once no matter how many times it's used.
+        self._formatted: Dict[CallerInfo, str] = {}
+
 
     def format(self, x: CallerInfo | ITraced | Traced[Any]) -> str:
         """
@@ -41,6 +46,19 @@ class ShortenedCallerInfoFormatter(ICallerInfoFormatter):
         else:
             caller_info = x.origin
 
+        formatted = self._formatted.get(caller_info)
+        if formatted is None:
+            formatted = self._format_caller_info(caller_info)
+            self._formatted[caller_info] = formatted
+        return formatted
+
+
+    def _format_caller_info(self, caller_info: CallerInfo) -> str:
+        """
+        Converts the caller info data into a formatted string without using
+          previously formatted results.
+        @param caller_info Caller info to format.
+        """
         # Check if the caller's file path should be shortened
         common_prefix = os.path.commonpath([
             self._base_path,
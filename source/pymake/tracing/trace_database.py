@@ -0,0 +1,296 @@
+from __future__ import annotations
+from pathlib import Path
+from pymake.tracing.trace_record import TraceRecord
+from pymake.util.file_writer import FileWriter
+import sqlite3
+import tempfile
+from typing import Dict, List, Optional, Tuple
+
+class TraceDatabase:
+    """
+    Stores the tracing information for all targets and presets in one file.
+    The database is a SQLite database with a table for targets and presets, a
+      table for each traced value, and a table for each origin. Values are
+      indexed by value so that the location that added a value can be found
+      without scanning every target.
+    """
+    # Name of the database file within the generated directory
+    FILE_NAME = "pymake_trace.db"
+
+    # Object kind used for targets
+    TARGET_KIND = "target"
+
+    # Object kind used for presets
+    PRESET_KIND = "preset"
+
+    # Names of the scopes that scoped properties are stored under
+    SCOPES = ("public", "interface", "private")
+
+    # Statements used to create the database's tables
+    SCHEMA = """
+        CREATE TABLE objects (
+            id INTEGER PRIMARY KEY,
+            kind TEXT NOT NULL,
+            name TEXT NOT NULL,
+            UNIQUE (name, kind)
+        );
+        CREATE TABLE origins (
+            id INTEGER PRIMARY KEY,
+            file TEXT NOT NULL,
+            line INTEGER NOT NULL,
+            UNIQUE (file, line)
+        );
+        CREATE TABLE trace_values (
+            id INTEGER PRIMARY KEY,
+            object_id INTEGER NOT NULL REFERENCES objects (id),
+            property TEXT NOT NULL,
+            scope TEXT,
+            value TEXT NOT NULL,
+            origin_id INTEGER REFERENCES origins (id)
+        );
+        CREATE INDEX trace_values_by_object ON trace_values (object_id);
+        CREATE INDEX trace_values_by_value ON trace_values (value);
+    """
+
+    # Query used to read trace records
+    # Conditions must be appended to the query.
+    SELECT_RECORDS = """
+        SELECT o.kind, o.name, v.property, v.scope, v.value, g.file, g.line
+        FROM trace_values v
+        JOIN objects o ON o.id = v.object_id
+        LEFT JOIN origins g ON g.id = v.origin_id
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        """
+        Initializes the database.
+        @param connection Connection to the database.
+        """
+        self._connection = connection
+
+        # ID of each origin that has been added, indexed by file and line
+        self._origin_ids: Dict[Tuple[str, int], int] = {}
+
+
+    @staticmethod
+    def create() -> TraceDatabase:
+        """
+        Creates a new, empty in-memory database.
+        The database can be saved using `write_file()`.
+        @returns The new database.
+        """
+        connection = sqlite3.connect(":memory:")
+        connection.executescript(TraceDatabase.SCHEMA)
+        return TraceDatabase(connection)
+
+
+    @staticmethod
+    def open(database_path: str | Path) -> TraceDatabase:
+        """
+        Opens a database written by a previous run.
+        @param database_path Path to the database file.
+        @returns The database.
+        @throws FileNotFoundError Thrown if the database file doesn't exist.
+        """
+        database_path = Path(database_path)
+        if not database_path.exists():
+            raise FileNotFoundError(
+                f"Error: The trace database '{database_path}' does not " +
+                "exist. Generate the project with '--trace-format database' " +
+                "to create it.")
+        connection = sqlite3.connect(
+            f"{database_path.absolute().as_uri()}?mode=ro",
+            uri=True
+        )
+        return TraceDatabase(connection)
+
+
+    def add_preset(self, preset_name: str, trace_dict: Dict[str, object]) \
+        -> None:
+        """
+        Adds the tracing information for a preset to the database.
+        @param preset_name Name of the preset.
+        @param trace_dict Trace dictionary generated by the preset.
+        """
+        self._add_object(TraceDatabase.PRESET_KIND, preset_name, trace_dict)
+
+
+    def add_target(self, target_name: str, trace_dict: Dict[str, object]) \
+        -> None:
+        """
+        Adds the tracing information for a target to the database.
+        @param target_name Name of the target.
+        @param trace_dict Trace dictionary generated by the target.
+        """
+        self._add_object(TraceDatabase.TARGET_KIND, target_name, trace_dict)
+
+
+    def close(self) -> None:
+        """
+        Closes the connection to the database.
+        """
+        self._connection.close()
+
+
+    def explain(self, object_name: str) -> List[TraceRecord]:
+        """
+        Gets every value recorded for a target or preset.
+        @param object_name Name of the target or preset.
+        @returns The records for the object's values, in the order that they
+          were added to the database.
+        """
+        return self._query(
+            "WHERE o.name = ? ORDER BY v.id",
+            (object_name,)
+        )
+
+
+    def who_added(self, value: str) -> List[TraceRecord]:
+        """
+        Gets every record for a value.
+        @param value Value to look up, such as the absolute path of a source
+          file or include directory.
+        @returns The records for the value, in the order that they were added
+          to the database.
+        """
+        return self._query("WHERE v.value = ? ORDER BY v.id", (value,))
+
+
+    def write_file(self, output_path: str | Path) -> bool:
+        """
+        Writes the database to a file.
+        The file is only written if its contents would change.
+        @param output_path Path to write the database to.
+        @returns True if the file was written, or False if the file was
+          unchanged.
+        """
+        self._connection.commit()
+        return FileWriter.write_bytes_if_changed(output_path, self._to_bytes())
+
+
+    def _add_object(self,
+        kind: str,
+        name: str,
+        trace_dict: Dict[str, object]) -> None:
+        """
+        Adds the tracing information for a target or preset to the database.
+        @param kind Kind of object being added.
+        @param name Name of the object.
+        @param trace_dict Trace dictionary generated by the object.
+        """
+        cursor = self._connection.execute(
+            "INSERT INTO objects (kind, name) VALUES (?, ?)",
+            (kind, name)
+        )
+        object_id = cursor.lastrowid
+
+        rows: List[Tuple[object, ...]] = []
+        for property_name, prop in trace_dict.items():
+            if isinstance(prop, dict) and \
+                set(prop.keys()) == set(TraceDatabase.SCOPES):
+                # Scoped sets of traced values
+                for scope in TraceDatabase.SCOPES:
+                    for traced in prop[scope]:
+                        rows.append(self._create_row(
+                            object_id, property_name, scope, traced))
+            elif isinstance(prop, dict) and "value" in prop and \
+                "origin" in prop:
+                # Single traced value
+                rows.append(self._create_row(
+                    object_id, property_name, None, prop))
+            elif isinstance(prop, dict):
+                # Untraced mapping, such as a preset's cache variables
+                for k, v in prop.items():
+                    rows.append(
+                        (object_id, property_name, None, f"{k}={v}", None))
+            elif isinstance(prop, list):
+                # Untraced list, such as a preset's base presets
+                for v in prop:
+                    rows.append((object_id, property_name, None, str(v), None))
+            elif prop is not None:
+                rows.append((object_id, property_name, None, str(prop), None))
+
+        self._connection.executemany(
+            "INSERT INTO trace_values " +
+            "(object_id, property, scope, value, origin_id) " +
+            "VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+
+
+    def _create_row(self,
+        object_id: Optional[int],
+        property_name: str,
+        scope: Optional[str],
+        traced: object) -> Tuple[object, ...]:
+        """
+        Creates the row used to store a traced value.
+        @param object_id ID of the object that the value belongs to.
+        @param property_name Name of the property that the value belongs to.
+        @param scope Scope of the value, if any.
+        @param traced Dictionary generated by `Traced.to_dict()`.
+        @returns The row to insert into the values table.
+        """
+        assert isinstance(traced, dict)
+        origin = traced["origin"]
+        return (
+            object_id,
+            property_name,
+            scope,
+            str(traced["value"]),
+            self._get_origin_id(origin["file"], origin["line"])
+        )
+
+
+    def _get_origin_id(self, file: str, line: int) -> int:
+        """
+        Gets the ID of an origin, adding the origin if necessary.
+        @param file Path of the file that the origin is in.
+        @param line Line number of the origin.
+        @returns The ID of the origin.
+        """
+        key = (file, line)
+        origin_id = self._origin_ids.get(key)
+        if origin_id is None:
+            cursor = self._connection.execute(
+                "INSERT INTO origins (file, line) VALUES (?, ?)",
+                key
+            )
+            assert cursor.lastrowid is not None
+            origin_id = cursor.lastrowid
+            self._origin_ids[key] = origin_id
+        return origin_id
+
+
+    def _query(self,
+        condition: str,
+        params: Tuple[object, ...]) -> List[TraceRecord]:
+        """
+        Reads trace records from the database.
+        @param condition Condition to append to the query.
+        @param params Parameters for the condition.
+        @returns The matching records.
+        """
+        cursor = self._connection.execute(
+            TraceDatabase.SELECT_RECORDS + condition,
+            params
+        )
+        return [TraceRecord(*row) for row in cursor]
+
+
+    def _to_bytes(self) -> bytes:
+        """
+        Gets the contents of the database file.
+        @returns The contents of the database file.
+        """
+        if hasattr(self._connection, "serialize"):
+            return self._connection.serialize()
+
+        # Python versions before 3.11 can't serialize databases directly, so
+        #   the database must be copied to a file first
+        with tempfile.TemporaryDirectory() as temp_dir: # pragma: no cover
+            temp_path = Path(temp_dir) / TraceDatabase.FILE_NAME
+            temp_connection = sqlite3.connect(temp_path)
+            self._connection.backup(temp_connection)
+            temp_connection.close()
+            return temp_path.read_bytes()
@@ -0,0 +1,30 @@
+from typing import NamedTuple, Optional
+
+class TraceRecord(NamedTuple):
+    """
+    Stores a single traced value read from a trace database.
+    """
+    ## Kind of object that the value belongs to.
+    # This will be either "target" or "preset".
+    object_kind: str
+
+    ## Name of the target or preset that the value belongs to.
+    object_name: str
+
+    ## Name of the property that the value was added to.
+    property_name: str
+
+    ## Scope that the value was added with.
+    # If this is None, the property is not a scoped property.
+    scope: Optional[str]
+
+    ## Value that was added.
+    value: str
+
+    ## Path of the file that added the value.
+    # If this is None, no origin was recorded for the value.
+    file: Optional[str]
+
+    ## Line number of the code that added the value.
+    # If this is None, no origin was recorded for the value.
+    line: Optional[int]
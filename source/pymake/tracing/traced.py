@@ -1,4 +1,5 @@
 from pymake.tracing.caller_info import CallerInfo
+from pymake.tracing.origin_context import OriginContext
 from typing import Dict, Generic, TypeVar
 
 T = TypeVar("T")
@@ -11,7 +12,7 @@ class ITraced:
         """
         Initializes the object.
         """
-        self._origin = CallerInfo.closest_external_frame()
+        self._origin = OriginContext.capture()
 
 
     @property
@@ -31,12 +32,13 @@ class Traced(Generic[T]):
         Initializes the object.
         @param value Value to wrap.
         @param call_site Call site where the value was provided from. If not
-          provided, the call site will be determined automatically by capturing
-          the first external frame.
+          provided, the origin of the active `OriginContext` will be used, or
+          the first external frame will be captured if no context is active.
+          If tracing is disabled, `OriginContext.UNTRACED_ORIGIN` will be used.
         """
         self._value = value
         self._origin = (call_site if call_site
-            else CallerInfo.closest_external_frame())
+            else OriginContext.capture_trace())
 
 
     def to_dict(self) -> Dict[str, object]:
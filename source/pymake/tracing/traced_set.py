@@ -1,7 +1,7 @@
 from __future__ import annotations
 from collections.abc import Iterator
 from pymake.tracing.traced import Traced
-from typing import Dict, Generic, Optional, TypeVar
+from typing import Callable, Dict, Generic, Optional, TypeVar
 
 T = TypeVar("T")
 
@@ -10,12 +10,15 @@ class TracedSet(Generic[T]):
     A set that automatically captures tracing information for added values.
     """
     def __init__(self,
-        values: Optional[Dict[T, Traced[T]]] = None):
+        values: Optional[Dict[T, Traced[T]]] = None,
+        on_change: Optional[Callable[[], None]] = None):
         """
         Initializes the set.
         @param values Dictionary of values to add to the set.
+        @param on_change Callback invoked whenever values are added to the set.
         """
         self._values = values if values else {}
+        self._on_change = on_change
 
 
     def __bool__(self) -> bool:
@@ -55,6 +58,22 @@ class TracedSet(Generic[T]):
         return len(self._values)
 
 
+    @property
+    def on_change(self) -> Optional[Callable[[], None]]:
+        """
+        Gets the callback invoked whenever values are added to the set.
+        """
+        return self._on_change
+
+
+    @on_change.setter
+    def on_change(self, value: Optional[Callable[[], None]]) -> None:
+        """
+        Sets the callback invoked whenever values are added to the set.
+        """
+        self._on_change = value
+
+
     def add(self, value: T) -> bool:
         """
         Adds a new value to the set.
@@ -65,12 +84,15 @@ class TracedSet(Generic[T]):
             return False
 
         self._values[value] = Traced(value)
+        if self._on_change:
+            self._on_change()
         return True
 
 
     def clone(self) -> TracedSet[T]:
         """
         Creates a clone of the set.
+        The clone does not share the set's change callback.
         @returns A clone of the set.
         """
         return TracedSet(self._values.copy())
@@ -83,3 +105,5 @@ class TracedSet(Generic[T]):
         """
         for value in other:
             self._values[value.value] = value
+        if other and self._on_change:
+            self._on_change()
@@ -0,0 +1,230 @@
+import hashlib
+from importlib import util
+import marshal
+import os
+from pathlib import Path
+import struct
+import time
+from types import CodeType
+from typing import Optional
+
+class BytecodeCache:
+    """
+    Caches the compiled code of PyMake build scripts between runs.
+    Build scripts are executed directly instead of being imported, so
+      Python's own bytecode cache is never used for them. This cache stores
+      each build script's code object along with the build script's
+      modification time and size. If neither has changed, later runs only need
+      to unmarshal the code object instead of compiling the build script.
+    """
+    # Name of the cache directory within the generated directory
+    DIR_NAME = "pymake_bytecode"
+
+    # Format of the header that precedes each cached code object
+    # The header stores the build script's modification time in nanoseconds,
+    #   the build script's size, the time taken to compile the build script in
+    #   nanoseconds, and the length of the build script's path.
+    _HEADER = struct.Struct("<qqqI")
+
+    def __init__(self, cache_dir: Path):
+        """
+        Initializes the cache.
+        @param cache_dir Directory to store cached code objects in. The
+          directory will be created when the first code object is stored.
+        """
+        self._cache_dir = cache_dir
+
+        # Whether the cache directory is known to exist
+        self._dir_exists = False
+
+        # Number of build scripts loaded from the cache
+        self._hits = 0
+
+        # Number of build scripts that had to be compiled
+        self._misses = 0
+
+        # Time that compiling the build scripts loaded from the cache took
+        #   when they were compiled, in nanoseconds
+        self._saved_ns = 0
+
+
+    @property
+    def hits(self) -> int:
+        """
+        Gets the number of build scripts loaded from the cache.
+        """
+        return self._hits
+
+
+    @property
+    def misses(self) -> int:
+        """
+        Gets the number of build scripts that had to be compiled.
+        """
+        return self._misses
+
+
+    @property
+    def saved_seconds(self) -> float:
+        """
+        Gets the compile time saved by loading build scripts from the cache.
+        """
+        return self._saved_ns / 1e9
+
+
+    def add_stats(self,
+        hits: int,
+        misses: int,
+        saved_seconds: float) -> None:
+        """
+        Adds the statistics of another cache to this cache's statistics.
+        This is used to account for build scripts loaded by worker processes.
+        @param hits Number of build scripts the other cache loaded.
+        @param misses Number of build scripts the other cache compiled.
+        @param saved_seconds Compile time the other cache saved.
+        """
+        self._hits += hits
+        self._misses += misses
+        self._saved_ns += round(saved_seconds * 1e9)
+
+
+    def get_cache_path(self, source_path: Path) -> Path:
+        """
+        Gets the path of the cache file for a build script.
+        @param source_path Absolute path to the build script.
+        @returns The path of the cache file.
+        """
+        digest = hashlib.sha1(str(source_path).encode("utf-8")).hexdigest()
+        return self._cache_dir / f"{digest}.pymakec"
+
+
+    def load_code(self, source_path: Path) -> CodeType:
+        """
+        Gets the compiled code of a build script.
+        The build script is only compiled if the cache does not contain an up
+          to date code object for it.
+        @param source_path Absolute path to the build script.
+        @returns The compiled code of the build script.
+        @throws OSError Thrown if the build script can't be read.
+        @throws SyntaxError Thrown if the build script is not valid Python.
+        """
+        stat = os.stat(source_path)
+        cache_path = self.get_cache_path(source_path)
+        code = self._read_cache_file(
+            cache_path,
+            source_path,
+            stat.st_mtime_ns,
+            stat.st_size
+        )
+        if code is not None:
+            self._hits += 1
+            return code
+
+        with open(source_path, "rb") as f:
+            source = f.read()
+        start = time.perf_counter_ns()
+        code = compile(source, str(source_path), "exec", dont_inherit=True)
+        compile_ns = time.perf_counter_ns() - start
+        self._misses += 1
+
+        self._write_cache_file(
+            cache_path,
+            source_path,
+            stat.st_mtime_ns,
+            stat.st_size,
+            compile_ns,
+            code
+        )
+        return code
+
+
+    def _read_cache_file(self,
+        cache_path: Path,
+        source_path: Path,
+        mtime_ns: int,
+        size: int) -> Optional[CodeType]:
+        """
+        Reads a code object from a cache file.
+        @param cache_path Path to the cache file.
+        @param source_path Absolute path to the build script.
+        @param mtime_ns Current modification time of the build script.
+        @param size Current size of the build script.
+        @returns The cached code object, or None if the cache file does not
+          exist, is out of date, or is invalid.
+        """
+        try:
+            with open(cache_path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        # The cache file must have been written by the same Python version
+        magic = util.MAGIC_NUMBER
+        header_end = len(magic) + BytecodeCache._HEADER.size
+        if len(data) < header_end or not data.startswith(magic):
+            return None
+        cached_mtime, cached_size, compile_ns, path_len = \
+            BytecodeCache._HEADER.unpack_from(data, len(magic))
+        if cached_mtime != mtime_ns or cached_size != size:
+            return None
+
+        # Make sure the cache file belongs to the build script in case two
+        #   paths have the same hash
+        path_end = header_end + path_len
+        if data[header_end:path_end] != str(source_path).encode("utf-8"):
+            return None
+
+        try:
+            code = marshal.loads(data[path_end:])
+        except (EOFError, TypeError, ValueError):
+            return None
+        if not isinstance(code, CodeType):
+            return None
+        self._saved_ns += compile_ns
+        return code
+
+
+    def _write_cache_file(self,
+        cache_path: Path,
+        source_path: Path,
+        mtime_ns: int,
+        size: int,
+        compile_ns: int,
+        code: CodeType) -> None:
+        """
+        Writes a code object to a cache file.
+        Failing to write the cache file is not an error since the build script
+          can always be compiled again.
+        @param cache_path Path to the cache file.
+        @param source_path Absolute path to the build script.
+        @param mtime_ns Modification time of the build script.
+        @param size Size of the build script.
+        @param compile_ns Time taken to compile the build script.
+        @param code Compiled code of the build script.
+        """
+        encoded_path = str(source_path).encode("utf-8")
+        data = util.MAGIC_NUMBER + \
+            BytecodeCache._HEADER.pack(
+                mtime_ns,
+                size,
+                compile_ns,
+                len(encoded_path)
+            ) + \
+            encoded_path + \
+            marshal.dumps(code)
+
+        # Write to a temporary file first so that other processes never see a
+        #   partially written cache file
+        temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}")
+        try:
+            if not self._dir_exists:
+                self._cache_dir.mkdir(parents=True, exist_ok=True)
+                self._dir_exists = True
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, cache_path)
+        except OSError:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
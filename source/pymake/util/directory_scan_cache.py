@@ -0,0 +1,231 @@
+from __future__ import annotations
+import json
+import os
+from pathlib import Path
+from pymake.util.file_writer import FileWriter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+class DirectoryScanCache:
+    """
+    Caches the contents of directories between PyMake runs.
+    A directory's modification time changes whenever an entry is added to,
+      removed from, or renamed within the directory. Each directory's listing
+      is stored along with the modification time it was listed at, so
+      directories that haven't changed only need to be stat'ed instead of
+      listed.
+    """
+    # Name of the cache file within the generated directory
+    FILE_NAME = "pymake_scan_cache.json"
+
+    # Version of the cache file format
+    # This must be incremented whenever the format of the file changes.
+    FORMAT_VERSION = 2
+
+    # Name of the file that marks a directory as a CMake build directory
+    # Build directories contain source files that CMake generates, such as the
+    #   files it compiles to identify the compiler, so they're never scanned.
+    CMAKE_CACHE_FILE_NAME = "CMakeCache.txt"
+
+    def __init__(self,
+        entries: Optional[
+            Dict[str, Tuple[int, List[str], List[str]]]] = None,
+        prev_ignored_dirs: Optional[Iterable[str]] = None):
+        """
+        Initializes the cache.
+        @param entries Cached listings, indexed by directory path. Each entry
+          stores the directory's modification time in nanoseconds, the names
+          of the files in the directory, and the names of the subdirectories
+          in the directory.
+        @param prev_ignored_dirs Directories that were ignored by the previous
+          run. Recursive scans don't descend into these directories either,
+          since directories such as preset build directories may only be
+          ignored after the scans have run.
+        """
+        self._entries = entries if entries is not None else {}
+
+        # Directories ignored by the previous run
+        self._prev_ignored_dirs: Set[str] = set(prev_ignored_dirs) \
+            if prev_ignored_dirs is not None else set()
+
+        # Modification time of every directory listed during this run, indexed
+        #   by directory path
+        self._scanned_dirs: Dict[str, int] = {}
+
+        # Whether any entry has changed since the cache was loaded
+        self._is_dirty = False
+
+        # Directories that recursive scans must not descend into
+        self._ignored_dirs: Set[str] = set()
+
+
+    @property
+    def scanned_directories(self) -> Dict[str, int]:
+        """
+        Gets the modification time of every directory listed during this run,
+          indexed by directory path.
+        If any of these directories change, the results of the scans may
+          change.
+        """
+        return self._scanned_dirs
+
+
+    @staticmethod
+    def load(cache_path: str | Path) -> DirectoryScanCache:
+        """
+        Loads a cache written by a previous run.
+        @param cache_path Path to the cache file.
+        @returns The loaded cache, or an empty cache if the file does not exist
+          or could not be read.
+        """
+        try:
+            with open(cache_path, "r") as f:
+                data = json.load(f)
+            if data.get("version") != DirectoryScanCache.FORMAT_VERSION:
+                return DirectoryScanCache()
+            return DirectoryScanCache(
+                {
+                    str(k): (int(v[0]), list(v[1]), list(v[2]))
+                    for k, v in data["directories"].items()
+                },
+                [str(d) for d in data["ignored_directories"]]
+            )
+        except (AttributeError, KeyError, OSError, TypeError, ValueError):
+            return DirectoryScanCache()
+
+
+    def get_scans(self) -> Dict[str, Tuple[int, List[str], List[str]]]:
+        """
+        Gets the listing of every directory listed during this run.
+        @returns The listings, indexed by directory path. Each listing stores
+          the directory's modification time in nanoseconds, the names of the
+          files in the directory, and the names of the subdirectories in the
+          directory.
+        """
+        return {
+            k: self._entries[k]
+            for k in self._scanned_dirs
+            if k in self._entries
+        }
+
+
+    def ignore_directory(self, dir_path: str | Path) -> None:
+        """
+        Prevents recursive scans from descending into a directory.
+        This should be used for directories that PyMake or CMake write to,
+          since writing to them would invalidate the scans on every run.
+          Ignored directories are recorded in the cache file so that the next
+          run ignores them even if they're scanned before being ignored.
+        @param dir_path Absolute path to the directory.
+        """
+        self._ignored_dirs.add(os.path.normpath(dir_path))
+
+
+    def list_dir(self, dir_path: str) -> Tuple[List[str], List[str]]:
+        """
+        Lists the contents of a directory.
+        Symlinks to directories are listed as files so that recursive scans
+          can't loop.
+        @param dir_path Absolute path to the directory.
+        @returns The names of the files and the names of the subdirectories in
+          the directory, each in sorted order. Both lists will be empty if the
+          directory does not exist.
+        """
+        try:
+            mtime = os.stat(dir_path).st_mtime_ns
+        except OSError:
+            return [], []
+        self._scanned_dirs[dir_path] = mtime
+
+        entry = self._entries.get(dir_path)
+        if entry is not None and entry[0] == mtime:
+            return entry[1], entry[2]
+
+        files: List[str] = []
+        dirs: List[str] = []
+        try:
+            with os.scandir(dir_path) as it:
+                for e in it:
+                    if e.is_dir(follow_symlinks=False):
+                        dirs.append(e.name)
+                    else:
+                        files.append(e.name)
+        except OSError:
+            pass
+        files.sort()
+        dirs.sort()
+        self._entries[dir_path] = (mtime, files, dirs)
+        self._is_dirty = True
+        return files, dirs
+
+
+    def merge_scans(self,
+        scans: Dict[str, Tuple[int, List[str], List[str]]]) -> None:
+        """
+        Records directories that were listed by another cache.
+        This is used to combine the scans of worker processes that evaluated
+          build scripts with the scans of the main process.
+        @param scans Listings returned by the other cache's `get_scans()`.
+        """
+        for dir_path, entry in scans.items():
+            self._scanned_dirs[dir_path] = entry[0]
+            if self._entries.get(dir_path) != entry:
+                self._entries[dir_path] = entry
+                self._is_dirty = True
+
+
+    def walk(self, root: str, recursive: bool = True) -> List[str]:
+        """
+        Gets the paths of all files in a directory.
+        Hidden subdirectories, whose names start with a period, ignored
+          directories, and CMake build directories are not scanned.
+        @param root Absolute path to the directory to scan.
+        @param recursive Whether files in subdirectories should be included.
+        @returns The absolute paths of the files, in sorted order.
+        """
+        paths: List[str] = []
+        dirs = [root]
+        while dirs:
+            dir_path = dirs.pop()
+            files, subdirs = self.list_dir(dir_path)
+
+            # CMake writes to build directories on every build, so they're
+            #   not recorded as scanned either
+            if dir_path != root and \
+                DirectoryScanCache.CMAKE_CACHE_FILE_NAME in files:
+                del self._scanned_dirs[dir_path]
+                continue
+            paths.extend(os.path.join(dir_path, f) for f in files)
+            if not recursive:
+                continue
+            for d in subdirs:
+                subdir_path = os.path.join(dir_path, d)
+                if not d.startswith(".") and \
+                    subdir_path not in self._ignored_dirs and \
+                    subdir_path not in self._prev_ignored_dirs:
+                    dirs.append(subdir_path)
+        paths.sort()
+        return paths
+
+
+    def write_file(self, cache_path: str | Path) -> bool:
+        """
+        Writes the cache to a file if it has changed.
+        Only directories listed during this run are written so that the cache
+          doesn't grow without bound.
+        @param cache_path Path to write the cache to.
+        @returns True if the file was written, or False if the file was
+          unchanged.
+        """
+        if not self._is_dirty and \
+            len(self._scanned_dirs) == len(self._entries) and \
+            self._ignored_dirs == self._prev_ignored_dirs:
+            return False
+        return FileWriter.write_if_changed(cache_path, json.dumps({
+            "version": DirectoryScanCache.FORMAT_VERSION,
+            "directories": {
+                k: self._entries[k]
+                for k in sorted(self._scanned_dirs)
+                if k in self._entries
+            },
+            "ignored_directories": sorted(self._ignored_dirs)
+        }))
@@ -0,0 +1,73 @@
+import hashlib
+import os
+from pathlib import Path
+
+class FileWriter:
+    """
+    Helper class used to write generated files.
+    Files are only written if their contents would change. Skipping unchanged
+      files preserves their modification times, which prevents CMake from
+      rerunning its configure step when the generated files are identical.
+    """
+
+    @staticmethod
+    def is_unchanged(output_path: str | Path, data: bytes) -> bool:
+        """
+        Checks whether a file already contains the specified data.
+        The file's size is compared first so that files whose size differs
+          don't need to be read.
+        @param output_path Path to the file to check.
+        @param data Data to compare the file's contents against.
+        @returns True if the file exists and contains exactly `data`.
+        """
+        try:
+            if os.stat(output_path).st_size != len(data):
+                return False
+            with open(output_path, "rb") as f:
+                existing_digest = hashlib.sha256(f.read()).digest()
+        except OSError:
+            return False
+        return existing_digest == hashlib.sha256(data).digest()
+
+
+    @staticmethod
+    def write_if_changed(output_path: str | Path, contents: str) -> bool:
+        """
+        Writes text to a file if the file's contents would change.
+        Any missing parent directories will be created.
+        @param output_path Path to write the file to.
+        @param contents Text to write to the file. Newlines will be converted to
+          the platform's line separator.
+        @returns True if the file was written, or False if the file already
+          contained the text.
+        """
+        if os.linesep != "\n":
+            # Code coverage is recorded on Linux; ignore non-Linux branches
+            contents = contents.replace("\n", os.linesep) # pragma: no cover
+        return FileWriter.write_bytes_if_changed(
+            output_path,
+            contents.encode("utf-8")
+        )
+
+
+    @staticmethod
+    def write_bytes_if_changed(output_path: str | Path, data: bytes) -> bool:
+        """
+        Writes binary data to a file if the file's contents would change.
+        Any missing parent directories will be created.
+        @param output_path Path to write the file to.
+        @param data Data to write to the file.
+        @returns True if the file was written, or False if the file already
+          contained the data.
+        """
+        if FileWriter.is_unchanged(output_path, data):
+            return False
+
+        # Create the path to the output file if it doesn't exist
+        output_dir = Path(output_path).parent
+        if not output_dir.exists():
+            output_dir.mkdir(parents=True, exist_ok=True)
+
+        with open(output_path, "wb") as f:
+            f.write(data)
+        return True
@@ -0,0 +1,122 @@
+import os
+import re
+from typing import List
+
+class GlobPattern:
+    """
+    Matches file paths against a glob pattern.
+    Patterns support `*` and `?`, which never match a path separator,
+      character classes such as `[abc]`, and `**`, which matches any number of
+      directories.
+    """
+    # Characters that make a path component a wildcard component
+    _WILDCARD_CHARS = "*?["
+
+    def __init__(self, pattern: str):
+        """
+        Initializes the pattern.
+        @param pattern Absolute glob pattern. Either path separator may be
+          used.
+        """
+        components = pattern.replace("\\", "/").split("/") \
+            if os.sep == "\\" else pattern.split("/")
+
+        # Split the pattern into the directory that must be scanned and the
+        #   part of the pattern that must be matched within that directory
+        base: List[str] = []
+        for i, component in enumerate(components):
+            if any(c in component for c in GlobPattern._WILDCARD_CHARS):
+                break
+            base.append(component)
+        else:
+            # The pattern has no wildcards, so it can only match its parent
+            #   directory's file with the same name
+            i = len(components) - 1
+            base = components[:-1]
+        remainder = components[i:]
+
+        self._pattern = pattern
+        self._base_dir = os.path.normpath("/".join(base) or "/")
+        self._is_recursive = len(remainder) > 1
+        self._regex = re.compile(GlobPattern._translate(remainder))
+
+
+    def __str__(self) -> str:
+        """
+        Gets the pattern string.
+        """
+        return self._pattern
+
+
+    @property
+    def base_dir(self) -> str:
+        """
+        Gets the deepest directory that contains every matching path.
+        """
+        return self._base_dir
+
+
+    @property
+    def is_recursive(self) -> bool:
+        """
+        Gets whether the pattern can match files in subdirectories of the base
+          directory.
+        """
+        return self._is_recursive
+
+
+    def matches(self, path: str) -> bool:
+        """
+        Checks whether a path matches the pattern.
+        @param path Absolute path to check.
+        @returns True if the path is within the base directory and the rest of
+          the path matches the pattern.
+        """
+        rel_path = os.path.relpath(path, self._base_dir)
+        if rel_path.startswith(".."):
+            return False
+        if os.sep != "/":
+            # Code coverage is recorded on Linux; ignore non-Linux branches
+            rel_path = rel_path.replace(os.sep, "/") # pragma: no cover
+        return self._regex.fullmatch(rel_path) is not None
+
+
+    @staticmethod
+    def _translate(components: List[str]) -> str:
+        """
+        Converts the components of a glob pattern into a regular expression.
+        @param components Components of the pattern relative to the base
+          directory.
+        @returns The regular expression.
+        """
+        parts: List[str] = []
+        for i, component in enumerate(components):
+            is_last = i == len(components) - 1
+            if component == "**":
+                # Match zero or more directories
+                parts.append(".*" if is_last else "(?:[^/]+/)*")
+                continue
+
+            j = 0
+            while j < len(component):
+                c = component[j]
+                if c == "*":
+                    parts.append("[^/]*")
+                elif c == "?":
+                    parts.append("[^/]")
+                elif c == "[":
+                    end = component.find("]", j + 1)
+                    if end < 0:
+                        parts.append(re.escape(c))
+                    else:
+                        char_class = component[j + 1:end]
+                        if char_class.startswith("!"):
+                            char_class = "^" + char_class[1:]
+                        parts.append(f"[{char_class}]")
+                        j = end
+                else:
+                    parts.append(re.escape(c))
+                j += 1
+            if not is_last:
+                parts.append("/")
+        return "".join(parts)
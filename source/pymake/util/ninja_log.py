@@ -0,0 +1,80 @@
+from pathlib import Path, PurePosixPath
+from pymake.util.platform_statics import PlatformStatics
+import re
+from typing import Dict, Iterable
+
+class NinjaLog:
+    """
+    Reads build times from the `.ninja_log` file written by Ninja.
+    """
+    # Pattern matching the object directory that CMake creates for a target
+    # Ninja logs always use forward slashes, even on Windows.
+    _TARGET_DIR_PATTERN = re.compile(r"(?:^|/)CMakeFiles/([^/]+)\.dir/")
+
+    @staticmethod
+    def load_target_times(
+        log_path: str | Path,
+        target_names: Iterable[str]) -> Dict[str, float]:
+        """
+        Gets the total time spent building each target.
+        Object files are attributed to the target whose object directory they
+          are in. Libraries and executables are attributed to the target with
+          the matching name. Outputs that can't be attributed to a target are
+          ignored.
+        @param log_path Path to the Ninja log file.
+        @param target_names Names of the targets to get build times for.
+        @returns The build time of each target in seconds, indexed by target
+          name. Targets without any recorded outputs will have a time of 0.
+        @throws OSError Thrown if the log file can't be read.
+        @throws ValueError Thrown if the file is not a Ninja log file.
+        """
+        times = {name: 0.0 for name in target_names}
+
+        # Map the file name of each target's binary to the target
+        binary_names: Dict[str, str] = {}
+        for name in times:
+            binary_names[PlatformStatics.get_static_lib_name(name)] = name
+            binary_names[PlatformStatics.get_shared_lib_name(name)] = name
+            binary_names[PlatformStatics.get_executable_name(name)] = name
+
+        for output, duration in NinjaLog.load_output_times(log_path).items():
+            match = NinjaLog._TARGET_DIR_PATTERN.search(output)
+            if match:
+                target_name = match.group(1)
+            else:
+                target_name = binary_names.get(PurePosixPath(output).name, "")
+            if target_name in times:
+                times[target_name] += duration
+        return times
+
+
+    @staticmethod
+    def load_output_times(log_path: str | Path) -> Dict[str, float]:
+        """
+        Gets the time taken to build each output recorded in a Ninja log file.
+        If an output was built multiple times, only the most recent build is
+          used.
+        @param log_path Path to the Ninja log file.
+        @returns The build time of each output in seconds, indexed by the path
+          of the output relative to the build directory.
+        @throws OSError Thrown if the log file can't be read.
+        @throws ValueError Thrown if the file is not a Ninja log file.
+        """
+        with open(log_path, "r", encoding="utf-8") as f:
+            header = f.readline()
+            if not header.startswith("# ninja log v"):
+                raise ValueError(
+                    f"Error: '{log_path}' is not a Ninja log file.")
+
+            times: Dict[str, float] = {}
+            for line in f:
+                fields = line.rstrip("\n").split("\t")
+                if len(fields) < 4:
+                    continue
+                try:
+                    start_ms = int(fields[0])
+                    end_ms = int(fields[1])
+                except ValueError:
+                    continue
+                times[fields[3]] = (end_ms - start_ms) / 1000.0
+        return times
@@ -0,0 +1,101 @@
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from pathlib import Path
+import sys
+from typing import Callable, List, Optional, Tuple
+
+class ParallelFileWriter:
+    """
+    Writes generated files using a pool of worker threads.
+    Files are queued with a callback that renders and writes the file. Once all
+      files are queued, the callbacks are run in parallel. Results are always
+      returned in the order the files were queued so that the output doesn't
+      depend on the order that the workers finish in.
+    """
+    def __init__(self, max_workers: Optional[int] = None):
+        """
+        Initializes the writer.
+        @param max_workers Maximum number of worker threads to use. If this is
+          None, the thread pool's default number of workers will be used. If
+          this is 1, files will be written on the calling thread.
+        @throws ValueError Thrown if `max_workers` is less than 1.
+        """
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("Error: The number of workers must be at least 1.")
+        self._max_workers = max_workers
+
+        # Files to write, in the order they were queued
+        # Each entry stores the path of the file and the callback used to
+        #   write the file. The callback returns whether the file was written.
+        self._jobs: List[Tuple[Path, Callable[[], bool]]] = []
+
+
+    def __len__(self) -> int:
+        """
+        Gets the number of files that are queued.
+        """
+        return len(self._jobs)
+
+
+    @property
+    def paths(self) -> List[Path]:
+        """
+        Gets the paths of all queued files, in the order they were queued.
+        """
+        return [path for path, _ in self._jobs]
+
+
+    def add(self, output_path: Path, write: Callable[[], bool]) -> None:
+        """
+        Queues a file to be written.
+        @param output_path Path of the file that will be written.
+        @param write Callback that renders and writes the file. Must return
+          True if the file was written or False if the file was unchanged.
+          The callback may be run on a worker thread.
+        """
+        self._jobs.append((output_path, write))
+
+
+    def write_all(self) -> List[bool]:
+        """
+        Writes all queued files.
+        If standard output is a terminal, a single progress line is updated as
+          files are written.
+        @returns Whether each file was written, in the order the files were
+          queued.
+        @throws Exception Rethrows the exception raised by the first queued
+          file whose callback failed.
+        """
+        total = len(self._jobs)
+        show_progress = sys.stdout.isatty()
+
+        # Writing the files on the calling thread avoids the overhead of the
+        #   thread pool
+        if self._max_workers == 1:
+            results: List[bool] = []
+            for _, write in self._jobs:
+                results.append(write())
+                if show_progress:
+                    self._print_progress(len(results), total)
+        else:
+            with ThreadPoolExecutor(self._max_workers) as executor:
+                futures: List[Future[bool]] = [
+                    executor.submit(write) for _, write in self._jobs
+                ]
+                for completed, _ in enumerate(as_completed(futures), 1):
+                    if show_progress:
+                        self._print_progress(completed, total)
+                results = [f.result() for f in futures]
+
+        if show_progress and total:
+            print()
+        return results
+
+
+    @staticmethod
+    def _print_progress(completed: int, total: int) -> None:
+        """
+        Updates the progress line.
+        @param completed Number of files that have been written.
+        @param total Total number of files being written.
+        """
+        print(f"\rWriting files... {completed}/{total}", end="", flush=True)
@@ -0,0 +1,133 @@
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+class PathResolver:
+    """
+    Converts paths passed to PyMake into absolute, symlink-free paths.
+    Resolving a path with `Path.resolve()` walks every component of the path,
+      which is repeated for every file in the same directory. This class
+      resolves each directory once and lists each directory's contents once,
+      so the cost of resolving paths is proportional to the number of unique
+      directories rather than the number of files.
+    """
+    def __init__(self):
+        """
+        Initializes the resolver.
+        """
+        # Resolved paths, indexed by the base directory and path string that
+        #   were passed to `resolve()`
+        self._resolved: Dict[Tuple[str, str], Path] = {}
+
+        # Resolved path of each directory, indexed by the unresolved path
+        self._real_dirs: Dict[str, str] = {}
+
+        # Contents of each resolved directory, indexed by the resolved path
+        # Each entry maps a file name to whether the file is a symlink. If the
+        #   directory could not be listed, the entry will be None.
+        self._entries: Dict[str, Optional[Dict[str, bool]]] = {}
+
+
+    def exists(self, path: Path) -> bool:
+        """
+        Checks whether a path returned by `resolve()` exists.
+        @param path Resolved path to check.
+        @returns True if the path exists.
+        """
+        entries = self._get_entries(str(path.parent))
+        if entries is not None and path.name in entries:
+            return True
+
+        # The name may still exist on case-insensitive file systems
+        return os.path.exists(path)
+
+
+    def find_missing(self, paths: Iterable[Path]) -> List[Path]:
+        """
+        Finds the paths returned by `resolve()` that don't exist.
+        @param paths Resolved paths to check.
+        @returns The paths that don't exist, in the order they were given.
+        """
+        return [p for p in paths if not self.exists(p)]
+
+
+    def resolve(self, base_dir: Path, path: str | Path) -> Path:
+        """
+        Resolves a path.
+        The result is identical to `(base_dir / path).resolve()`.
+        @param base_dir Directory that relative paths are relative to. Must be
+          an absolute path.
+        @param path Path to resolve.
+        @returns The absolute path with all symlinks resolved.
+        """
+        key = (str(base_dir), str(path))
+        resolved = self._resolved.get(key)
+        if resolved is None:
+            resolved = Path(self._resolve_uncached(os.path.join(*key)))
+            self._resolved[key] = resolved
+        return resolved
+
+
+    def _get_entries(self, real_dir: str) -> Optional[Dict[str, bool]]:
+        """
+        Gets the contents of a directory.
+        @param real_dir Resolved path of the directory.
+        @returns A dictionary mapping the name of each file in the directory to
+          whether the file is a symlink, or None if the directory could not be
+          listed.
+        """
+        if real_dir in self._entries:
+            return self._entries[real_dir]
+
+        entries: Optional[Dict[str, bool]] = None
+        try:
+            with os.scandir(real_dir) as it:
+                entries = {e.name: e.is_symlink() for e in it}
+        except OSError:
+            pass
+        self._entries[real_dir] = entries
+        return entries
+
+
+    def _get_real_dir(self, dir_path: str) -> str:
+        """
+        Resolves the path to a directory.
+        @param dir_path Absolute path to the directory.
+        @returns The resolved path.
+        """
+        real_dir = self._real_dirs.get(dir_path)
+        if real_dir is None:
+            real_dir = os.path.realpath(dir_path)
+            self._real_dirs[dir_path] = real_dir
+        return real_dir
+
+
+    def _resolve_uncached(self, path: str) -> str:
+        """
+        Resolves a path without using previously resolved paths.
+        @param path Absolute path to resolve.
+        @returns The resolved path.
+        """
+        if os.path.altsep:
+            # Code coverage is recorded on Linux; ignore non-Linux branches
+            path = path.replace(os.path.altsep, os.sep) # pragma: no cover
+        parent, name = os.path.split(path)
+
+        # Paths ending in a directory reference must be resolved as a whole
+        #   since the reference depends on the resolved path
+        if name in ("", ".", ".."):
+            return self._get_real_dir(path)
+
+        real_parent = self._get_real_dir(parent)
+        full_path = os.path.join(real_parent, name)
+
+        # Only symlinks require the file itself to be resolved
+        entries = self._get_entries(real_parent)
+        if entries is not None and entries.get(name, False):
+            return os.path.realpath(full_path)
+        if entries is None or name not in entries:
+            # If the name wasn't found, it may be a symlink on a
+            #   case-insensitive file system or the directory may be unlistable
+            if os.path.islink(full_path):
+                return os.path.realpath(full_path)
+        return full_path
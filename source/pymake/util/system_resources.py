@@ -0,0 +1,283 @@
+import math
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+class SystemResources:
+    """
+    Detects the CPU and memory resources available to the current process.
+    `os.cpu_count()` reports every CPU on the host even when the process runs
+      in a container whose cgroup only allows it to use a fraction of them.
+      This class also reads the CPU quota and memory limit of the process'
+      cgroup (v1 or v2) so that build job counts can be derived from the
+      resources the process can actually use.
+    """
+    # Memory that each compile job is expected to use, in bytes
+    COMPILE_JOB_MEMORY = 1 << 30
+
+    # Memory that each link job is expected to use, in bytes
+    LINK_JOB_MEMORY = 2 << 30
+
+    # cgroup v1 reports limits at or above this value when no limit is set
+    _V1_UNLIMITED = 1 << 60
+
+    def __init__(self,
+        cgroup_root: Path = Path("/sys/fs/cgroup"),
+        proc_root: Path = Path("/proc")):
+        """
+        Detects the available resources.
+        @param cgroup_root Directory that the cgroup hierarchies are mounted
+          in.
+        @param proc_root Directory that the proc filesystem is mounted in.
+        """
+        self._cgroup_root = cgroup_root
+        self._proc_root = proc_root
+
+        # Path of the process' cgroup within each hierarchy, indexed by
+        #   controller name
+        # The cgroup v2 hierarchy is stored under an empty controller name.
+        self._cgroup_paths = self._read_cgroup_paths()
+
+        self._cpu_count = self._detect_cpu_count()
+        self._memory_limit = self._detect_memory_limit()
+
+
+    @property
+    def cpu_count(self) -> int:
+        """
+        Gets the number of CPUs that the process can use.
+        """
+        return self._cpu_count
+
+
+    @property
+    def memory_limit(self) -> Optional[int]:
+        """
+        Gets the amount of memory that the process can use in bytes, or None if
+          it could not be determined.
+        """
+        return self._memory_limit
+
+
+    @property
+    def default_compile_jobs(self) -> int:
+        """
+        Gets the default number of parallel compile jobs.
+        One job is run per CPU unless the memory limit can't fit that many
+          jobs.
+        """
+        return SystemResources._fit_jobs(
+            self._cpu_count,
+            self._memory_limit,
+            SystemResources.COMPILE_JOB_MEMORY
+        )
+
+
+    @property
+    def default_link_jobs(self) -> int:
+        """
+        Gets the default number of parallel link jobs.
+        Linking uses much more memory than compiling, so fewer link jobs than
+          compile jobs will usually fit in the memory limit.
+        """
+        return SystemResources._fit_jobs(
+            self._cpu_count,
+            self._memory_limit,
+            SystemResources.LINK_JOB_MEMORY
+        )
+
+
+    @staticmethod
+    def _fit_jobs(
+        cpu_count: int,
+        memory_limit: Optional[int],
+        job_memory: int) -> int:
+        """
+        Gets the number of jobs that fit within the available resources.
+        @param cpu_count Number of CPUs that the process can use.
+        @param memory_limit Memory that the process can use, if known.
+        @param job_memory Memory that each job is expected to use.
+        @returns The number of jobs. Always at least 1.
+        """
+        jobs = cpu_count
+        if memory_limit is not None:
+            jobs = min(jobs, memory_limit // job_memory)
+        return max(1, jobs)
+
+
+    def _detect_cpu_count(self) -> int:
+        """
+        Detects the number of CPUs that the process can use.
+        @returns The smallest of the number of CPUs on the host, the number of
+          CPUs the process is allowed to run on, and the cgroup CPU quota.
+        """
+        cpu_count = os.cpu_count() or 1
+        if hasattr(os, "sched_getaffinity"):
+            cpu_count = min(cpu_count, len(os.sched_getaffinity(0)))
+
+        # cgroup v2 stores the quota and period in a single file
+        for quota_path in self._get_cgroup_files("", "cpu.max"):
+            values = SystemResources._read_values(quota_path)
+            if len(values) == 2 and values[0] != "max":
+                cpu_count = min(
+                    cpu_count,
+                    SystemResources._get_quota_cpus(values[0], values[1])
+                )
+
+        # cgroup v1 uses a quota of -1 when no quota is set
+        for quota_path in self._get_cgroup_files("cpu", "cpu.cfs_quota_us"):
+            quota = SystemResources._read_values(quota_path)
+            period = SystemResources._read_values(
+                quota_path.with_name("cpu.cfs_period_us"))
+            if len(quota) == 1 and len(period) == 1 and \
+                not quota[0].startswith("-"):
+                cpu_count = min(
+                    cpu_count,
+                    SystemResources._get_quota_cpus(quota[0], period[0])
+                )
+        return max(1, cpu_count)
+
+
+    def _detect_memory_limit(self) -> Optional[int]:
+        """
+        Detects the amount of memory that the process can use.
+        @returns The smaller of the host's physical memory and the cgroup
+          memory limit, or None if neither could be determined.
+        """
+        limits: List[int] = []
+        physical_memory = self._read_physical_memory()
+        if physical_memory is not None:
+            limits.append(physical_memory)
+
+        for limit_path in self._get_cgroup_files("", "memory.max"):
+            values = SystemResources._read_values(limit_path)
+            if len(values) == 1 and values[0].isdigit():
+                limits.append(int(values[0]))
+        for limit_path in self._get_cgroup_files(
+            "memory", "memory.limit_in_bytes"):
+            values = SystemResources._read_values(limit_path)
+            if len(values) == 1 and values[0].isdigit() and \
+                int(values[0]) < SystemResources._V1_UNLIMITED:
+                limits.append(int(values[0]))
+        return min(limits) if limits else None
+
+
+    def _get_cgroup_files(self, controller: str, file_name: str) -> List[Path]:
+        """
+        Gets the paths of a cgroup file for the process' cgroup and each of
+          its ancestors.
+        Limits set on an ancestor cgroup also apply to the process, so every
+          ancestor's file must be checked.
+        @param controller Name of the cgroup v1 controller that the file
+          belongs to, or an empty string for cgroup v2.
+        @param file_name Name of the file within each cgroup directory.
+        @returns The paths of the files that exist, starting with the process'
+          own cgroup.
+        """
+        if controller not in self._cgroup_paths:
+            return []
+        mount_dir, cgroup_path = self._cgroup_paths[controller]
+
+        # Containers usually mount their own cgroup at the root of the
+        #   hierarchy, so the path from the proc filesystem may not exist
+        cgroup_dir = mount_dir / cgroup_path.lstrip("/")
+        if not cgroup_dir.is_dir():
+            cgroup_dir = mount_dir
+
+        paths: List[Path] = []
+        while True:
+            file_path = cgroup_dir / file_name
+            if file_path.is_file():
+                paths.append(file_path)
+            if cgroup_dir == mount_dir or cgroup_dir.parent == cgroup_dir:
+                break
+            cgroup_dir = cgroup_dir.parent
+        return paths
+
+
+    @staticmethod
+    def _get_quota_cpus(quota: str, period: str) -> int:
+        """
+        Converts a cgroup CPU quota into a number of CPUs.
+        @param quota CPU time that the cgroup may use per period.
+        @param period Length of each period.
+        @returns The number of CPUs, rounded up. If the values are invalid, the
+          number of CPUs on the host is returned so that the quota is ignored.
+        """
+        try:
+            return max(1, math.ceil(int(quota) / int(period)))
+        except (ValueError, ZeroDivisionError):
+            return os.cpu_count() or 1
+
+
+    def _read_cgroup_paths(self) -> Dict[str, Tuple[Path, str]]:
+        """
+        Reads the process' cgroup membership from the proc filesystem.
+        @returns The mount directory of each hierarchy that the process belongs
+          to and the path of the process' cgroup within it, indexed by
+          controller name. The cgroup v2 hierarchy is indexed by an empty
+          controller name.
+        """
+        cgroup_paths: Dict[str, Tuple[Path, str]] = {}
+        try:
+            with open(self._proc_root / "self" / "cgroup", "r") as f:
+                lines = f.read().splitlines()
+        except OSError:
+            return cgroup_paths
+
+        for line in lines:
+            # Each line has the form `<id>:<controllers>:<path>`
+            parts = line.split(":", 2)
+            if len(parts) != 3:
+                continue
+            _, controllers, cgroup_path = parts
+            if not controllers:
+                # The unified hierarchy is mounted directly at the root on
+                #   cgroup v2 hosts, or in a subdirectory on hybrid hosts
+                mount_dir = self._cgroup_root
+                if (self._cgroup_root / "unified").is_dir():
+                    mount_dir = self._cgroup_root / "unified"
+                cgroup_paths[""] = (mount_dir, cgroup_path)
+                continue
+
+            # cgroup v1 hierarchies are mounted in a directory named after
+            #   their controllers, such as `cpu,cpuacct`
+            for controller in controllers.split(","):
+                for dir_name in (controllers, controller):
+                    mount_dir = self._cgroup_root / dir_name
+                    if mount_dir.is_dir():
+                        cgroup_paths[controller] = (mount_dir, cgroup_path)
+                        break
+        return cgroup_paths
+
+
+    def _read_physical_memory(self) -> Optional[int]:
+        """
+        Reads the amount of physical memory on the host.
+        @returns The amount of memory in bytes, or None if it could not be
+          determined.
+        """
+        try:
+            with open(self._proc_root / "meminfo", "r") as f:
+                for line in f:
+                    # The line has the form `MemTotal: <size> kB`
+                    if line.startswith("MemTotal:"):
+                        return int(line.split()[1]) * 1024
+        except (IndexError, OSError, ValueError):
+            pass
+        return None
+
+
+    @staticmethod
+    def _read_values(file_path: Path) -> List[str]:
+        """
+        Reads the whitespace-separated values in a cgroup file.
+        @param file_path Path to the file.
+        @returns The values in the file, or an empty list if the file could not
+          be read.
+        """
+        try:
+            with open(file_path, "r") as f:
+                return f.read().split()
+        except OSError:
+            return []
@@ -0,0 +1,88 @@
+from pathlib import Path
+from pymake.core.build_script_registry import BuildScriptRegistry
+from pymake.util.bytecode_cache import BytecodeCache
+import pytest
+import sys
+from types import ModuleType
+from typing import Any, Iterator, List
+
+@pytest.fixture
+def registry(
+    tmp_path: Any,
+    monkeypatch: Any) -> Iterator[BuildScriptRegistry]:
+    # Isolate the import system state modified by the registry
+    monkeypatch.setattr(sys, "meta_path", list(sys.meta_path))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    prev_modules = set(sys.modules)
+
+    # Build scripts record their execution in this module
+    log = ModuleType("registry_test_log")
+    log.runs = [] # type: ignore
+    sys.modules["registry_test_log"] = log
+
+    (tmp_path / "foo").mkdir()
+    (tmp_path / "foo" / "make.py").write_text(
+        "import registry_test_log\n" +
+        "registry_test_log.runs.append('foo')\n" +
+        "value = 42\n"
+    )
+    (tmp_path / "bar").mkdir()
+    (tmp_path / "bar" / "make.py").write_text(
+        "import registry_test_log\n" +
+        "from foo.make import value\n" +
+        "registry_test_log.runs.append('bar')\n"
+    )
+
+    registry = BuildScriptRegistry(
+        tmp_path,
+        BytecodeCache(tmp_path / BytecodeCache.DIR_NAME)
+    )
+    BuildScriptRegistry.install(registry)
+    yield registry
+
+    for name in set(sys.modules) - prev_modules:
+        del sys.modules[name]
+
+
+def get_runs() -> List[str]:
+    return sys.modules["registry_test_log"].runs # type: ignore
+
+
+def test_module_names(registry: BuildScriptRegistry, tmp_path: Any):
+    assert registry.get_module_name(tmp_path / "make.py") == "make"
+    assert registry.get_module_name(tmp_path / "foo" / "make.py") == \
+        "foo.make"
+    assert registry.get_module_name(tmp_path / "my-lib" / "make.py") \
+        .startswith("_pymake_make_")
+    assert registry.get_module_name(Path("/elsewhere/make.py")) \
+        .startswith("_pymake_make_")
+
+
+def test_load_executes_once(registry: BuildScriptRegistry, tmp_path: Any):
+    assert registry.load(tmp_path / "foo" / "make.py")
+    assert not registry.load(tmp_path / "foo" / "make.py")
+    assert get_runs() == ["foo"]
+    assert sys.modules["foo.make"].value == 42
+
+
+def test_import_then_load(registry: BuildScriptRegistry, tmp_path: Any):
+    # Loading bar imports foo, so loading foo afterwards must not execute it
+    assert registry.load(tmp_path / "bar" / "make.py")
+    assert not registry.load(tmp_path / "foo" / "make.py")
+    assert get_runs() == ["foo", "bar"]
+
+
+def test_load_then_import(registry: BuildScriptRegistry, tmp_path: Any):
+    registry.load(tmp_path / "foo" / "make.py")
+    import foo.make # type: ignore
+    assert foo.make.value == 42
+    assert get_runs() == ["foo"]
+
+
+def test_failed_script_not_registered(
+    registry: BuildScriptRegistry,
+    tmp_path: Any):
+    (tmp_path / "foo" / "make.py").write_text("raise RuntimeError()\n")
+    with pytest.raises(RuntimeError):
+        registry.load(tmp_path / "foo" / "make.py")
+    assert "foo.make" not in sys.modules
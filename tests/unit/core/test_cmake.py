@@ -0,0 +1,55 @@
+from pymake.core.cmake import ICMake
+import pytest
+from types import SimpleNamespace
+from typing import Any
+
+def get_generation_args(*args: str):
+    return ICMake._get_generation_args(ICMake._parse_args(args))
+
+
+def test_build_only_args_ignored_by_generation():
+    assert get_generation_args() == get_generation_args(
+        "debug", "release", "-j", "4", "--link-jobs", "2", "--reconfigure",
+        "--concurrent-presets", "--eval-jobs", "3", "--emit-jobs", "2",
+        "--regenerate", "--verbose")
+
+
+def test_generation_args_recorded():
+    default_args = get_generation_args()
+    for args in (["--no-trace"], ["--coalesce"], ["--trace-format", "yaml"],
+        ["--lazy"], ["--lazy", "--target", "foo"]):
+        assert get_generation_args(*args) != default_args
+
+
+def test_presets_recorded_in_lazy_mode():
+    assert get_generation_args("--lazy", "debug") != \
+        get_generation_args("--lazy", "release")
+    assert get_generation_args("--lazy", "--target", "foo", "debug") == \
+        get_generation_args("--lazy", "--target", "foo", "release")
+
+
+def test_unknown_args_recorded():
+    assert get_generation_args("--cmake-version=3.14") != get_generation_args()
+    assert "--cmake-version=3.14" in \
+        ICMake._parse_args(["debug", "--cmake-version=3.14"]).unknown_args
+
+
+def test_build_args_warn_about_init_options(capsys: Any):
+    cmake = SimpleNamespace(_cli_args=ICMake._parse_args(["--lazy", "debug"]))
+    ICMake._warn_ignored_args(cmake, # type: ignore
+        ICMake._parse_args(["--lazy", "debug", "-j", "2"]))
+    assert capsys.readouterr().err == ""
+
+    ICMake._warn_ignored_args(cmake, # type: ignore
+        ICMake._parse_args(["--no-trace", "--target", "foo", "release"]))
+    err = capsys.readouterr().err
+    assert err.startswith("Warning:")
+    assert "--no-trace, --lazy, --target, presets." in err
+
+
+def test_init_args_never_exit():
+    assert "-h" in ICMake._parse_init_args(["-h", "debug"]).unknown_args
+    assert ICMake._parse_init_args(["--lazy", "--jobs", "x"]).jobs is None
+    assert not ICMake._parse_init_args(["--lazy", "--jobs", "x"]).lazy
+    with pytest.raises(SystemExit):
+        ICMake._parse_args(["--jobs", "x"])
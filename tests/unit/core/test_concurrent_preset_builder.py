@@ -0,0 +1,107 @@
+from pathlib import Path
+from pymake.core.cmake_invocation import CMakeInvocation
+from pymake.core.concurrent_preset_builder import ConcurrentPresetBuilder
+from pymake.core.configure_stamp import ConfigureStamp
+from pymake.core.preset import Preset
+import sys
+from typing import Any, List, Optional
+
+def python_cmd(code: str) -> List[str]:
+    return [sys.executable, "-c", code]
+
+
+def create_invocation(
+    name: str,
+    configure_code: str,
+    build_code: str,
+    binary_dir: Optional[Path] = None) -> CMakeInvocation:
+    return CMakeInvocation(
+        Preset(name),
+        python_cmd(configure_code),
+        python_cmd(build_code),
+        binary_dir,
+        None,
+        None
+    )
+
+
+def test_output_prefixed_with_preset_name(tmp_path: Any, capsys: Any):
+    builder = ConcurrentPresetBuilder()
+    builder.add_pipeline("debug", create_invocation("debug",
+        "print('configured')",
+        "import sys; print('line 1'); print('line 2', file=sys.stderr); " +
+            "print('no newline', end='')"), True, None)
+    builder.add_pipeline("release", create_invocation("release",
+        "print('configured')", "print('built')"), True, None)
+    assert builder.run() == 0
+
+    lines = capsys.readouterr().out.splitlines()
+    assert "[debug] configured" in lines
+    assert "[debug] line 1" in lines
+    assert "[debug] line 2" in lines
+    assert "[debug] no newline" in lines
+    assert "[release] configured" in lines
+    assert "[release] built" in lines
+    debug_lines = [l for l in lines if l.startswith("[debug]")]
+    assert debug_lines.index("[debug] line 1") < \
+        debug_lines.index("[debug] line 2")
+
+
+def test_summary_reports_each_preset(capsys: Any):
+    builder = ConcurrentPresetBuilder()
+    builder.add_pipeline("debug", create_invocation("debug",
+        "pass", "pass"), True, None)
+    builder.add_pipeline("asan", create_invocation("asan",
+        "pass", "raise SystemExit(3)"), True, None)
+    builder.add_pipeline("release", create_invocation("release",
+        "raise SystemExit(2)", "print('built')"), True, None)
+    assert builder.run() == 3
+
+    assert [r[1] for r in builder.results] == [0, 3, 2]
+    assert all(r[0] >= 0 for r in builder.results)
+    out = capsys.readouterr().out
+    assert "[release] built" not in out
+    summary = out[out.index("Preset summary:"):].splitlines()[1:]
+    assert summary[0].split()[0] == "debug"
+    assert summary[0].endswith("exit code 0")
+    assert summary[1].endswith("exit code 3")
+    assert summary[2].endswith("exit code 2")
+
+
+def test_configure_step_skipped(capsys: Any):
+    builder = ConcurrentPresetBuilder()
+    builder.add_pipeline("debug", create_invocation("debug",
+        "print('configured')", "print('built')"), False, None)
+    assert builder.run() == 0
+    out = capsys.readouterr().out
+    assert "[debug] configured" not in out
+    assert "[debug] Build directory is up to date; skipping configure." in out
+    assert "[debug] built" in out
+
+
+def test_stamp_written_after_configure(tmp_path: Any):
+    binary_dir = tmp_path / "build"
+    binary_dir.mkdir()
+    (binary_dir / ConfigureStamp.CMAKE_CACHE_FILE_NAME).touch()
+    invocation = create_invocation("debug", "pass", "pass", binary_dir)
+    stamp = ConfigureStamp.capture([], invocation.configure_cmd,
+        invocation.preset)
+
+    builder = ConcurrentPresetBuilder()
+    builder.add_pipeline("debug", invocation, True, stamp)
+    assert builder.run() == 0
+    assert stamp.is_up_to_date(binary_dir)
+
+
+def test_missing_executable(tmp_path: Any, capsys: Any):
+    builder = ConcurrentPresetBuilder()
+    builder.add_pipeline("debug", CMakeInvocation(
+        Preset("debug"),
+        [str(tmp_path / "missing")],
+        python_cmd("pass"),
+        None,
+        None,
+        None
+    ), True, None)
+    assert builder.run() == 1
+    assert "[debug] Error: Failed to run" in capsys.readouterr().out
@@ -0,0 +1,98 @@
+from pathlib import Path
+from pymake.core.configure_stamp import ConfigureStamp
+from pymake.core.preset import Preset
+from typing import Any, List
+
+CONFIGURE_CMD = ["cmake", "-S", "generated", "-B", "build"]
+
+def create_generated_files(tmp_path: Path) -> List[Path]:
+    generated_dir = tmp_path / "generated"
+    (generated_dir / "sub").mkdir(parents=True)
+    generated_files = [
+        generated_dir / "CMakeLists.txt",
+        generated_dir / "sub" / "CMakeLists.txt",
+        generated_dir / "foo.target.json"
+    ]
+    for file_path in generated_files:
+        file_path.write_text(file_path.name)
+    return generated_files
+
+
+def create_binary_dir(tmp_path: Path) -> Path:
+    binary_dir = tmp_path / "build"
+    binary_dir.mkdir()
+    (binary_dir / ConfigureStamp.CMAKE_CACHE_FILE_NAME).touch()
+    return binary_dir
+
+
+def test_stamp_matches_same_inputs(tmp_path: Any):
+    generated_files = create_generated_files(tmp_path)
+    binary_dir = create_binary_dir(tmp_path)
+    stamp = ConfigureStamp.capture(generated_files, CONFIGURE_CMD,
+        Preset("foo", cache_vars={"A": "1"}))
+    assert not stamp.is_up_to_date(binary_dir)
+
+    assert stamp.write_file(binary_dir)
+    assert ConfigureStamp.capture(generated_files, CONFIGURE_CMD,
+        Preset("foo", cache_vars={"A": "1"})).is_up_to_date(binary_dir)
+
+
+def test_stamp_ignores_files_not_read_by_cmake(tmp_path: Any):
+    generated_files = create_generated_files(tmp_path)
+    binary_dir = create_binary_dir(tmp_path)
+    ConfigureStamp.capture(generated_files, CONFIGURE_CMD, Preset("foo")) \
+        .write_file(binary_dir)
+
+    generated_files[2].write_text("changed")
+    assert ConfigureStamp.capture(generated_files, CONFIGURE_CMD,
+        Preset("foo")).is_up_to_date(binary_dir)
+
+    generated_files[1].write_text("changed")
+    assert not ConfigureStamp.capture(generated_files, CONFIGURE_CMD,
+        Preset("foo")).is_up_to_date(binary_dir)
+
+
+def test_stamp_changes_with_preset(tmp_path: Any):
+    generated_files = create_generated_files(tmp_path)
+    stamp = ConfigureStamp.capture(generated_files, CONFIGURE_CMD,
+        Preset("foo"))
+    for preset in (
+        Preset("foo", cmake_generator="Ninja"),
+        Preset("foo", binary_path="other"),
+        Preset("foo", install_path="install"),
+        Preset("foo", cache_vars={"A": "1"}),
+        Preset("foo", env_vars={"CC": "clang"})):
+        assert ConfigureStamp.capture(generated_files, CONFIGURE_CMD,
+            preset).digest != stamp.digest
+    assert ConfigureStamp.capture(generated_files, CONFIGURE_CMD + ["-DB=2"],
+        Preset("foo")).digest != stamp.digest
+
+
+def test_stamp_requires_cmake_cache(tmp_path: Any):
+    generated_files = create_generated_files(tmp_path)
+    binary_dir = create_binary_dir(tmp_path)
+    stamp = ConfigureStamp.capture(generated_files, CONFIGURE_CMD,
+        Preset("foo"))
+    stamp.write_file(binary_dir)
+    (binary_dir / ConfigureStamp.CMAKE_CACHE_FILE_NAME).unlink()
+    assert not stamp.is_up_to_date(binary_dir)
+
+
+def test_remove_stamp(tmp_path: Any):
+    generated_files = create_generated_files(tmp_path)
+    binary_dir = create_binary_dir(tmp_path)
+    stamp = ConfigureStamp.capture(generated_files, CONFIGURE_CMD,
+        Preset("foo"))
+    stamp.write_file(binary_dir)
+    ConfigureStamp.remove(binary_dir / ConfigureStamp.FILE_NAME)
+    ConfigureStamp.remove(binary_dir / ConfigureStamp.FILE_NAME)
+    assert not stamp.is_up_to_date(binary_dir)
+
+
+def test_load_invalid_stamp(tmp_path: Any):
+    stamp_path = tmp_path / ConfigureStamp.FILE_NAME
+    assert ConfigureStamp.load(stamp_path) is None
+    for contents in ("not json", "[]", '{"version": 0, "digest": "x"}',
+        '{"version": 1}'):
+        stamp_path.write_text(contents)
+        assert ConfigureStamp.load(stamp_path) is None
@@ -0,0 +1,102 @@
+from pathlib import Path
+from pymake.common.scope import EScope
+from pymake.common.target_weight import ETargetWeight
+from pymake.core.build_script_set import BuildScriptSet
+from pymake.core.critical_path_analysis import CriticalPathAnalysis
+from pymake.core.target_graph import TargetGraph
+from pymake.targets.static_library_target import StaticLibraryTarget
+from pymake.tracing.null_caller_info_formatter import NullCallerInfoFormatter
+import json
+import pytest
+from typing import Any, List, Tuple
+
+def create_graph(
+    target_names: List[str],
+    links: List[Tuple[str, str]]) -> TargetGraph:
+    build_scripts = BuildScriptSet(
+        Path("/source"),
+        Path("/generated"),
+        NullCallerInfoFormatter()
+    )
+    graph = TargetGraph()
+    targets = {}
+    for name in target_names:
+        target = StaticLibraryTarget(build_scripts, name)
+        graph.add_target(target)
+        target.on_target_linked = graph.add_link
+        targets[name] = target
+    for target_name, dependency_name in links:
+        targets[target_name].link_to_target(
+            targets[dependency_name],
+            EScope.PUBLIC
+        )
+    return graph
+
+
+def create_diamond_graph() -> TargetGraph:
+    return create_graph(
+        ["app", "left", "right", "base"],
+        [("app", "left"), ("app", "right"), ("left", "base"),
+            ("right", "base")]
+    )
+
+
+def test_unit_weights():
+    graph = create_diamond_graph()
+    analysis = CriticalPathAnalysis(
+        graph,
+        CriticalPathAnalysis.get_weights(graph, ETargetWeight.UNIT)
+    )
+    assert analysis.critical_path == ["app", "left", "base"]
+    assert analysis.critical_path_weight == 3
+    assert analysis.total_weight == 4
+    assert analysis.get_level_widths() == [1, 2, 1]
+    assert [l.dependency_name for l in analysis.critical_links] == \
+        ["left", "base"]
+
+    app = analysis.targets[-1]
+    assert app.target_name == "app"
+    assert app.fan_out == 2
+    assert app.fan_in == 0
+    assert app.level == 2
+
+
+def test_critical_path_follows_heaviest_chain():
+    graph = create_diamond_graph()
+    analysis = CriticalPathAnalysis(
+        graph,
+        {"app": 1, "left": 1, "right": 5, "base": 2}
+    )
+    assert analysis.critical_path == ["app", "right", "base"]
+    assert analysis.critical_path_weight == 8
+
+
+def test_build_time_weights_require_ninja_log():
+    graph = create_diamond_graph()
+    with pytest.raises(ValueError):
+        CriticalPathAnalysis.get_weights(graph, ETargetWeight.BUILD_TIME)
+
+
+def test_empty_graph():
+    analysis = CriticalPathAnalysis(TargetGraph(), {})
+    assert analysis.critical_path == []
+    assert analysis.critical_path_weight == 0
+    assert "Targets: 0" in analysis.format_report(NullCallerInfoFormatter())
+
+
+def test_report_and_export(tmp_path: Any):
+    graph = create_diamond_graph()
+    analysis = CriticalPathAnalysis(
+        graph,
+        CriticalPathAnalysis.get_weights(graph, ETargetWeight.UNIT)
+    )
+    report = analysis.format_report(NullCallerInfoFormatter())
+    assert "maximum speedup: 1.33x" in report
+    assert "links to 'left'" in report
+
+    output_path = tmp_path / CriticalPathAnalysis.FILE_NAME
+    assert analysis.write_file(output_path)
+    data = json.loads(output_path.read_text())
+    assert data["critical_path"] == ["app", "left", "base"]
+    assert data["critical_links"][0]["file"] == str(Path(__file__))
+    assert len(data["targets"]) == 4
@@ -0,0 +1,93 @@
+import os
+from pymake.core.generation_manifest import GenerationManifest
+from pymake.core.preset import Preset
+from typing import Any
+
+def create_manifest(tmp_path: Any) -> GenerationManifest:
+    script_path = tmp_path / "make.py"
+    script_path.write_text("print('foo')\n")
+    generated_path = tmp_path / "CMakeLists.txt"
+    generated_path.write_text("foo()\n")
+
+    return GenerationManifest.capture(
+        GenerationManifest.capture_inputs(["debug"]),
+        [script_path],
+        [generated_path],
+        presets={"debug": Preset("debug").generate_trace_dict()},
+        default_presets=["debug"]
+    )
+
+
+def test_manifest_up_to_date_after_capture(tmp_path: Any):
+    manifest = create_manifest(tmp_path)
+    assert manifest.is_up_to_date(GenerationManifest.capture_inputs(["debug"]))
+
+
+def test_manifest_round_trip(tmp_path: Any):
+    manifest = create_manifest(tmp_path)
+    manifest_path = tmp_path / GenerationManifest.FILE_NAME
+    assert manifest.write_file(manifest_path)
+
+    loaded = GenerationManifest.load(manifest_path)
+    assert loaded
+    assert loaded.inputs == manifest.inputs
+    assert loaded.build_scripts == manifest.build_scripts
+    assert loaded.generated_files == manifest.generated_files
+    assert loaded.presets == manifest.presets
+    assert loaded.default_presets == manifest.default_presets
+
+
+def test_load_missing_manifest(tmp_path: Any):
+    assert GenerationManifest.load(tmp_path / "missing.json") is None
+
+
+def test_load_invalid_manifest(tmp_path: Any):
+    manifest_path = tmp_path / GenerationManifest.FILE_NAME
+    manifest_path.write_text("{")
+    assert GenerationManifest.load(manifest_path) is None
+
+    manifest_path.write_text('{"version": 0}')
+    assert GenerationManifest.load(manifest_path) is None
+
+
+def test_changed_args_invalidate_manifest(tmp_path: Any):
+    manifest = create_manifest(tmp_path)
+    assert not manifest.is_up_to_date(
+        GenerationManifest.capture_inputs(["release"]))
+
+
+def test_changed_env_var_invalidates_manifest(tmp_path: Any, monkeypatch: Any):
+    manifest = create_manifest(tmp_path)
+    monkeypatch.setenv(GenerationManifest.ENV_VAR_PREFIX + "FOO", "1")
+    assert not manifest.is_up_to_date(
+        GenerationManifest.capture_inputs(["debug"]))
+
+
+def test_changed_build_script_invalidates_manifest(tmp_path: Any):
+    manifest = create_manifest(tmp_path)
+    (tmp_path / "make.py").write_text("print('bar')\n")
+    assert not manifest.is_up_to_date(
+        GenerationManifest.capture_inputs(["debug"]))
+
+
+def test_missing_generated_file_invalidates_manifest(tmp_path: Any):
+    manifest = create_manifest(tmp_path)
+    (tmp_path / "CMakeLists.txt").unlink()
+    assert not manifest.is_up_to_date(
+        GenerationManifest.capture_inputs(["debug"]))
+
+
+def test_changed_directory_invalidates_manifest(tmp_path: Any):
+    src_dir = tmp_path / "src"
+    src_dir.mkdir()
+    manifest = GenerationManifest.capture(
+        GenerationManifest.capture_inputs(["debug"]),
+        [],
+        [],
+        {str(src_dir): os.stat(src_dir).st_mtime_ns}
+    )
+    inputs = GenerationManifest.capture_inputs(["debug"])
+    assert manifest.is_up_to_date(inputs)
+
+    os.utime(src_dir, ns=(0, 0))
+    assert not manifest.is_up_to_date(inputs)
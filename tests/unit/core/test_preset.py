@@ -3,6 +3,7 @@ from pymake.common.cmake_build_type import ECMakeBuildType
 from pymake.common.cmake_generator import ECMakeGenerator
 from pymake.core.preset import Preset
 from pymake.generators.yaml_file_generator import YamlFileGenerator
+import pytest
 from typing import Any
 
 def test_preset_name_matches_ctor_arg():
@@ -534,3 +535,38 @@ def test_clear_env_variable_when_env_variable_not_set():
 
     # Check the value
     assert not preset.env_variables
+
+
+def test_job_counts_get_inherited():
+    base_preset = Preset("base", jobs=8, link_jobs=2)
+    derived_preset = Preset("derived", inherits=base_preset, link_jobs=4)
+    full_preset = derived_preset.as_full_preset()
+    assert full_preset.jobs == 8
+    assert full_preset.link_jobs == 4
+    assert derived_preset.as_build_preset(
+        Path("/source"), Path("/generated"))["jobs"] == 8
+    assert "jobs" not in Preset("foo").as_build_preset(
+        Path("/source"), Path("/generated"))
+
+
+def test_restore_preset_from_trace_dict():
+    base_preset = Preset("base", cmake_generator="Ninja", binary_path="_build",
+        cache_vars={"A": "1"}, jobs=4)
+    preset = Preset("debug", desc="Debug build", inherits=base_preset,
+        install_path="_out", env_vars={"CC": "clang"}, targets=["a", "b"],
+        link_jobs=2)
+    preset.cmake_build_type = ECMakeBuildType.Debug
+
+    restored = Preset.from_trace_dict("debug", preset.generate_trace_dict())
+    assert restored.preset_name == "debug"
+    assert not restored.base_presets
+    props = restored.generate_trace_dict()
+    props["inherits"] = ["base"]
+    assert props == preset.generate_trace_dict()
+
+
+def test_restore_preset_from_invalid_trace_dict():
+    with pytest.raises(TypeError):
+        Preset.from_trace_dict("foo", {"jobs": "4"})
+    with pytest.raises(TypeError):
+        Preset.from_trace_dict("foo", {"cacheVariables": []})
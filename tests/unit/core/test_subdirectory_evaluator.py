@@ -0,0 +1,339 @@
+from pathlib import Path
+from pymake.common.project_language import EProjectLanguage
+from pymake.core.build_script_registry import BuildScriptRegistry
+from pymake.core.build_script_set import BuildScriptSet
+from pymake.core.project import Project
+from pymake.core.subdirectory_evaluator import SubdirectoryEvaluator
+from pymake.core.target_graph import TargetGraph
+from pymake.targets.target import ITarget
+from pymake.tracing.shortened_caller_info_formatter \
+    import ShortenedCallerInfoFormatter
+from pymake.util.bytecode_cache import BytecodeCache
+import pytest
+import sys
+from types import ModuleType, SimpleNamespace
+from typing import Any, Dict, Iterator, List, Optional
+
+# Module that build scripts import to access the project
+ENV_MODULE_NAME = "evaluator_test_env"
+
+@pytest.fixture(autouse=True)
+def isolate_imports(tmp_path: Any, monkeypatch: Any) -> Iterator[None]:
+    # Isolate the import system state modified by the registry
+    monkeypatch.setattr(sys, "meta_path", list(sys.meta_path))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    prev_modules = set(sys.modules)
+    yield
+    for name in set(sys.modules) - prev_modules:
+        del sys.modules[name]
+
+
+def write_script(tmp_path: Path, subdirectory: str, code: str) -> Path:
+    script_path = tmp_path / subdirectory / "make.py"
+    script_path.parent.mkdir(exist_ok=True)
+    script_path.write_text(
+        f"from {ENV_MODULE_NAME} import core, project, runs\n" +
+        f"runs.append('{subdirectory}')\n" +
+        code
+    )
+    return script_path
+
+
+def create_evaluator(
+    tmp_path: Path,
+    max_workers: Optional[int],
+    lazy: bool = False) -> SubdirectoryEvaluator:
+    build_scripts = BuildScriptSet(
+        tmp_path,
+        tmp_path / "generated",
+        ShortenedCallerInfoFormatter(tmp_path)
+    )
+    graph = TargetGraph()
+    project = Project(build_scripts, "test", EProjectLanguage.Cpp)
+
+    def on_target_added(target: ITarget) -> Optional[ITarget]:
+        if target.target_name in graph:
+            return graph.get_target(target.target_name)
+        graph.add_target(target)
+        target.on_target_linked = graph.add_link
+        return None
+    project.on_target_added = on_target_added
+
+    env = ModuleType(ENV_MODULE_NAME)
+    env.project = project # type: ignore
+    env.core = project.add_static_library("core") # type: ignore
+    env.runs = [] # type: ignore
+    sys.modules[ENV_MODULE_NAME] = env
+
+    bytecode_cache = BytecodeCache(tmp_path / BytecodeCache.DIR_NAME)
+    registry = BuildScriptRegistry(tmp_path, bytecode_cache)
+    BuildScriptRegistry.install(registry)
+    evaluator = SubdirectoryEvaluator(
+        build_scripts,
+        {"test": project},
+        graph,
+        registry,
+        bytecode_cache,
+        build_scripts.get_or_add_build_script().generator.formatter,
+        lambda: None,
+        max_workers,
+        lazy
+    )
+
+    # Stand-in for `ICMake.add_subdirectory()`
+    def add_subdirectory(subdirectory: str) -> None:
+        caller_path = Path(sys._getframe(1).f_code.co_filename)
+        evaluator.submit(caller_path.parent / subdirectory / "make.py")
+    env.cmake = SimpleNamespace( # type: ignore
+        add_subdirectory=add_subdirectory)
+    return evaluator
+
+
+def get_runs() -> List[str]:
+    return sys.modules[ENV_MODULE_NAME].runs # type: ignore
+
+
+def get_outputs(evaluator: SubdirectoryEvaluator) -> Dict[Path, str]:
+    return {
+        b.target_path: b.generator.generate()
+        for b in evaluator._build_scripts
+    }
+
+
+def write_independent_scripts(tmp_path: Path) -> List[Path]:
+    script_paths = [
+        write_script(tmp_path, "a",
+            "a = project.add_static_library('a')\n" +
+            "a.add_sources('a.cpp')\n" +
+            "a.link_to_target(core)\n"),
+        write_script(tmp_path, "b",
+            "b = project.add_static_library('b')\n" +
+            "helper = project.add_static_library('b_helper')\n" +
+            "b.link_to_target(helper)\n" +
+            "helper.link_to_target(core)\n"),
+        write_script(tmp_path, "c",
+            "c = project.add_executable('c')\n" +
+            "c.add_sources('c.cpp')\n")
+    ]
+    (tmp_path / "a" / "a.cpp").touch()
+    (tmp_path / "c" / "c.cpp").touch()
+    return script_paths
+
+
+def test_serial_evaluation(tmp_path: Any):
+    evaluator = create_evaluator(tmp_path, None)
+    assert not evaluator.is_parallel
+    for script_path in write_independent_scripts(tmp_path):
+        evaluator.submit(script_path)
+    assert get_runs() == ["a", "b", "c"]
+    assert evaluator.evaluate_pending() == []
+
+
+def test_parallel_evaluation(tmp_path: Any):
+    evaluator = create_evaluator(tmp_path, 2)
+    assert evaluator.is_parallel
+    for script_path in write_independent_scripts(tmp_path):
+        evaluator.submit(script_path)
+    assert get_runs() == []
+
+    executed_files = evaluator.evaluate_pending()
+
+    # The build scripts were executed by workers rather than this process
+    assert get_runs() == []
+    assert tmp_path / "a" / "make.py" in executed_files
+    graph = evaluator._target_graph
+    assert [t.target_name for t in graph.targets] == \
+        ["core", "a", "b", "b_helper", "c"]
+    assert graph.get_dependencies("a") == ["core"]
+    assert graph.get_dependencies("b") == ["b_helper"]
+    assert graph.get_dependents("core") == ["a", "b_helper"]
+    assert graph.get_links("a")[0].origin.file_path == \
+        tmp_path / "a" / "make.py"
+
+    # Links to targets outside of the fragment refer to this process' targets
+    core = graph.get_target("core")
+    a = graph.get_target("a")
+    assert a.link_libraries.private[core].value is core
+    assert a in core._dependents
+    assert a.get_full_target().sources.private
+
+    output = get_outputs(evaluator)[tmp_path / "generated" / "a" /
+        "CMakeLists.txt"]
+    assert output.startswith("# a/make.py:3\nadd_library(\n\ta\n\tSTATIC")
+    assert "# a/make.py:5\ntarget_link_libraries(\n\ta\n\tPRIVATE\n" + \
+        "\t\tcore" in output
+
+
+def test_output_independent_of_worker_count(tmp_path: Any):
+    script_paths = write_independent_scripts(tmp_path)
+    outputs = []
+    for max_workers in (1, 3):
+        evaluator = create_evaluator(tmp_path, max_workers)
+        for script_path in script_paths:
+            evaluator.submit(script_path)
+        evaluator.evaluate_pending()
+        outputs.append(get_outputs(evaluator))
+    assert outputs[0] == outputs[1]
+
+
+def test_dependent_scripts_evaluated_serially(tmp_path: Any):
+    evaluator = create_evaluator(tmp_path, 2)
+    script_paths = write_independent_scripts(tmp_path)
+    script_paths.insert(0, write_script(tmp_path, "d",
+        "from a.make import a\n" +
+        "d = project.add_executable('d')\n" +
+        "d.link_to_target(a)\n"))
+    for script_path in script_paths:
+        evaluator.submit(script_path)
+    evaluator.evaluate_pending()
+
+    # `d` imports `a`, so neither can be evaluated by a worker
+    assert get_runs() == ["d", "a"]
+    graph = evaluator._target_graph
+    assert graph.get_dependencies("d") == ["a"]
+    assert "c" in graph
+
+
+def test_scripts_with_side_effects_evaluated_serially(tmp_path: Any):
+    evaluator = create_evaluator(tmp_path, 2)
+    script_paths = write_independent_scripts(tmp_path)
+    script_paths.append(write_script(tmp_path, "e",
+        "core.add_sources('core.cpp')\n"))
+    (tmp_path / "e" / "core.cpp").touch()
+    for script_path in script_paths:
+        evaluator.submit(script_path)
+    evaluator.evaluate_pending()
+
+    assert get_runs() == ["e"]
+    assert tmp_path / "e" / "core.cpp" in \
+        evaluator._target_graph.get_target("core").sources.private
+
+
+def test_failing_script_raises(tmp_path: Any):
+    evaluator = create_evaluator(tmp_path, 2)
+    evaluator.submit(write_script(tmp_path, "a",
+        "raise RuntimeError('a failed')\n"))
+    with pytest.raises(RuntimeError, match="a failed"):
+        evaluator.evaluate_pending()
+
+
+def test_duplicate_targets_rejected(tmp_path: Any):
+    evaluator = create_evaluator(tmp_path, 2)
+    evaluator.submit(write_script(tmp_path, "a",
+        "project.add_static_library('dup')\n"))
+    evaluator.submit(write_script(tmp_path, "b",
+        "project.add_static_library('dup')\n"))
+    with pytest.raises(ValueError, match="'dup' already exists"):
+        evaluator.evaluate_pending()
+
+
+def test_invalid_worker_count(tmp_path: Any):
+    with pytest.raises(ValueError):
+        create_evaluator(tmp_path, 0)
+
+
+def submit_lazy_scripts(tmp_path: Path, max_workers: Optional[int] = None) \
+    -> SubdirectoryEvaluator:
+    evaluator = create_evaluator(tmp_path, max_workers, lazy=True)
+    script_paths = write_independent_scripts(tmp_path)
+    script_paths.append(write_script(tmp_path, "d",
+        "from a.make import a\n" +
+        "d = project.add_executable('d')\n" +
+        "d.link_to_target(a)\n" +
+        f"from {ENV_MODULE_NAME} import cmake\n" +
+        "cmake.add_subdirectory('nested')\n"))
+    write_script(tmp_path, "d/nested",
+        "project.add_static_library('nested')\n")
+    for script_path in script_paths:
+        evaluator.submit(script_path)
+    assert get_runs() == []
+    return evaluator
+
+
+def test_lazy_evaluation(tmp_path: Any):
+    evaluator = submit_lazy_scripts(tmp_path)
+    evaluator.evaluate_pending(["c"])
+    assert get_runs() == ["c"]
+    assert evaluator.skipped_scripts == [
+        tmp_path / "a" / "make.py",
+        tmp_path / "b" / "make.py",
+        tmp_path / "d" / "make.py"
+    ]
+
+
+def test_lazy_evaluation_loads_imported_scripts(tmp_path: Any):
+    evaluator = submit_lazy_scripts(tmp_path, 2)
+    evaluator.evaluate_pending(["d", "core"])
+    assert get_runs() == ["d", "a", "d/nested"]
+    assert evaluator._target_graph.get_dependencies("d") == ["a"]
+    assert evaluator.skipped_scripts == [
+        tmp_path / "b" / "make.py",
+        tmp_path / "c" / "make.py"
+    ]
+
+
+def test_lazy_evaluation_of_nested_targets(tmp_path: Any):
+    # Targets defined by subdirectories of a queued build script are found by
+    #   parsing the subdirectories' build scripts
+    evaluator = submit_lazy_scripts(tmp_path)
+    evaluator.evaluate_pending(["nested"])
+    assert get_runs() == ["d", "a", "d/nested"]
+    assert "nested" in evaluator._target_graph
+
+
+def test_lazy_evaluation_of_all_targets(tmp_path: Any):
+    for targets in ([], ["install"]):
+        evaluator = submit_lazy_scripts(tmp_path)
+        evaluator.evaluate_pending(targets)
+        assert evaluator.skipped_scripts == []
+        sys.modules[ENV_MODULE_NAME].runs.clear() # type: ignore
+        for name in ("a.make", "b.make", "c.make", "d.make"):
+            sys.modules.pop(name, None)
+
+
+def test_lazy_evaluation_of_unknown_target(tmp_path: Any, capsys: Any):
+    evaluator = submit_lazy_scripts(tmp_path)
+    evaluator.evaluate_pending(["unknown"])
+    assert evaluator.skipped_scripts == []
+    assert "No subdirectory defines the target 'unknown'" in \
+        capsys.readouterr().err
+
+
+def test_lazy_evaluation_of_conditional_target(tmp_path: Any, capsys: Any):
+    evaluator = create_evaluator(tmp_path, None, lazy=True)
+    evaluator.submit(write_script(tmp_path, "a",
+        "if False:\n" +
+        "    project.add_static_library('x')\n"))
+    evaluator.submit(write_script(tmp_path, "b",
+        "project.add_static_library('x')\n"))
+    evaluator.evaluate_pending(["x"])
+    assert get_runs() == ["a", "b"]
+    assert "'x' was not defined" in capsys.readouterr().err
+
+
+def test_worker_output_written_in_merge_order(tmp_path: Any, capsys: Any):
+    evaluator = create_evaluator(tmp_path, 3)
+    for name in ("a", "b", "c"):
+        evaluator.submit(write_script(tmp_path, name,
+            "import sys\n" +
+            f"print('{name} out')\n" +
+            f"print('{name} err', file=sys.stderr)\n"))
+    evaluator.evaluate_pending()
+
+    captured = capsys.readouterr()
+    assert captured.out == "a out\nb out\nc out\n"
+    assert captured.err == "a err\nb err\nc err\n"
+
+
+def test_fallback_output_written_once(tmp_path: Any, capsys: Any):
+    evaluator = create_evaluator(tmp_path, 2)
+    evaluator.submit(write_script(tmp_path, "a", "print('a out')\n"))
+    evaluator.submit(write_script(tmp_path, "e",
+        "print('e out')\n" +
+        "core.add_sources('core.cpp')\n"))
+    (tmp_path / "e" / "core.cpp").touch()
+    evaluator.evaluate_pending()
+
+    # `e` modifies `core`, so it's executed again by this process
+    assert get_runs() == ["e"]
+    assert capsys.readouterr().out == "a out\ne out\n"
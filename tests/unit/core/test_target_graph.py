@@ -0,0 +1,129 @@
+from pathlib import Path
+from pymake.common.scope import EScope
+from pymake.core.build_script_set import BuildScriptSet
+from pymake.core.target_graph import TargetGraph
+from pymake.targets.static_library_target import StaticLibraryTarget
+from pymake.tracing.null_caller_info_formatter import NullCallerInfoFormatter
+from pymake.tracing.origin_context import OriginContext
+import pytest
+from typing import Dict, List, Tuple
+
+def create_graph(
+    target_names: List[str],
+    links: List[Tuple[str, str]]) \
+    -> Tuple[TargetGraph, Dict[str, StaticLibraryTarget]]:
+    build_scripts = BuildScriptSet(
+        Path("/source"),
+        Path("/generated"),
+        NullCallerInfoFormatter()
+    )
+    graph = TargetGraph()
+    targets: Dict[str, StaticLibraryTarget] = {}
+    for name in target_names:
+        target = StaticLibraryTarget(build_scripts, name)
+        graph.add_target(target)
+        target.on_target_linked = graph.add_link
+        targets[name] = target
+    for target_name, dependency_name in links:
+        targets[target_name].link_to_target(
+            targets[dependency_name],
+            EScope.PUBLIC
+        )
+    return graph, targets
+
+
+def test_links_recorded_in_both_directions():
+    graph, _ = create_graph(["a", "b", "c"], [("a", "b"), ("a", "c")])
+    assert graph.get_dependencies("a") == ["b", "c"]
+    assert graph.get_dependents("b") == ["a"]
+    assert graph.get_dependents("a") == []
+
+    links = graph.get_links("a")
+    assert [l.dependency_name for l in links] == ["b", "c"]
+    assert links[0].scope == EScope.PUBLIC
+    assert links[0].origin.file_path == Path(__file__)
+
+
+def test_duplicate_link_recorded_once():
+    graph, targets = create_graph(["a", "b"], [("a", "b")])
+    targets["a"].link_to_target(targets["b"], EScope.PRIVATE)
+    assert len(graph.links) == 1
+
+
+def test_topological_order():
+    graph, _ = create_graph(
+        ["app", "core", "util", "base"],
+        [("app", "core"), ("core", "util"), ("app", "base"), ("util", "base")]
+    )
+    order = graph.get_topological_order()
+    assert order == ["base", "util", "core", "app"]
+
+
+def test_cycle_rejected_with_origins():
+    graph, targets = create_graph(["a", "b", "c"], [("a", "b"), ("b", "c")])
+    with pytest.raises(ValueError) as e:
+        targets["c"].link_to_target(targets["a"], EScope.PUBLIC)
+
+    message = str(e.value)
+    assert "dependency cycle" in message
+    assert "'a' links to 'b'" in message
+    assert "'b' links to 'c'" in message
+    assert f"{Path(__file__)}:" in message
+
+    # The rejected link must not have been added to the target or graph
+    assert graph.get_dependencies("c") == []
+    assert not list(targets["c"].link_libraries.public)
+
+
+def test_cycle_origins_reported_without_tracing():
+    OriginContext.set_tracing_enabled(False)
+    try:
+        graph, targets = create_graph(["a", "b"], [("a", "b")])
+        with pytest.raises(ValueError) as e:
+            targets["b"].link_to_target(targets["a"], EScope.PUBLIC)
+    finally:
+        OriginContext.set_tracing_enabled(True)
+
+    assert f"{Path(__file__)}:" in str(e.value)
+    assert graph.get_links("a")[0].origin.file_path == Path(__file__)
+
+
+def test_self_link_rejected():
+    _, targets = create_graph(["a"], [])
+    with pytest.raises(ValueError):
+        targets["a"].link_to_target(targets["a"], EScope.PUBLIC)
+
+
+def test_transitive_queries():
+    graph, _ = create_graph(
+        ["a", "b", "c", "d"],
+        [("a", "b"), ("b", "c"), ("d", "c")]
+    )
+    assert graph.get_transitive_dependencies("a") == ["c", "b"]
+    assert graph.get_transitive_dependents("c") == ["b", "a", "d"]
+    assert graph.find_path("a", "c") is not None
+    assert graph.find_path("c", "a") is None
+
+
+def test_stats():
+    graph, _ = create_graph(
+        ["a", "b", "c", "d", "e"],
+        [("a", "b"), ("a", "c"), ("b", "d"), ("c", "d")]
+    )
+    stats = graph.get_stats()
+    assert stats.target_count == 5
+    assert stats.link_count == 4
+    assert stats.depth == 3
+    assert stats.width == 2
+    assert stats.root_count == 2
+    assert stats.leaf_count == 2
+
+
+def test_deep_chain_does_not_recurse():
+    names = [f"t{i}" for i in range(2000)]
+    graph, _ = create_graph(
+        names,
+        [(names[i], names[i + 1]) for i in range(len(names) - 1)]
+    )
+    assert graph.get_topological_order() == list(reversed(names))
+    assert graph.get_stats().depth == len(names)
@@ -0,0 +1,31 @@
+import gzip
+import json
+from pymake.generators.binary_file_generator import BinaryFileGenerator
+from typing import Any
+
+def test_serialize_single_key_value_pair():
+    generator = BinaryFileGenerator()
+    result = generator.generate({
+        "key": "value"
+    })
+    assert result == "{\"key\":\"value\"}"
+
+
+def test_compressed_output_is_deterministic():
+    generator = BinaryFileGenerator()
+    data = {"key": ["value"]}
+    assert generator.generate_bytes(data) == generator.generate_bytes(data)
+
+
+def test_write_to_file(tmp_path: Any):
+    generator = BinaryFileGenerator()
+    output_path = tmp_path / f"output.{generator.file_extension}"
+    assert generator.write_file({
+        "key": "value"
+    }, output_path)
+    assert not generator.write_file({
+        "key": "value"
+    }, output_path)
+
+    with gzip.open(output_path, "rt") as file:
+        assert json.load(file) == {"key": "value"}
@@ -0,0 +1,33 @@
+from pymake.generators.cmake_argument_group import CMakeArgumentGroup
+from pymake.generators.cmake_command import CMakeCommand
+from pymake.tracing.caller_info import CallerInfo
+
+def test_name_and_origin_match_ctor_args():
+    origin = CallerInfo("/foo.py", 1)
+    command = CMakeCommand("foo", origin)
+    assert command.name == "foo"
+    assert command.origin is origin
+
+
+def test_no_arguments_after_construction():
+    command = CMakeCommand("foo")
+    assert not command.argument_groups
+    assert not command.positional_arguments
+    assert not command.keyword_arguments
+
+
+def test_arguments_stored_in_order():
+    command = CMakeCommand("foo")
+    command.add_arguments(["bar"])
+    command.add_keyword_arguments("KEYWORD", ["baz", "qux"])
+    command.add_arguments(["quux"])
+
+    assert command.argument_groups == [
+        CMakeArgumentGroup(None, ["bar"]),
+        CMakeArgumentGroup("KEYWORD", ["baz", "qux"]),
+        CMakeArgumentGroup(None, ["quux"])
+    ]
+    assert command.positional_arguments == ["bar", "quux"]
+    assert command.keyword_arguments == [
+        CMakeArgumentGroup("KEYWORD", ["baz", "qux"])
+    ]
@@ -0,0 +1,81 @@
+from pymake.generators.cmake_command import CMakeCommand
+from pymake.generators.cmake_command_coalescer import CMakeCommandCoalescer
+from pymake.tracing.caller_info import CallerInfo
+from typing import List, Optional
+
+def make_command(
+    name: str,
+    target: str,
+    scope: str,
+    values: List[str],
+    origin: Optional[CallerInfo] = None) -> CMakeCommand:
+    command = CMakeCommand(name, origin)
+    command.add_arguments([target])
+    command.add_keyword_arguments(scope, values)
+    return command
+
+
+def test_merge_same_target_and_scope():
+    commands = [
+        make_command("target_sources", "foo", "PRIVATE", ["a.c"]),
+        make_command("target_sources", "foo", "PRIVATE", ["b.c", "c.c"])
+    ]
+    assert CMakeCommandCoalescer.coalesce(commands) == 1
+    assert len(commands) == 1
+    assert commands[0].argument_groups[-1].values == ["a.c", "b.c", "c.c"]
+
+
+def test_merge_keeps_value_origins():
+    origin_a = CallerInfo("/make.py", 1)
+    origin_b = CallerInfo("/make.py", 2)
+    commands = [
+        make_command("target_sources", "foo", "PRIVATE", ["a.c"], origin_a),
+        make_command("target_sources", "foo", "PRIVATE", ["b.c"], origin_b)
+    ]
+    CMakeCommandCoalescer.coalesce(commands)
+    assert commands[0].origin is origin_a
+    assert commands[0].argument_groups[-1].origins == [origin_a, origin_b]
+
+
+def test_merge_across_other_commands():
+    commands = [
+        make_command("target_link_libraries", "foo", "PRIVATE", ["a"]),
+        make_command("target_link_libraries", "bar", "PRIVATE", ["b"]),
+        CMakeCommand("enable_testing"),
+        make_command("target_link_libraries", "foo", "PRIVATE", ["c"])
+    ]
+    assert CMakeCommandCoalescer.coalesce(commands) == 1
+    assert [c.name for c in commands] == [
+        "target_link_libraries",
+        "target_link_libraries",
+        "enable_testing"
+    ]
+    assert commands[0].argument_groups[-1].values == ["a", "c"]
+
+
+def test_no_merge_across_different_scope():
+    """
+    Verifies that the order of values is preserved when a command with a
+      different scope separates two commands with the same scope.
+    """
+    commands = [
+        make_command("target_include_directories", "foo", "PUBLIC", ["a"]),
+        make_command("target_include_directories", "foo", "PRIVATE", ["b"]),
+        make_command("target_include_directories", "foo", "PUBLIC", ["c"]),
+        make_command("target_include_directories", "foo", "PUBLIC", ["d"])
+    ]
+    assert CMakeCommandCoalescer.coalesce(commands) == 1
+    assert [c.argument_groups[-1].values for c in commands] == [
+        ["a"],
+        ["b"],
+        ["c", "d"]
+    ]
+
+
+def test_no_merge_of_other_commands():
+    commands = [
+        make_command("set_target_properties", "foo", "PROPERTIES", ["a"]),
+        make_command("set_target_properties", "foo", "PROPERTIES", ["b"])
+    ]
+    assert CMakeCommandCoalescer.coalesce(commands) == 0
+    assert len(commands) == 2
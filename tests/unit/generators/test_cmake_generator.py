@@ -2,6 +2,7 @@ import os
 from pymake.generators.cmake_generator import CMakeGenerator
 from pymake.tracing.null_caller_info_formatter import NullCallerInfoFormatter
 from typing import Any
+from unit.tracing.mock_caller_info_formatter import MockCallerInfoFormatter
 
 def test_generate_method():
     generator = CMakeGenerator(NullCallerInfoFormatter())
@@ -22,3 +23,67 @@ def test_generate_file(tmp_path: Any):
     with open(output_path, "r") as f:
         assert f.read() == "foo()\n\n"
     os.remove(output_path)
+
+
+def test_unchanged_file_not_rewritten(tmp_path: Any):
+    generator = CMakeGenerator(NullCallerInfoFormatter())
+    with generator.open_method_block("foo") as _:
+        pass
+
+    output_path = tmp_path / "CMakeLists.txt"
+    assert generator.write_file(output_path)
+    assert not generator.write_file(output_path)
+
+    with generator.open_method_block("bar") as _:
+        pass
+    assert generator.write_file(output_path)
+
+
+def test_method_recorded_as_command():
+    generator = CMakeGenerator(NullCallerInfoFormatter())
+    with generator.open_method_block("foo") as b:
+        b.add_arguments("bar")
+        b.add_keyword_arguments("KEYWORD", ["baz"])
+
+    assert len(generator.commands) == 1
+    command = generator.commands[0]
+    assert command.name == "foo"
+    assert command.positional_arguments == ["bar"]
+    assert command.origin is not None
+    assert str(command.origin.file_path) == __file__
+
+
+def test_commands_rendered_when_generated():
+    generator = CMakeGenerator(NullCallerInfoFormatter())
+    with generator.open_method_block("foo") as _:
+        pass
+    with generator.open_method_block("bar") as _:
+        pass
+
+    # Changes to the commands and formatter should be reflected in the output
+    del generator.commands[0]
+    generator.formatter = MockCallerInfoFormatter("baz")
+    assert generator.generate() == "# baz\nbar()\n\n"
+
+
+def test_coalesced_commands_keep_value_tracing():
+    generator = CMakeGenerator(MockCallerInfoFormatter("origin"))
+    with generator.open_method_block("target_sources") as b:
+        b.add_arguments("foo")
+        b.add_keyword_arguments("PRIVATE", "a.c")
+    with generator.open_method_block("target_sources") as b:
+        b.add_arguments("foo")
+        b.add_keyword_arguments("PRIVATE", "b.c")
+
+    assert generator.coalesce_commands() == 1
+    assert generator.generate().splitlines() == [
+        "# origin",
+        "target_sources(",
+        "\tfoo",
+        "\tPRIVATE",
+        "\t\ta.c",
+        "\t\t# origin",
+        "\t\tb.c",
+        ")",
+        ""
+    ]
@@ -1,5 +1,6 @@
 from pymake.generators.cmake_generator import CMakeGenerator
 from pymake.tracing.null_caller_info_formatter import NullCallerInfoFormatter
+from pymake.tracing.origin_context import OriginContext
 from unit.tracing.mock_caller_info_formatter import MockCallerInfoFormatter
 
 def test_generate_empty_method():
@@ -85,3 +86,41 @@ def test_generate_method_with_keyword_arguments():
         ""
     ]
     assert expected_tokens == tokens
+
+
+def test_no_tracing_information_when_tracing_disabled():
+    OriginContext.set_tracing_enabled(False)
+    try:
+        generator = CMakeGenerator(MockCallerInfoFormatter("foobar"))
+        with generator.open_method_block("method") as _:
+            pass
+        assert generator.generate() == "method()\n\n"
+    finally:
+        OriginContext.set_tracing_enabled(True)
+
+
+def test_empty_method_does_not_indent_following_methods():
+    generator = CMakeGenerator(NullCallerInfoFormatter())
+    with generator.open_method_block("foo") as _:
+        pass
+    with generator.open_method_block("bar") as method:
+        method.add_arguments("baz")
+
+    tokens = generator.generate().splitlines()
+    expected_tokens = [
+        "foo()",
+        "",
+        "bar(",
+        "\tbaz",
+        ")",
+        ""
+    ]
+    assert expected_tokens == tokens
+
+
+def test_method_is_written_when_block_exits():
+    generator = CMakeGenerator(NullCallerInfoFormatter())
+    with generator.open_method_block("foo") as method:
+        method.add_arguments("bar")
+        assert generator.generate() == ""
+    assert generator.generate() == "foo(\n\tbar\n)\n\n"
@@ -59,3 +59,7 @@ def test_write_to_file(tmp_path: Any):
         "}",
     ]
     assert tokens == expected_tokens
+
+
+def test_file_extension():
+    assert JsonFileGenerator().file_extension == "json"
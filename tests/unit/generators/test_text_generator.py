@@ -167,3 +167,43 @@ def test_finish_line_when_at_start_of_line():
     generator.append_line("foo")
     generator.finish_line()
     assert generator.text == "foo\n"
+
+
+def test_append_after_reading_text():
+    generator = TextGenerator()
+    generator.append_line("foo")
+    assert generator.text == "foo\n"
+    generator.append_line("bar")
+    assert generator.text == "foo\nbar\n"
+    assert generator.text == "foo\nbar\n"
+
+
+def test_at_start_of_line_after_removing_newline():
+    generator = TextGenerator()
+    generator.append_line("foo")
+    generator.remove_last_instance_of("\n")
+    assert not generator.at_start_of_line
+    generator.append("bar")
+    assert generator.text == "foobar"
+
+
+def test_at_start_of_line_after_appending_empty_string():
+    generator = TextGenerator()
+    generator.append_line("foo")
+    generator.append("")
+    assert generator.at_start_of_line
+
+
+def test_append_block():
+    generator = TextGenerator()
+    generator.increase_indentation_level()
+    generator.append_block([(0, "foo("), (1, "bar"), (0, ")"), (0, "")])
+    assert generator.text == "\tfoo(\n\t\tbar\n\t)\n\n"
+
+
+def test_append_block_continues_current_line():
+    generator = TextGenerator()
+    generator.indentation_level = 1
+    generator.append("foo")
+    generator.append_block([(0, "bar"), (0, "baz")])
+    assert generator.text == "foobar\n\tbaz\n"
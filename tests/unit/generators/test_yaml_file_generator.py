@@ -41,3 +41,7 @@ def test_write_to_file(tmp_path: Any):
     with open(output_path, "r") as file:
         result = file.read()
     assert result == "key: value\n"
+
+
+def test_file_extension():
+    assert YamlFileGenerator().file_extension == "yaml"
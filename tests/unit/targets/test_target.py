@@ -504,6 +504,89 @@ class TestTarget:
         assert traced_src.origin.line_number == (call_site.line_number + 1)
 
 
+    def test_missing_source_reported(self, tmp_path: Any, capsys: Any):
+        target = MockTarget(
+            self.build_script_set,
+            "foo",
+            ETargetType.EXECUTABLE
+        )
+        existing_src = tmp_path / "exists.cpp"
+        existing_src.write_text("")
+        missing_src = tmp_path / "missing.cpp"
+
+        call_site = CallerInfo.closest_external_frame()
+        target.add_sources([str(existing_src), str(missing_src)])
+
+        # Only the missing source should be reported, along with its origin
+        err = capsys.readouterr().err
+        assert str(missing_src) in err
+        assert str(existing_src) not in err
+        assert f"{call_site.file_path}:{call_site.line_number + 1}" in err
+        assert len(target.sources.private) == 2
+
+
+    def test_add_sources_glob(self, tmp_path: Any):
+        target = MockTarget(
+            self.build_script_set,
+            "foo",
+            ETargetType.EXECUTABLE
+        )
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "main.cpp").write_text("")
+        (tmp_path / "main.h").write_text("")
+        (tmp_path / "sub" / "util.cpp").write_text("")
+        (tmp_path / "sub" / "util_test.cpp").write_text("")
+
+        target.add_sources_glob(
+            str(tmp_path / "**" / "*.cpp"),
+            exclude=str(tmp_path / "**" / "*_test.cpp")
+        )
+
+        sources = target.sources.private
+        assert len(sources) == 2
+        assert tmp_path / "main.cpp" in sources
+        assert tmp_path / "sub" / "util.cpp" in sources
+
+
+    def test_add_sources_glob_after_build(self, tmp_path: Any):
+        target = MockTarget(
+            self.build_script_set,
+            "foo",
+            ETargetType.EXECUTABLE
+        )
+        (tmp_path / "main.cpp").write_text("")
+
+        # CMake writes source files to the build directory when it identifies
+        #   the compiler
+        compiler_id_dir = tmp_path / "_build" / "CMakeFiles" / "CompilerIdCXX"
+        compiler_id_dir.mkdir(parents=True)
+        (compiler_id_dir / "CMakeCXXCompilerId.cpp").write_text("")
+        (tmp_path / "_build" / "CMakeCache.txt").write_text("")
+
+        target.add_sources_glob(str(tmp_path / "**" / "*.cpp"))
+
+        sources = target.sources.private
+        assert len(sources) == 1
+        assert tmp_path / "main.cpp" in sources
+        scanned_dirs = \
+            self.build_script_set.directory_scan_cache.scanned_directories
+        assert str(tmp_path / "_build") not in scanned_dirs
+
+
+    def test_add_sources_glob_without_matches(self,
+        tmp_path: Any,
+        capsys: Any):
+        target = MockTarget(
+            self.build_script_set,
+            "foo",
+            ETargetType.EXECUTABLE
+        )
+        target.add_sources_glob(str(tmp_path / "*.cpp"))
+
+        assert not target.sources
+        assert "did not match" in capsys.readouterr().err
+
+
     def test_duplicate_install_call_ignored(self, tmp_path: Any):
         target = MockTarget(
             self.build_script_set,
@@ -579,3 +662,51 @@ class TestTarget:
         assert Path(public_source) in sources.select_set(EScope.PUBLIC)
         assert Path(interface_source) in sources.select_set(EScope.INTERFACE)
         assert Path(private_source) not in sources.select_set(EScope.PRIVATE)
+
+
+    def test_full_target_cached(self):
+        target = StaticLibraryTarget(self.build_script_set, "lib")
+        full_target = target.get_full_target()
+        assert target.get_full_target() is full_target
+        assert target.get_full_target(include_private=False) is not full_target
+
+
+    def test_full_target_invalidated_by_linked_target_change(self):
+        lib_target = StaticLibraryTarget(self.build_script_set, "lib")
+        mid_target = StaticLibraryTarget(self.build_script_set, "mid")
+        exe_target = ExecutableTarget(self.build_script_set, "exe")
+        mid_target.link_to_target(lib_target, EScope.PUBLIC)
+        exe_target.link_to_target(mid_target, EScope.PRIVATE)
+
+        include_dir = "/public/include/dir"
+        full_target = exe_target.get_full_target()
+        assert Path(include_dir) not in \
+            full_target.include_directories.select_set(EScope.PUBLIC)
+
+        # Modifying a transitively linked target should invalidate the cached
+        #   full target
+        lib_target.add_include_directories(include_dir, EScope.PUBLIC)
+        full_target = exe_target.get_full_target()
+        assert Path(include_dir) in \
+            full_target.include_directories.select_set(EScope.PUBLIC)
+
+
+    def test_full_target_of_deep_dependency_chain(self):
+        """
+        Verifies that the full target can be generated for a dependency chain
+          that's deeper than Python's recursion limit.
+        """
+        targets = [StaticLibraryTarget(self.build_script_set, "lib_0")]
+        targets[0].add_include_directories("/include/dir", EScope.PUBLIC)
+        for i in range(1, 1200):
+            target = StaticLibraryTarget(self.build_script_set, f"lib_{i}")
+            target.link_to_target(targets[-1], EScope.PUBLIC)
+            targets.append(target)
+
+        full_target = targets[-1].get_full_target()
+        assert Path("/include/dir") in \
+            full_target.include_directories.select_set(EScope.PUBLIC)
+        assert "lib_0" in [
+            str(t.value) for t in
+            full_target.link_libraries.select_set(EScope.PUBLIC)
+        ]
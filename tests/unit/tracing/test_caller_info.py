@@ -44,3 +44,21 @@ def test_hash_and_equality():
 def test_ctor_throws_if_path_not_absolute():
     with pytest.raises(ValueError):
         CallerInfo("foo.py", 1)
+
+
+def test_captures_from_same_line_are_interned():
+    caller_infos = [CallerInfo.closest_external_frame() for _ in range(2)]
+    assert caller_infos[0] is caller_infos[1]
+
+
+def test_interned_path_resolved_lazily():
+    caller_info = CallerInfo.intern("/foo/../bar.py", 1)
+    assert caller_info._file_path is None
+    assert caller_info.file_path == Path("/bar.py")
+    assert caller_info is CallerInfo.intern("/foo/../bar.py", 1)
+
+
+def test_interned_equals_constructed_instance():
+    caller_info = CallerInfo.intern(__file__, 1)
+    assert caller_info == CallerInfo(__file__, 1)
+    assert hash(caller_info) == hash(CallerInfo(__file__, 1))
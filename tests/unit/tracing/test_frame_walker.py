@@ -0,0 +1,93 @@
+import inspect
+from pathlib import Path
+from pymake.tracing.frame_walker import FrameWalker
+import sys
+from typing import Any
+
+def test_closest_external_frame():
+    """
+    Verifies that the closest external frame is this method's stack frame.
+    """
+    marker = sys._getframe().f_lineno
+    file_path, line_number = FrameWalker.closest_external_frame()
+    assert str(file_path) == __file__
+    assert line_number == marker + 1
+
+
+def test_get_frame():
+    """
+    Verifies that this method's stack frame can be captured.
+    """
+    marker = sys._getframe().f_lineno
+    file_path, line_number = FrameWalker.get_frame()
+    assert str(file_path) == __file__
+    assert line_number == marker + 1
+
+
+def test_get_frame_with_offset():
+    """
+    Verifies that an offset can be used to capture the caller's stack frame.
+    """
+    def helper():
+        return FrameWalker.get_frame(1)
+
+    marker = sys._getframe().f_lineno
+    file_path, line_number = helper()
+    assert str(file_path) == __file__
+    assert line_number == marker + 1
+
+
+def test_resolved_paths_are_cached():
+    """
+    Verifies that each file's path is only resolved once.
+    """
+    FrameWalker.clear_cache()
+    first = FrameWalker.resolve_path(__file__)
+    second = FrameWalker.resolve_path(__file__)
+    assert first is second
+    assert Path(__file__) == first
+
+
+def test_is_pymake_file():
+    """
+    Verifies that PyMake's own files are recognized.
+    """
+    assert not FrameWalker.is_pymake_file(__file__)
+    assert FrameWalker.is_pymake_file(inspect.getfile(FrameWalker))
+    assert FrameWalker.is_pymake_file("/foo/pymake/bar.py")
+
+
+def test_is_pymake_file_through_symlink(tmp_path: Any):
+    """
+    Verifies that PyMake's files are recognized if PyMake is accessed through
+      a symlink whose path doesn't contain a `pymake` directory.
+    """
+    link_path = tmp_path / "tools"
+    link_path.symlink_to(Path(inspect.getfile(FrameWalker)).parent.parent)
+    assert FrameWalker.is_pymake_file(
+        str(link_path / "tracing" / "frame_walker.py"))
+
+
+def test_clear_cache():
+    """
+    Verifies that clearing the cache removes all cached file and code object
+      data.
+    """
+    FrameWalker.closest_external_frame()
+    FrameWalker.resolve_path(__file__)
+    FrameWalker.clear_cache()
+    assert not FrameWalker._files
+    assert not FrameWalker._resolved_paths
+    assert not FrameWalker._code_objects
+
+
+def test_clear_code_objects():
+    """
+    Verifies that clearing the code objects keeps the cached file data.
+    """
+    FrameWalker.closest_external_frame()
+    FrameWalker.resolve_path(__file__)
+    FrameWalker.clear_code_objects()
+    assert not FrameWalker._code_objects
+    assert FrameWalker._files
+    assert FrameWalker._resolved_paths
@@ -0,0 +1,87 @@
+from pathlib import Path
+from pymake.common.scope import EScope
+from pymake.core.build_script_set import BuildScriptSet
+from pymake.targets.static_library_target import StaticLibraryTarget
+from pymake.tracing.caller_info import CallerInfo
+from pymake.tracing.null_caller_info_formatter import NullCallerInfoFormatter
+from pymake.tracing.origin_context import OriginContext
+from pymake.tracing.traced import Traced
+
+def test_no_origin_active_by_default():
+    assert OriginContext.current() is None
+
+
+def test_capture_without_context_captures_caller():
+    origin = OriginContext.capture()
+    assert str(origin.file_path) == __file__
+    assert origin.line_number == 15
+
+
+def test_context_captures_caller():
+    with OriginContext() as origin:
+        assert str(origin.file_path) == __file__
+        assert origin.line_number == 21
+        assert OriginContext.current() is origin
+    assert OriginContext.current() is None
+
+
+def test_context_uses_explicit_origin():
+    explicit = CallerInfo("/foo.py", 1)
+    with OriginContext(explicit) as origin:
+        assert origin is explicit
+        assert OriginContext.capture() is explicit
+
+
+def test_nested_context_reuses_outer_origin():
+    with OriginContext() as outer:
+        with OriginContext() as inner:
+            assert inner is outer
+        # Exiting the nested context must not clear the outer context
+        assert OriginContext.current() is outer
+
+
+def test_traced_values_reuse_context_origin():
+    with OriginContext() as origin:
+        first = Traced(1)
+        second = Traced(2)
+    assert first.origin is origin
+    assert second.origin is origin
+
+
+def test_entry_point_captures_origin_once():
+    build_scripts = BuildScriptSet(
+        Path("/source"),
+        Path("/generated"),
+        NullCallerInfoFormatter()
+    )
+    target = StaticLibraryTarget(build_scripts, "foo")
+    sources = [f"/src/{i}.cpp" for i in range(100)]
+    target.add_sources(sources, EScope.PRIVATE)
+
+    # Every source should share the same origin instance since the origin is
+    #   only captured once per call
+    origins = {id(t.origin) for t in target.sources.private}
+    assert len(origins) == 1
+    origin = next(iter(target.sources.private)).origin
+    assert str(origin.file_path) == __file__
+    assert origin.line_number == 59
+    assert OriginContext.current() is None
+
+
+def test_capture_trace_when_tracing_disabled():
+    OriginContext.set_tracing_enabled(False)
+    try:
+        assert not OriginContext.is_tracing_enabled()
+        assert OriginContext.capture_trace() is OriginContext.UNTRACED_ORIGIN
+        assert Traced(1).origin is OriginContext.UNTRACED_ORIGIN
+
+        # Origins needed for PyMake to function must still be captured
+        assert str(OriginContext.capture().file_path) == __file__
+    finally:
+        OriginContext.set_tracing_enabled(True)
+
+
+def test_capture_trace_when_tracing_enabled():
+    assert OriginContext.is_tracing_enabled()
+    origin = OriginContext.capture_trace()
+    assert str(origin.file_path) == __file__
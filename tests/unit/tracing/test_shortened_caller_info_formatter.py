@@ -112,3 +112,11 @@ def test_shortened_caller_info_formatter_on_traced_class_shortened_path():
 def test_ctor_throws_if_base_path_not_absolute():
     with pytest.raises(ValueError):
         ShortenedCallerInfoFormatter("foo")
+
+
+def test_formatted_output_is_memoized():
+    formatter = ShortenedCallerInfoFormatter(Path(__file__).parent)
+    caller_info = CallerInfo.intern(__file__, 123)
+    first = formatter.format(caller_info)
+    second = formatter.format(Traced("foo", caller_info))
+    assert first is second
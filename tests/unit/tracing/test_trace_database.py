@@ -0,0 +1,77 @@
+from pymake.tracing.trace_database import TraceDatabase
+from pymake.tracing.trace_record import TraceRecord
+import pytest
+from typing import Any, Dict
+
+def create_target_dict() -> Dict[str, object]:
+    return {
+        "type": "Static",
+        "sources": {
+            "public": [],
+            "interface": [],
+            "private": [{
+                "value": "/src/foo.cpp",
+                "origin": {"file": "/src/make.py", "line": 3}
+            }]
+        },
+        "install_rpath": {
+            "value": "$ORIGIN",
+            "origin": {"file": "/src/make.py", "line": 4}
+        },
+        "install_path": "<cmake_default>"
+    }
+
+
+def test_explain_target():
+    database = TraceDatabase.create()
+    database.add_target("foo", create_target_dict())
+    assert database.explain("foo") == [
+        TraceRecord("target", "foo", "type", None, "Static", None, None),
+        TraceRecord("target", "foo", "sources", "private", "/src/foo.cpp",
+            "/src/make.py", 3),
+        TraceRecord("target", "foo", "install_rpath", None, "$ORIGIN",
+            "/src/make.py", 4),
+        TraceRecord("target", "foo", "install_path", None, "<cmake_default>",
+            None, None)
+    ]
+    assert database.explain("bar") == []
+
+
+def test_explain_preset():
+    database = TraceDatabase.create()
+    database.add_preset("debug", {
+        "description": None,
+        "cacheVariables": {"CMAKE_BUILD_TYPE": "Debug"},
+        "inherits": ["base"]
+    })
+    assert [r.value for r in database.explain("debug")] == [
+        "CMAKE_BUILD_TYPE=Debug",
+        "base"
+    ]
+
+
+def test_who_added():
+    database = TraceDatabase.create()
+    database.add_target("foo", create_target_dict())
+    database.add_target("bar", create_target_dict())
+    records = database.who_added("/src/foo.cpp")
+    assert [r.object_name for r in records] == ["foo", "bar"]
+    assert all(r.file == "/src/make.py" and r.line == 3 for r in records)
+
+
+def test_write_and_open(tmp_path: Any):
+    output_path = tmp_path / TraceDatabase.FILE_NAME
+    database = TraceDatabase.create()
+    database.add_target("foo", create_target_dict())
+    assert database.write_file(output_path)
+    assert not database.write_file(output_path)
+    database.close()
+
+    database = TraceDatabase.open(output_path)
+    assert len(database.explain("foo")) == 4
+    database.close()
+
+
+def test_open_missing_database(tmp_path: Any):
+    with pytest.raises(FileNotFoundError):
+        TraceDatabase.open(tmp_path / TraceDatabase.FILE_NAME)
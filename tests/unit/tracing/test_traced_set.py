@@ -70,3 +70,18 @@ def test_get_value_from_traced_set():
     assert xs[1].value == 1
     assert xs[1].origin.file_path == call_site.file_path
     assert xs[1].origin.line_number == (call_site.line_number - 1)
+
+
+def test_on_change_called_when_values_added():
+    changes = []
+    xs: TracedSet[int] = TracedSet(on_change=lambda: changes.append(True))
+    xs.add(1)
+    xs.add(1)
+    assert len(changes) == 1
+
+    ys: TracedSet[int] = TracedSet()
+    xs.merge(ys)
+    assert len(changes) == 1
+    ys.add(2)
+    xs.merge(ys)
+    assert len(changes) == 2
@@ -0,0 +1,57 @@
+import os
+from pathlib import Path
+from pymake.util.bytecode_cache import BytecodeCache
+from typing import Any, Dict
+
+def run_code(cache: BytecodeCache, script_path: Path) -> Dict[str, Any]:
+    namespace: Dict[str, Any] = {}
+    exec(cache.load_code(script_path), namespace)
+    return namespace
+
+
+def test_script_compiled_once(tmp_path: Any):
+    script_path = tmp_path / "make.py"
+    script_path.write_text("value = 1\n")
+    cache_dir = tmp_path / BytecodeCache.DIR_NAME
+
+    cache = BytecodeCache(cache_dir)
+    assert run_code(cache, script_path)["value"] == 1
+    assert cache.misses == 1
+    assert cache.hits == 0
+    assert cache.get_cache_path(script_path).exists()
+
+    cache = BytecodeCache(cache_dir)
+    assert run_code(cache, script_path)["value"] == 1
+    assert cache.misses == 0
+    assert cache.hits == 1
+    assert cache.saved_seconds > 0
+
+
+def test_changed_script_recompiled(tmp_path: Any):
+    script_path = tmp_path / "make.py"
+    script_path.write_text("value = 1\n")
+    cache_dir = tmp_path / BytecodeCache.DIR_NAME
+    run_code(BytecodeCache(cache_dir), script_path)
+
+    # Keep the size the same so that only the modification time changes
+    script_path.write_text("value = 2\n")
+    stat = os.stat(script_path)
+    os.utime(script_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+    cache = BytecodeCache(cache_dir)
+    assert run_code(cache, script_path)["value"] == 2
+    assert cache.misses == 1
+
+
+def test_corrupt_cache_file_ignored(tmp_path: Any):
+    script_path = tmp_path / "make.py"
+    script_path.write_text("value = 1\n")
+    cache = BytecodeCache(tmp_path / BytecodeCache.DIR_NAME)
+    run_code(cache, script_path)
+
+    cache_path = cache.get_cache_path(script_path)
+    cache_path.write_bytes(cache_path.read_bytes()[:-4])
+
+    cache = BytecodeCache(tmp_path / BytecodeCache.DIR_NAME)
+    assert run_code(cache, script_path)["value"] == 1
+    assert cache.misses == 1
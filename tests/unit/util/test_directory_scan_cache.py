@@ -0,0 +1,108 @@
+import os
+from pymake.util.directory_scan_cache import DirectoryScanCache
+from typing import Any
+
+def test_walk(tmp_path: Any):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a.cpp").write_text("")
+    (tmp_path / "sub" / "b.cpp").write_text("")
+
+    cache = DirectoryScanCache()
+    assert cache.walk(str(tmp_path)) == [
+        str(tmp_path / "a.cpp"),
+        str(tmp_path / "sub" / "b.cpp")
+    ]
+    assert cache.walk(str(tmp_path), recursive=False) == \
+        [str(tmp_path / "a.cpp")]
+    assert set(cache.scanned_directories) == \
+        {str(tmp_path), str(tmp_path / "sub")}
+
+
+def test_missing_directory(tmp_path: Any):
+    cache = DirectoryScanCache()
+    assert cache.walk(str(tmp_path / "missing")) == []
+    assert not cache.scanned_directories
+
+
+def test_unchanged_directory_not_listed(tmp_path: Any, monkeypatch: Any):
+    src_dir = tmp_path / "src"
+    src_dir.mkdir()
+    (src_dir / "a.cpp").write_text("")
+    cache_path = tmp_path / DirectoryScanCache.FILE_NAME
+    cache = DirectoryScanCache()
+    cache.walk(str(src_dir))
+    assert cache.write_file(cache_path)
+
+    def scandir(path: Any) -> Any:
+        raise AssertionError("Unchanged directory was listed")
+    monkeypatch.setattr(os, "scandir", scandir)
+
+    cache = DirectoryScanCache.load(cache_path)
+    assert str(src_dir / "a.cpp") in cache.walk(str(src_dir))
+    assert not cache.write_file(cache_path)
+
+
+def test_changed_directory_listed_again(tmp_path: Any):
+    (tmp_path / "a.cpp").write_text("")
+    cache = DirectoryScanCache()
+    cache.walk(str(tmp_path))
+
+    (tmp_path / "b.cpp").write_text("")
+    os.utime(tmp_path, ns=(0, 0))
+    assert str(tmp_path / "b.cpp") in cache.walk(str(tmp_path))
+
+
+def test_load_invalid_cache(tmp_path: Any):
+    cache_path = tmp_path / DirectoryScanCache.FILE_NAME
+    cache_path.write_text("[]")
+    assert not DirectoryScanCache.load(cache_path).scanned_directories
+    assert not DirectoryScanCache.load(tmp_path / "missing.json") \
+        .scanned_directories
+
+
+def test_hidden_and_ignored_directories_skipped(tmp_path: Any):
+    for name in [".git", "generated", "src"]:
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "a.cpp").write_text("")
+
+    cache = DirectoryScanCache()
+    cache.ignore_directory(tmp_path / "generated")
+    assert cache.walk(str(tmp_path)) == [str(tmp_path / "src" / "a.cpp")]
+
+
+def test_build_directories_skipped(tmp_path: Any):
+    (tmp_path / "a.cpp").write_text("")
+    build_dir = tmp_path / "_build"
+    (build_dir / "CMakeFiles").mkdir(parents=True)
+    (build_dir / "CMakeCache.txt").write_text("")
+    (build_dir / "CMakeFiles" / "CMakeCXXCompilerId.cpp").write_text("")
+
+    cache = DirectoryScanCache()
+    assert cache.walk(str(tmp_path)) == [str(tmp_path / "a.cpp")]
+    assert set(cache.scanned_directories) == {str(tmp_path)}
+
+    # A build directory is only skipped when it's found by a recursive scan
+    assert cache.walk(str(build_dir), recursive=False) == \
+        [str(build_dir / "CMakeCache.txt")]
+
+
+def test_ignored_directories_persisted(tmp_path: Any):
+    src_dir = tmp_path / "src"
+    (src_dir / "_out").mkdir(parents=True)
+    (src_dir / "a.cpp").write_text("")
+    (src_dir / "_out" / "b.cpp").write_text("")
+    cache_path = tmp_path / DirectoryScanCache.FILE_NAME
+
+    # Directories ignored after scanning are skipped by the next run's scans
+    cache = DirectoryScanCache()
+    assert len(cache.walk(str(src_dir))) == 2
+    cache.ignore_directory(src_dir / "_out")
+    assert cache.write_file(cache_path)
+
+    cache = DirectoryScanCache.load(cache_path)
+    assert cache.walk(str(src_dir)) == [str(src_dir / "a.cpp")]
+
+    # Directories that are no longer ignored are dropped from the cache
+    assert cache.write_file(cache_path)
+    cache = DirectoryScanCache.load(cache_path)
+    assert len(cache.walk(str(src_dir))) == 2
@@ -0,0 +1,48 @@
+import os
+from pymake.util.file_writer import FileWriter
+from typing import Any
+
+def test_write_new_file(tmp_path: Any):
+    output_path = tmp_path / "foo" / "bar.txt"
+    assert FileWriter.write_if_changed(output_path, "foo\n")
+    with open(output_path, "r") as f:
+        assert f.read() == "foo\n"
+
+
+def test_skip_unchanged_file(tmp_path: Any):
+    output_path = tmp_path / "foo.txt"
+    FileWriter.write_if_changed(output_path, "foo\n")
+
+    # Set the modification time to a known value so that it's possible to
+    #   verify that the file was not rewritten
+    os.utime(output_path, (0, 0))
+    assert not FileWriter.write_if_changed(output_path, "foo\n")
+    assert os.stat(output_path).st_mtime == 0
+
+
+def test_rewrite_file_with_same_size(tmp_path: Any):
+    output_path = tmp_path / "foo.txt"
+    FileWriter.write_if_changed(output_path, "foo\n")
+    assert FileWriter.write_if_changed(output_path, "bar\n")
+    with open(output_path, "r") as f:
+        assert f.read() == "bar\n"
+
+
+def test_rewrite_file_with_different_size(tmp_path: Any):
+    output_path = tmp_path / "foo.txt"
+    FileWriter.write_if_changed(output_path, "foo\n")
+    assert FileWriter.write_if_changed(output_path, "foobar\n")
+    with open(output_path, "r") as f:
+        assert f.read() == "foobar\n"
+
+
+def test_missing_file_is_changed(tmp_path: Any):
+    assert not FileWriter.is_unchanged(tmp_path / "foo.txt", b"")
+
+
+def test_write_bytes(tmp_path: Any):
+    output_path = tmp_path / "foo.bin"
+    assert FileWriter.write_bytes_if_changed(output_path, b"\x00\x01")
+    assert not FileWriter.write_bytes_if_changed(output_path, b"\x00\x01")
+    with open(output_path, "rb") as f:
+        assert f.read() == b"\x00\x01"
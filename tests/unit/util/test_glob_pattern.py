@@ -0,0 +1,31 @@
+from pymake.util.glob_pattern import GlobPattern
+import pytest
+
+@pytest.mark.parametrize("pattern,path,expected", [
+    ("/a/src/*.cpp", "/a/src/main.cpp", True),
+    ("/a/src/*.cpp", "/a/src/sub/main.cpp", False),
+    ("/a/src/*.cpp", "/a/src/main.h", False),
+    ("/a/src/**/*.cpp", "/a/src/main.cpp", True),
+    ("/a/src/**/*.cpp", "/a/src/x/y/main.cpp", True),
+    ("/a/src/**/*.cpp", "/a/other/main.cpp", False),
+    ("/a/src/**", "/a/src/x/y/main.cpp", True),
+    ("/a/src/?.cpp", "/a/src/m.cpp", True),
+    ("/a/src/?.cpp", "/a/src/mm.cpp", False),
+    ("/a/src/[ab].cpp", "/a/src/b.cpp", True),
+    ("/a/src/[!ab].cpp", "/a/src/b.cpp", False),
+    ("/a/src/*/test_*.cpp", "/a/src/x/test_y.cpp", True),
+    ("/a/src/main.cpp", "/a/src/main.cpp", True),
+    ("/a/b/../src/*.cpp", "/a/src/main.cpp", True),
+])
+def test_matches(pattern: str, path: str, expected: bool):
+    assert GlobPattern(pattern).matches(path) == expected
+
+
+def test_base_dir():
+    pattern = GlobPattern("/a/src/**/*.cpp")
+    assert pattern.base_dir == "/a/src"
+    assert pattern.is_recursive
+
+    pattern = GlobPattern("/a/src/*.cpp")
+    assert pattern.base_dir == "/a/src"
+    assert not pattern.is_recursive
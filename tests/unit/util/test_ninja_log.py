@@ -0,0 +1,35 @@
+from pymake.util.ninja_log import NinjaLog
+from pymake.util.platform_statics import PlatformStatics
+import pytest
+from typing import Any
+
+def test_load_target_times(tmp_path: Any):
+    log_path = tmp_path / ".ninja_log"
+    log_path.write_text(
+        "# ninja log v5\n" +
+        "0\t1500\t0\tCMakeFiles/foo.dir/foo.cpp.o\t1\n" +
+        "0\t500\t0\tCMakeFiles/foo.dir/bar.cpp.o\t2\n" +
+        "1500\t2000\t0\t" + PlatformStatics.get_static_lib_name("foo") +
+            "\t3\n" +
+        "2000\t2250\t0\tCMakeFiles/app.dir/main.cpp.o\t4\n" +
+        "0\t9000\t0\tbuild.ninja\t5\n"
+    )
+    times = NinjaLog.load_target_times(log_path, ["foo", "app", "unused"])
+    assert times == {"foo": 2.5, "app": 0.25, "unused": 0.0}
+
+
+def test_latest_entry_used(tmp_path: Any):
+    log_path = tmp_path / ".ninja_log"
+    log_path.write_text(
+        "# ninja log v5\n" +
+        "0\t1000\t0\ta.o\t1\n" +
+        "0\t3000\t0\ta.o\t1\n"
+    )
+    assert NinjaLog.load_output_times(log_path) == {"a.o": 3.0}
+
+
+def test_invalid_log_rejected(tmp_path: Any):
+    log_path = tmp_path / ".ninja_log"
+    log_path.write_text("not a log\n")
+    with pytest.raises(ValueError):
+        NinjaLog.load_output_times(log_path)
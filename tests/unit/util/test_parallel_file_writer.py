@@ -0,0 +1,50 @@
+from pathlib import Path
+from pymake.util.parallel_file_writer import ParallelFileWriter
+import pytest
+import threading
+from typing import List
+
+def test_invalid_worker_count():
+    with pytest.raises(ValueError):
+        ParallelFileWriter(0)
+
+
+def test_results_in_queued_order():
+    # Make the first job finish last to verify that the results are returned in
+    #   the order that jobs were queued instead of the order they finished
+    first_job_may_finish = threading.Event()
+    def first_job() -> bool:
+        first_job_may_finish.wait(timeout=5)
+        return True
+    def last_job() -> bool:
+        first_job_may_finish.set()
+        return False
+
+    writer = ParallelFileWriter(2)
+    writer.add(Path("/foo"), first_job)
+    writer.add(Path("/bar"), last_job)
+    assert len(writer) == 2
+    assert writer.paths == [Path("/foo"), Path("/bar")]
+    assert writer.write_all() == [True, False]
+
+
+def test_single_worker_runs_on_calling_thread():
+    threads: List[threading.Thread] = []
+    def job() -> bool:
+        threads.append(threading.current_thread())
+        return True
+
+    writer = ParallelFileWriter(1)
+    writer.add(Path("/foo"), job)
+    assert writer.write_all() == [True]
+    assert threads == [threading.current_thread()]
+
+
+def test_job_exception_is_rethrown():
+    def job() -> bool:
+        raise RuntimeError("foo")
+
+    writer = ParallelFileWriter()
+    writer.add(Path("/foo"), job)
+    with pytest.raises(RuntimeError):
+        writer.write_all()
@@ -0,0 +1,63 @@
+import os
+from pathlib import Path
+from pymake.util.path_resolver import PathResolver
+import pytest
+from typing import Any
+
+@pytest.fixture
+def tree(tmp_path: Any) -> Path:
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "a.cpp").write_text("")
+    (tmp_path / "real").mkdir()
+    (tmp_path / "real" / "b.cpp").write_text("")
+    os.symlink(tmp_path / "real", tmp_path / "linked_dir")
+    os.symlink(tmp_path / "real" / "b.cpp", tmp_path / "src" / "linked.cpp")
+    return tmp_path
+
+
+@pytest.mark.parametrize("raw", [
+    "src/a.cpp",
+    "src/missing.cpp",
+    "src/linked.cpp",
+    "linked_dir/b.cpp",
+    "linked_dir/../src/a.cpp",
+    "linked_dir/..",
+    "src",
+    "."
+])
+def test_resolve_matches_path_resolve(tree: Path, raw: str):
+    resolver = PathResolver()
+    assert resolver.resolve(tree, raw) == (tree / raw).resolve()
+
+
+def test_resolve_absolute_path(tree: Path):
+    resolver = PathResolver()
+    path = str(tree / "src" / "a.cpp")
+    assert resolver.resolve(Path("/unused"), path) == Path(path)
+
+
+def test_find_missing(tree: Path):
+    resolver = PathResolver()
+    paths = [
+        resolver.resolve(tree, "src/a.cpp"),
+        resolver.resolve(tree, "src/missing.cpp"),
+        resolver.resolve(tree, "missing_dir/c.cpp")
+    ]
+    assert resolver.find_missing(paths) == paths[1:]
+
+
+def test_directories_listed_once(tree: Path, monkeypatch: Any):
+    for i in range(10):
+        (tree / "src" / f"{i}.cpp").write_text("")
+
+    calls = []
+    real_scandir = os.scandir
+    def scandir(path: Any) -> Any:
+        calls.append(path)
+        return real_scandir(path)
+    monkeypatch.setattr(os, "scandir", scandir)
+
+    resolver = PathResolver()
+    paths = [resolver.resolve(tree, f"src/{i}.cpp") for i in range(10)]
+    assert not resolver.find_missing(paths)
+    assert len(calls) == 1
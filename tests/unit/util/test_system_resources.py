@@ -0,0 +1,130 @@
+import os
+from pathlib import Path
+from pymake.util.system_resources import SystemResources
+import pytest
+from typing import Any, Dict
+
+GIB = 1 << 30
+
+@pytest.fixture(autouse=True)
+def host_cpus(monkeypatch: Any) -> None:
+    # Pretend that the host has 128 CPUs, all of which the process may run on
+    monkeypatch.setattr(os, "cpu_count", lambda: 128)
+    monkeypatch.setattr(os, "sched_getaffinity", lambda _: set(range(128)),
+        raising=False)
+
+
+def create_resources(
+    tmp_path: Path,
+    proc_cgroup: str,
+    files: Dict[str, str],
+    mem_total_kb: int = 256 * 1024 * 1024) -> SystemResources:
+    cgroup_root = tmp_path / "cgroup"
+    proc_root = tmp_path / "proc"
+    (proc_root / "self").mkdir(parents=True)
+    (proc_root / "self" / "cgroup").write_text(proc_cgroup)
+    (proc_root / "meminfo").write_text(
+        f"MemTotal:       {mem_total_kb} kB\nMemFree: 1 kB\n")
+    cgroup_root.mkdir()
+    for rel_path, contents in files.items():
+        file_path = cgroup_root / rel_path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        file_path.write_text(contents)
+    return SystemResources(cgroup_root, proc_root)
+
+
+def test_no_cgroup_limits(tmp_path: Any):
+    resources = create_resources(tmp_path, "0::/\n", {
+        "cpu.max": "max 100000\n",
+        "memory.max": "max\n"
+    })
+    assert resources.cpu_count == 128
+    assert resources.memory_limit == 256 * GIB
+    assert resources.default_compile_jobs == 128
+    assert resources.default_link_jobs == 128
+
+
+def test_cgroup_v2_limits(tmp_path: Any):
+    resources = create_resources(tmp_path, "0::/container\n", {
+        "container/cpu.max": "1550000 100000\n",
+        "container/memory.max": f"{64 * GIB}\n"
+    })
+    assert resources.cpu_count == 16
+    assert resources.memory_limit == 64 * GIB
+    assert resources.default_compile_jobs == 16
+    assert resources.default_link_jobs == 16
+
+
+def test_cgroup_v2_ancestor_limits(tmp_path: Any):
+    # Limits of ancestor cgroups apply to the process' cgroup too
+    resources = create_resources(tmp_path, "0::/parent/child\n", {
+        "parent/cpu.max": "800000 100000\n",
+        "parent/child/cpu.max": "max 100000\n",
+        "parent/memory.max": f"{4 * GIB}\n",
+        "parent/child/memory.max": f"{8 * GIB}\n"
+    })
+    assert resources.cpu_count == 8
+    assert resources.memory_limit == 4 * GIB
+    assert resources.default_compile_jobs == 4
+    assert resources.default_link_jobs == 2
+
+
+def test_cgroup_v2_namespaced_path(tmp_path: Any):
+    # Containers with their own cgroup namespace see their cgroup mounted at
+    #   the root of the hierarchy
+    resources = create_resources(tmp_path, "0::/host/path\n", {
+        "cpu.max": "200000 100000\n"
+    })
+    assert resources.cpu_count == 2
+
+
+def test_cgroup_v1_limits(tmp_path: Any):
+    resources = create_resources(tmp_path,
+        "5:memory:/docker/abc\n" +
+        "4:cpu,cpuacct:/docker/abc\n" +
+        "1:name=systemd:/docker/abc\n",
+    {
+        "cpu,cpuacct/docker/abc/cpu.cfs_quota_us": "400000\n",
+        "cpu,cpuacct/docker/abc/cpu.cfs_period_us": "100000\n",
+        "memory/docker/abc/memory.limit_in_bytes": f"{3 * GIB}\n"
+    })
+    assert resources.cpu_count == 4
+    assert resources.memory_limit == 3 * GIB
+    assert resources.default_compile_jobs == 3
+    assert resources.default_link_jobs == 1
+
+
+def test_cgroup_v1_no_limits(tmp_path: Any):
+    resources = create_resources(tmp_path,
+        "5:memory:/\n" +
+        "4:cpu,cpuacct:/\n",
+    {
+        "cpu,cpuacct/cpu.cfs_quota_us": "-1\n",
+        "cpu,cpuacct/cpu.cfs_period_us": "100000\n",
+        "memory/memory.limit_in_bytes": "9223372036854771712\n"
+    })
+    assert resources.cpu_count == 128
+    assert resources.memory_limit == 256 * GIB
+
+
+def test_affinity_limits_cpus(tmp_path: Any, monkeypatch: Any):
+    monkeypatch.setattr(os, "sched_getaffinity", lambda _: {0, 1, 2},
+        raising=False)
+    resources = create_resources(tmp_path, "0::/\n", {})
+    assert resources.cpu_count == 3
+
+
+def test_missing_proc_files(tmp_path: Any):
+    resources = SystemResources(tmp_path / "cgroup", tmp_path / "proc")
+    assert resources.cpu_count == 128
+    assert resources.memory_limit is None
+    assert resources.default_compile_jobs == 128
+    assert resources.default_link_jobs == 128
+
+
+def test_memory_limit_allows_at_least_one_job(tmp_path: Any):
+    resources = create_resources(tmp_path, "0::/\n", {
+        "memory.max": f"{GIB // 2}\n"
+    })
+    assert resources.default_compile_jobs == 1
+    assert resources.default_link_jobs == 1